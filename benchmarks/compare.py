@@ -0,0 +1,50 @@
+"""
+Compare two benchmark result files and flag regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json results.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def load_results(path: Path) -> dict[tuple[str, str], dict]:
+    report = json.loads(path.read_text())
+    return {(result["backend"], result["fixture"]): result for result in report["results"]}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("candidate", type=Path)
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Relative slowdown of the real-time factor counted as regression"
+    )
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.baseline)
+    candidate = load_results(args.candidate)
+
+    regressions = 0
+    for key in sorted(baseline.keys() & candidate.keys()):
+        before, after = baseline[key], candidate[key]
+        change = (after["real_time_factor"] - before["real_time_factor"]) / before["real_time_factor"]
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{key[0]:>6} {key[1]:<24} rtf {before['real_time_factor']:.4f} -> {after['real_time_factor']:.4f} "
+            f"({change:+.1%}) rss {before['peak_rss_mb']} -> {after['peak_rss_mb']}MB{flag}"
+        )
+        for stage in sorted(before["stages"].keys() | after["stages"].keys()):
+            print(f"{'':>8}{stage:<12} {before['stages'].get(stage, 0):.4f}s -> {after['stages'].get(stage, 0):.4f}s")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
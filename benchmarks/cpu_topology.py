@@ -0,0 +1,101 @@
+"""
+Find the fastest split of the CPU cores between model replicas for a model.
+
+Every split runs its replicas at the same time, each pinned to its cores and transcribing the same
+file, and reports the seconds of audio transcribed per second by all of them together.
+
+Usage:
+    python -m benchmarks.cpu_topology path/to/audio.mp3 --model small --compute-type int8
+"""
+
+import argparse
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+
+def candidate_splits(cores: int) -> list[tuple[int, int]]:
+    """(replicas, threads per replica) splits using all the cores, from one replica to one thread per replica."""
+    return [(cores // threads, threads) for threads in range(cores, 0, -1) if cores % threads == 0]
+
+
+def transcribe_in_replica(audio_path: str, barrier: Any) -> float:
+    """Transcribe the audio in a worker once every replica loaded its model, returning the seconds it took."""
+    from Transcriber.transcription_core.worker_pool import get_worker_model
+    from Transcriber.utils.audio_utils import load_audio
+    from Transcriber.utils.whisper import whisper_utils
+
+    model = get_worker_model().get()
+    audio = load_audio(audio_path)
+    barrier.wait()
+
+    started_at = time.perf_counter()
+    segments, _ = model.transcribe(audio, **whisper_utils.transcribe_options())
+    for _ in segments:
+        pass
+    return time.perf_counter() - started_at
+
+
+def run_split(audio_path: str, num_processes: int, threads: int, manager: Any) -> float:
+    """Run the replicas of a split at the same time, returning the seconds taken by the slowest one."""
+    from Transcriber.config import settings
+    from Transcriber.transcription_core import cpu_topology
+    from Transcriber.transcription_core.worker_pool import initialize_worker
+
+    context = multiprocessing.get_context("spawn")
+    cpu_sets = context.SimpleQueue()
+    for cpus in cpu_topology.plan_topology(num_processes, threads).replicas:
+        cpu_sets.put(cpus)
+
+    barrier = manager.Barrier(num_processes)
+    with ProcessPoolExecutor(
+        max_workers=num_processes,
+        mp_context=context,
+        initializer=initialize_worker,
+        initargs=(settings.model_dump(), threads, cpu_sets),
+    ) as executor:
+        futures = [executor.submit(transcribe_in_replica, audio_path, barrier) for _ in range(num_processes)]
+        return max(future.result() for future in futures)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", type=Path, help="Media file transcribed by every replica")
+    parser.add_argument("--model", help="Model to benchmark, by default the configured one")
+    parser.add_argument("--compute-type", help="CTranslate2 compute type, by default the configured one")
+    args = parser.parse_args(argv)
+
+    from Transcriber.config import settings
+    from Transcriber.logging import logger
+    from Transcriber.transcription_core import cpu_topology
+    from Transcriber.utils.file_utils import probe_duration
+
+    logger.remove()
+    settings.whisper.model_name_or_path = args.model or settings.whisper.model_name_or_path
+    settings.whisper.ct2_compute_type = args.compute_type or settings.whisper.ct2_compute_type
+
+    cpus = cpu_topology.available_cpus()
+    nodes = cpu_topology.numa_nodes(cpus)
+    print(f"{len(cpus)} CPUs on {len(nodes)} NUMA node(s): " + " | ".join(",".join(map(str, node)) for node in nodes))
+
+    duration = probe_duration(args.audio) or 0.0
+    results = []
+    with multiprocessing.get_context("spawn").Manager() as manager:
+        for num_processes, threads in candidate_splits(len(cpus)):
+            elapsed = run_split(str(args.audio.absolute()), num_processes, threads, manager)
+            throughput = num_processes * duration / elapsed
+            results.append((throughput, num_processes, threads))
+            print(
+                f"{num_processes:>3} x {threads:<3} threads: {elapsed:.2f}s, {throughput:.2f} audio seconds per second"
+            )
+
+    _, num_processes, threads = max(results)
+    print(f"Best split for {settings.whisper.model_name_or_path}:")
+    print(f"WORKERS__NUM_PROCESSES={num_processes}")
+    print(f"WORKERS__CPU_THREADS_PER_PROCESS={threads}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark the streaming DOCX writer against the python-docx object model, and check they match.
+
+The peak memory is the Python heap traced by tracemalloc, the lxml tree of the object model is
+allocated outside of it, so it only undercounts the object model.
+
+Usage:
+    python -m benchmarks.docx_export --segments 1000 10000 --rtl
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+WORDS = ("the", "model", "transcribes", "every", "segment", "of", "audio", "into", "text", "quickly", "and", "well")
+ARABIC_WORDS = ("النموذج", "يكتب", "كل", "مقطع", "من", "الصوت", "نصا", "بسرعة", "؟", "،")
+
+
+def create_segments(count: int, rtl: bool) -> list[dict[str, Any]]:
+    words = ARABIC_WORDS if rtl else WORDS
+    generator = random.Random(count)
+    return [
+        {"start": index * 5.0, "end": index * 5.0 + 5.0, "text": " " + " ".join(generator.choices(words, k=16))}
+        for index in range(count)
+    ]
+
+
+def measure(write: Callable[[str, list], None], file_path: Path, segments: list) -> dict[str, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    write(str(file_path), segments)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_mb": peak / 2**20, "size_kb": file_path.stat().st_size / 2**10}
+
+
+def set_element_rtl(element: Any) -> None:
+    """Sets the paragraph to right-to-left using XML."""
+    from docx.oxml import OxmlElement
+
+    element._element.get_or_add_pPr().append(OxmlElement("w:bidi"))
+
+
+def write_docx_object_model(writer: Any, file_path: str, segments: Iterable[dict[str, Any]]) -> None:
+    """Write the same DOCX as `Writer.write_docx` through the python-docx object model, as reference."""
+    from docx import Document
+    from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+    from docx.shared import Pt
+
+    from Transcriber.config import settings
+
+    rtl = writer.is_rtl()
+    doc = Document()
+    title = os.path.splitext(os.path.basename(file_path))[0]
+    header = doc.add_heading(title, level=1)
+    if rtl:
+        set_element_rtl(header)
+    header.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    header_font = header.runs[0].font
+    header_font.size = Pt(settings.output.title_font_size)
+    header_font.name = settings.output.title_font_name
+
+    for segment in segments:
+        paragraph_text = segment["text"].strip()
+        if rtl:
+            paragraph_text = writer.prepare_text_for_rtl(paragraph_text)
+
+        paragraph = doc.add_paragraph(paragraph_text)
+        if rtl:
+            set_element_rtl(paragraph)
+        # In RTL mode, LEFT alignment is interpreted as right-aligned
+        paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
+        for run in paragraph.runs:
+            run.font.size = Pt(settings.output.body_font_size)
+            run.font.name = settings.output.body_font_name
+
+    doc.save(file_path)
+
+
+def describe(file_path: Path) -> list[tuple]:
+    """Text, alignment, direction and font of every paragraph, resolved through its style like Word does."""
+    from docx import Document
+    from docx.oxml.ns import qn
+
+    def is_bidi(element: Any) -> bool:
+        return element.pPr is not None and element.pPr.find(qn("w:bidi")) is not None
+
+    described = []
+    for paragraph in Document(str(file_path)).paragraphs:
+        style = paragraph.style
+        alignment = paragraph.alignment
+        font = paragraph.runs[0].font if paragraph.runs else None
+        described.append(
+            (
+                paragraph.text,
+                style.paragraph_format.alignment if alignment is None else alignment,
+                is_bidi(paragraph._p) or is_bidi(style.element),
+                font and (font.name or style.font.name),
+                font and (font.size or style.font.size),
+            )
+        )
+    return described
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--rtl", action="store_true", help="Write Arabic transcripts")
+    args = parser.parse_args(argv)
+
+    from Transcriber.config import settings
+    from Transcriber.export_handlers.exporter import Writer
+    from Transcriber.logging import logger
+
+    logger.remove()
+    settings.whisper.language = "ar" if args.rtl else "en"
+    writer = Writer()
+
+    with tempfile.TemporaryDirectory() as directory:
+        Path(directory, "object-model").mkdir()
+        Path(directory, "streaming").mkdir()
+        # Build the python-docx default template and the streaming template before measuring
+        write_docx_object_model(writer, str(Path(directory, "warmup.docx")), [])
+        writer.write_docx(str(Path(directory, "warmup.docx")), [])
+
+        for count in args.segments:
+            segments = create_segments(count, args.rtl)
+            # Same file name in both, since it is the title
+            object_model_path = Path(directory, "object-model", f"{count}.docx")
+            streaming_path = Path(directory, "streaming", f"{count}.docx")
+
+            before = measure(
+                lambda file_path, segments: write_docx_object_model(writer, file_path, segments),
+                object_model_path,
+                segments,
+            )
+            after = measure(writer.write_docx, streaming_path, segments)
+            equivalent = describe(object_model_path) == describe(streaming_path)
+
+            print(
+                f"{count:>7} segments  object model {before['seconds']:.3f}s {before['peak_mb']:.1f}MB "
+                f"{before['size_kb']:.0f}KB -> streaming {after['seconds']:.3f}s {after['peak_mb']:.1f}MB "
+                f"{after['size_kb']:.0f}KB ({before['seconds'] / after['seconds']:.1f}x)"
+                f"{'' if equivalent else '  MISMATCH'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Deterministic stand-in for the faster-whisper backend."""
+
+import time
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+
+import faster_whisper
+import numpy as np
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+SAMPLE_RATE = 16000
+
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliett"]
+
+
+class FakeWhisperModel(faster_whisper.WhisperModel):
+    """
+    A `faster_whisper.WhisperModel` that returns deterministic segments without loading any weights.
+
+    It decodes the audio and runs the VAD like the real model, so those costs stay realistic, then
+    emits one segment every `segment_duration` seconds. `compute_factor` simulates inference cost as
+    a fraction of the segment duration (0.1 sleeps 0.1 s per second of audio).
+    """
+
+    def __init__(self, segment_duration: float = 4.0, compute_factor: float = 0.0):
+        # The weights of the real model are never loaded
+        self.segment_duration = segment_duration
+        self.compute_factor = compute_factor
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> tuple[Iterator[SimpleNamespace], SimpleNamespace]:
+        if not isinstance(audio, np.ndarray):
+            audio = faster_whisper.decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+        duration = audio.shape[0] / SAMPLE_RATE
+        duration_after_vad = duration
+        if kwargs.get("vad_filter"):
+            vad_parameters = dict(kwargs.get("vad_parameters") or {})
+            speech_chunks = get_speech_timestamps(audio, VadOptions(**vad_parameters))
+            duration_after_vad = sum(chunk["end"] - chunk["start"] for chunk in speech_chunks) / SAMPLE_RATE
+
+        info = SimpleNamespace(
+            language=kwargs.get("language") or "en",
+            language_probability=1.0,
+            duration=duration,
+            duration_after_vad=duration_after_vad,
+        )
+        return self._segments(duration), info
+
+    def _segments(self, duration: float) -> Iterator[SimpleNamespace]:
+        start = 0.0
+        index = 0
+        while start < duration:
+            end = min(start + self.segment_duration, duration)
+            if self.compute_factor:
+                time.sleep((end - start) * self.compute_factor)
+            words = [WORDS[(index + offset) % len(WORDS)] for offset in range(index % 7 + 1)]
+            yield SimpleNamespace(start=start, end=end, text=" " + " ".join(words))
+            start = end
+            index += 1
+
+
+class FakeBatchedPipeline(faster_whisper.BatchedInferencePipeline):
+    """
+    A `faster_whisper.BatchedInferencePipeline` that returns deterministic segments without loading any weights.
+
+    The audio is cut into chunks of at most 30 seconds like the real pipeline, from the VAD or from the
+    `clip_timestamps`, and the chunks are decoded `batch_size` at a time with one segment per chunk.
+    `batch_cost` simulates the cost of a forward pass in seconds, which on a GPU hardly depends on how
+    many chunks the batch holds.
+    """
+
+    def __init__(self, batch_cost: float = 0.05):
+        # The weights of the real model are never loaded, an English-only model skips language detection
+        self.batch_cost = batch_cost
+        self.batches = 0
+        self.model = SimpleNamespace(model=SimpleNamespace(is_multilingual=False))
+
+    def transcribe(self, audio: Any, **kwargs: Any) -> tuple[Iterator[SimpleNamespace], SimpleNamespace]:
+        if not isinstance(audio, np.ndarray):
+            audio = faster_whisper.decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+        if kwargs.get("clip_timestamps"):
+            chunks = [
+                (int(clip["start"] * SAMPLE_RATE), int(clip["end"] * SAMPLE_RATE)) for clip in kwargs["clip_timestamps"]
+            ]
+        elif kwargs.get("vad_filter"):
+            vad_parameters = {**(kwargs.get("vad_parameters") or {}), "max_speech_duration_s": 30}
+            chunks = self._merge(get_speech_timestamps(audio, VadOptions(**vad_parameters)))
+        else:
+            chunks = [
+                (start, min(start + 30 * SAMPLE_RATE, audio.shape[0]))
+                for start in range(0, audio.shape[0], 30 * SAMPLE_RATE)
+            ]
+
+        info = SimpleNamespace(
+            language=kwargs.get("language") or "en",
+            language_probability=1.0,
+            duration=audio.shape[0] / SAMPLE_RATE,
+            duration_after_vad=sum(end - start for start, end in chunks) / SAMPLE_RATE,
+        )
+        return self._segments(chunks, kwargs.get("batch_size", 16)), info
+
+    @staticmethod
+    def _merge(speech: list[dict[str, int]]) -> list[tuple[int, int]]:
+        chunks: list[tuple[int, int]] = []
+        for region in speech:
+            if chunks and region["end"] - chunks[-1][0] <= 30 * SAMPLE_RATE:
+                chunks[-1] = (chunks[-1][0], region["end"])
+            else:
+                chunks.append((region["start"], region["end"]))
+        return chunks
+
+    def _segments(self, chunks: list[tuple[int, int]], batch_size: int) -> Iterator[SimpleNamespace]:
+        for index in range(0, len(chunks), batch_size):
+            self.batches += 1
+            if self.batch_cost:
+                time.sleep(self.batch_cost)
+            for start, end in chunks[index : index + batch_size]:
+                words = [WORDS[(round((end - start) / SAMPLE_RATE) + offset) % len(WORDS)] for offset in range(3)]
+                yield SimpleNamespace(
+                    start=round(start / SAMPLE_RATE, 3), end=round(end / SAMPLE_RATE, 3), text=" " + " ".join(words)
+                )
@@ -0,0 +1,59 @@
+"""Deterministic audio fixtures generated on the fly, so the benchmarks need no media files."""
+
+import wave
+from pathlib import Path
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def generate_audio(duration: float, seed: int = 0) -> np.ndarray:
+    """
+    Generate speech-like audio: bursts of harmonic, amplitude-modulated tones separated by pauses.
+
+    Args:
+        duration: Length of the audio in seconds
+        seed: Seed of the random generator, the same seed always gives the same audio
+
+    Returns:
+        np.ndarray: Mono float32 samples at 16 kHz in [-1, 1]
+    """
+    rng = np.random.default_rng(seed)
+    audio = np.zeros(int(duration * SAMPLE_RATE), dtype=np.float32)
+
+    position = 0
+    while position < audio.shape[0]:
+        burst = int(rng.uniform(0.8, 4.0) * SAMPLE_RATE)
+        pause = int(rng.uniform(0.2, 1.2) * SAMPLE_RATE)
+        end = min(position + burst, audio.shape[0])
+
+        t = np.arange(end - position) / SAMPLE_RATE
+        pitch = rng.uniform(90, 220)
+        signal = sum(np.sin(2 * np.pi * pitch * harmonic * t) / harmonic for harmonic in range(1, 6))
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * rng.uniform(3, 6) * t)
+        noise = rng.normal(0, 0.05, t.shape[0])
+        audio[position:end] = (0.3 * signal * envelope + noise).astype(np.float32)
+
+        position = end + pause
+
+    return np.clip(audio, -1, 1)
+
+
+def write_wav(path: Path, audio: np.ndarray) -> Path:
+    """Write float samples as a 16-bit PCM WAV file."""
+    with wave.open(str(path), "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(SAMPLE_RATE)
+        file.writeframes((audio * 32767).astype(np.int16).tobytes())
+    return path
+
+
+def create_fixture(directory: Path, duration: float, seed: int = 0) -> Path:
+    """Create (or reuse) the WAV fixture of the given duration in the directory."""
+    path = directory / f"fixture-{int(duration)}s-{seed}.wav"
+    if not path.is_file():
+        directory.mkdir(parents=True, exist_ok=True)
+        write_wav(path, generate_audio(duration, seed))
+    return path
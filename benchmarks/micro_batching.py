@@ -0,0 +1,64 @@
+"""
+Benchmark the transcription of a directory of short clips, one file at a time and in micro-batches.
+
+The fake batched pipeline charges a fixed cost per forward pass, like a GPU does, so the gain comes
+from filling the batches with the speech chunks of several files.
+
+Usage:
+    python -m benchmarks.micro_batching --files 200 --batch-cost 0.05
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.fixtures import create_fixture
+from benchmarks.run import configure
+
+
+def run(directory: Path, output_dir: Path, micro_batching: bool, batch_cost: float) -> dict[str, float]:
+    from benchmarks.fake_backend import FakeBatchedPipeline
+    from Transcriber import transcriber
+    from Transcriber.config import settings
+    from Transcriber.utils.whisper import whisper_utils
+
+    configure(output_dir)
+    settings.output.output_formats = ["txt", "srt"]
+    settings.output.background_export = False
+    settings.input.use_manifest = False
+    settings.input.skip_if_output_exist = False
+    settings.logging.save_metadata = False
+    settings.whisper.micro_batching = micro_batching
+
+    pipeline = FakeBatchedPipeline(batch_cost=batch_cost)
+    whisper_utils.load_model = lambda cpu_threads=0: pipeline
+    started_at = time.perf_counter()
+    transcriber.process_local_directory(directory, whisper_utils.LazyModel())
+    elapsed = time.perf_counter() - started_at
+    return {"seconds": elapsed, "batches": pipeline.batches}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=200, help="Number of clips")
+    parser.add_argument("--batch-cost", type=float, default=0.05, help="Seconds of a simulated forward pass")
+    parser.add_argument("--fixtures-dir", type=Path, default=Path(tempfile.gettempdir()) / "transcriber-clips")
+    args = parser.parse_args(argv)
+
+    # Voice notes of 10 to 30 seconds
+    for index in range(args.files):
+        create_fixture(args.fixtures_dir, 10 + index % 21, seed=index)
+
+    for micro_batching in (False, True):
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = run(args.fixtures_dir, Path(output_dir), micro_batching, args.batch_cost)
+        mode = "micro-batches" if micro_batching else "one by one"
+        print(
+            f"{mode:>13}: {result['seconds']:.2f}s, {args.files / result['seconds']:.1f} files/s, "
+            f"{result['batches']} batches"
+        )
+
+
+if __name__ == "__main__":
+    main()
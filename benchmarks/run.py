@@ -0,0 +1,159 @@
+"""
+Benchmark the transcription pipeline on generated audio, offline and on CPU.
+
+Every case runs in a fresh process, so the reported peak RSS belongs to that case only.
+
+Usage:
+    python -m benchmarks.run --backend fake --backend tiny --durations 30 300 --output results.json
+    python -m benchmarks.compare baseline.json results.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from benchmarks.fixtures import create_fixture
+
+BACKENDS = ("fake", "tiny")
+
+
+def configure(output_dir: Path) -> None:
+    """Point every side effect of the pipeline to a temporary directory and disable the caches."""
+    from Transcriber.config import settings
+    from Transcriber.logging import logger
+    from Transcriber.transcription_core import audio_cache, file_manifest, metrics_store, speech_cache
+
+    logger.remove()
+    settings.output.output_dir = str(output_dir)
+    settings.output.output_formats = ["txt", "srt", "vtt", "docx", "jsonl"]
+    settings.cache.cache_dir = output_dir / "cache"
+    settings.cache.enable_transcription_cache = False
+    settings.whisper.enable_checkpoints = False
+    settings.logging.save_metadata = True
+    settings.logging.metadata_db_path = str(output_dir / "metadata.sqlite3")
+    for output_format in settings.output.output_formats:
+        (output_dir / output_format).mkdir(parents=True, exist_ok=True)
+    # The stores opened by a previous case of the same process point to its removed directory
+    for get_store in (
+        audio_cache.get_audio_cache,
+        file_manifest.get_file_manifest,
+        metrics_store.get_metrics_store,
+        speech_cache.get_speech_cache,
+    ):
+        get_store.cache_clear()
+
+
+def load_backend(backend: str):
+    """Return the lazily loaded model of a backend, the fake one never loads any weights."""
+    from benchmarks.fake_backend import FakeWhisperModel
+    from Transcriber.config import settings
+    from Transcriber.utils.whisper import whisper_utils
+
+    if backend == "fake":
+        whisper_utils.load_model = lambda cpu_threads=0: FakeWhisperModel()
+    else:
+        settings.whisper.model_name_or_path = backend
+        settings.whisper.ct2_compute_type = "int8"
+    return whisper_utils.LazyModel()
+
+
+def run_case(backend: str, fixture: str) -> dict[str, Any]:
+    """
+    Transcribe and export one fixture with one backend through `transcribe_file`, returning its measurements.
+
+    The stages are the ones the pipeline measures itself, from decoding to recording the metadata.
+    """
+    from Transcriber.transcriber import transcribe_file
+    from Transcriber.transcription_core.metrics_store import get_metrics_store
+    from Transcriber.utils import file_utils
+    from Transcriber.utils.stage_timer import stage_timer
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        configure(Path(output_dir))
+
+        # Loaded up front, the model load is reported on its own and left out of the RTF
+        model = load_backend(backend)
+        load_started_at = time.perf_counter()
+        model.get()
+        model_load_time = time.perf_counter() - load_started_at
+
+        stage_timer.reset()
+        started_at = time.perf_counter()
+        export = transcribe_file(fixture, Path(fixture).stem, model, None)
+        if export is not None:
+            export.result()
+        get_metrics_store().flush()
+        wall_time = time.perf_counter() - started_at
+        stages = stage_timer.snapshot()
+
+        segments = len(Path(output_dir, "jsonl", f"{Path(fixture).stem}.jsonl").read_text().splitlines())
+
+    audio_duration = file_utils.probe_duration(fixture)
+    return {
+        "backend": backend,
+        "fixture": Path(fixture).name,
+        "audio_duration": round(audio_duration, 3),
+        "model_load_time": round(model_load_time, 4),
+        "wall_time": round(wall_time, 4),
+        "real_time_factor": round(wall_time / audio_duration, 6),
+        "segments": segments,
+        "segments_per_second": round(segments / wall_time, 3) if wall_time else None,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": {stage: round(seconds, 4) for stage, seconds in sorted(stages.items())},
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", action="append", choices=BACKENDS, help="Backends to run, by default fake")
+    parser.add_argument("--durations", nargs="+", type=float, default=[30, 300], help="Fixture lengths in seconds")
+    parser.add_argument("--fixtures-dir", type=Path, default=Path(tempfile.gettempdir()) / "transcriber-benchmarks")
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    args = parser.parse_args(argv)
+
+    fixtures = [str(create_fixture(args.fixtures_dir, duration)) for duration in args.durations]
+    results = []
+    for backend in args.backend or ["fake"]:
+        for fixture in fixtures:
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                try:
+                    result = executor.submit(run_case, backend, fixture).result()
+                except Exception as e:
+                    print(f"Skipping {backend} on {Path(fixture).name}: {e}")
+                    continue
+            results.append(result)
+            print(
+                f"{backend:>6} {result['fixture']:<24} wall={result['wall_time']:.3f}s "
+                f"rtf={result['real_time_factor']:.4f} segments/s={result['segments_per_second']} "
+                f"rss={result['peak_rss_mb']}MB"
+            )
+
+    report = {
+        "commit": git_commit(),
+        "date_time": datetime.now(UTC).isoformat(),
+        "host": {"machine": platform.machine(), "processor": platform.processor(), "python": platform.python_version()},
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
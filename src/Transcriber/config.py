@@ -1,6 +1,6 @@
 from functools import lru_cache
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -23,10 +23,24 @@ class Input(BaseModel):
         List of URLs or file paths to process.
     skip_if_output_exist : bool, optional
         Skip processing if output files already exist, by default True.
+    recursive : bool, optional
+        Whether the subdirectories of the input directories are scanned as well, their outputs are
+        written in the same subdirectories of every output format directory, by default False.
+    sniff_content : bool, optional
+        Whether files without a media extension are recognized by their first bytes, by default False.
+    scan_workers : int, optional
+        Number of directories scanned in parallel, by default 8.
+    use_manifest : bool, optional
+        Whether to keep a manifest of the local files already processed, so re-runs skip the unchanged
+        ones without checking their outputs, by default False.
     """
 
     urls_or_paths: list[str] = Field(default=[], examples=[["."]])
     skip_if_output_exist: bool = True
+    recursive: bool = False
+    sniff_content: bool = False
+    scan_workers: int = 8
+    use_manifest: bool = False
 
 
 class YtDlp(BaseModel):
@@ -36,18 +50,29 @@ class YtDlp(BaseModel):
     ----------
     download_retries : int, optional
         Number of retry attempts for downloads, by default 3.
+    retry_backoff : float, optional
+        Seconds to wait before the first retry of a failed entry, doubled on every further retry, by default 1.0.
     yt_dlp_options : str | None, optional
         Additional options for yt-dlp, by default None.
     save_responses : bool, optional
         Whether to save responses from yt-dlp downloads, by default True.
     download_dir : str | None, optional
         Directory path where downloaded files will be saved. If None, will use output_dir.
+    concurrent_downloads : int, optional
+        Number of playlist entries downloaded in parallel while earlier entries are transcribed, by default 2.
+    audio_format : str, optional
+        How downloaded audio is stored: "mp3" re-encodes it, "native" keeps the original container
+        (opus/m4a/webm) without re-encoding and "pcm" decodes it once to mono 16 kHz WAV that the
+        recognizer reads directly, by default "mp3".
     """
 
     download_retries: int = 3
+    retry_backoff: float = 1.0
     yt_dlp_options: str | None = None
     save_responses: bool = True
     download_dir: Path = Path.joinpath(PROJECT_ROOT, "Downloads")
+    concurrent_downloads: int = 2
+    audio_format: Literal["mp3", "native", "pcm"] = "mp3"
 
 
 class Output(BaseModel):
@@ -56,14 +81,25 @@ class Output(BaseModel):
     Parameters
     ----------
     output_formats : list[str], optional
-        List of desired output formats. If "all" is included, all available formats will be used.
-        Default is ["all"].
+        List of desired output formats. If "all" is included, all available formats will be used,
+        except "jsonl" which is only written when listed explicitly. Default is ["all"].
     output_dir : str, optional
         Directory path where output files will be saved. Default is "Output".
     save_files_before_compact : bool, optional
         Whether to save files before compacting segments, by default False.
     min_words_per_segment : int, optional
         Minimum number of words required per segment, by default 1.
+    streaming_export : bool, optional
+        Whether to append segments to the output files while they are decoded instead of writing
+        them all at the end, by default False.
+    background_export : bool, optional
+        Whether to write the outputs of a file on background threads while the next file is
+        transcribed, by default True.
+    export_workers : int, optional
+        Number of background threads writing outputs, by default 1.
+    max_pending_exports : int, optional
+        Number of transcripts waiting for a background thread before transcription waits for the
+        exports to catch up, by default 2.
     """
 
     output_formats: list[str] = Field(default=["all"], examples=[["txt", "docx"]])
@@ -74,11 +110,20 @@ class Output(BaseModel):
     body_font_name: str = "Arial"
     title_font_size: int = 30
     body_font_size: int = 20
+    streaming_export: bool = False
+    background_export: bool = True
+    export_workers: int = 1
+    max_pending_exports: int = 2
 
     @model_validator(mode="after")
     def process_formats(self) -> "Output":
         if "all" in self.output_formats:
-            self.output_formats = [export_type.value for export_type in ExportType]
+            # The raw segments of JSONL are opt-in, "all" keeps meaning the document formats
+            self.output_formats = [
+                export_type.value
+                for export_type in ExportType
+                if export_type is not ExportType.JSONL or export_type.value in self.output_formats
+            ]
         if str(ExportType.ALL) in self.output_formats:
             self.output_formats.remove(str(ExportType.ALL))
         return self
@@ -101,11 +146,67 @@ class Whisper(BaseModel):
     beam_size : int, optional
         Beam size for beam search decoding, by default 5.
     ct2_compute_type : str, optional
-        Compute type for CTranslate2 backend (float32 or float16), by default "float16".
+        Compute type for CTranslate2 backend (e.g. float16, int8_float32, float32). "auto" picks
+        the fastest type the device supports, float16 on GPU and int8_float32 on CPU, and a type the
+        device does not support is replaced the same way with a warning, by default "auto".
+    cpu_threads : int, optional
+        Number of threads a model uses on CPU for one transcription (intra-op parallelism). Worker
+        processes use `workers.cpu_threads_per_process` instead. 0 keeps the backend default, by
+        default 0.
+    num_workers : int, optional
+        Number of transcriptions a model runs in parallel when several threads share it, like the
+        server and watch mode concurrency (inter-op parallelism). Every worker uses `cpu_threads`
+        threads, by default 1.
+    batch_size : int, optional
+        Number of audio chunks decoded together by the batched pipeline, by default 16.
+    auto_batch_size : bool, optional
+        Whether to replace `batch_size` with the one measured fastest on this machine. The candidates
+        are timed once on a clip of the first file and the result is stored per model, compute type
+        and host in the cache directory, by default False.
+    batch_size_candidates : list[int], optional
+        Batch sizes tried by the calibration, by default [1, 2, 4, 8, 16, 32].
+    calibration_clip_duration : float, optional
+        Seconds of audio of every batch item during the calibration, by default 15.
+    micro_batching : bool, optional
+        Whether to transcribe the short local files together, filling the batches of the batched
+        pipeline with the speech chunks of several files, by default False.
+    micro_batch_max_duration : float, optional
+        Longest file in seconds transcribed in a micro-batch, by default 60.
+    micro_batch_files : int, optional
+        Number of files transcribed together in a micro-batch, by default 64.
+    language_prepass : bool, optional
+        Whether to detect the language of a directory or playlist once, on samples of a few of its
+        files, and transcribe all its files with it when no `language` is set. The detected language
+        is stored per source in the metadata database, by default False.
+    language_sample_files : int, optional
+        Number of files the language is detected on, in parallel, by default 3.
+    language_sample_duration : float, optional
+        Seconds of audio of every sample, by default 30.
+    language_threshold : float, optional
+        Confidence the samples must reach together for the language to be reused, below it every
+        file detects its own language, by default 0.8.
+    vad_stage : bool, optional
+        Whether to run the VAD once per file as its own stage, before the model is loaded, caching
+        the speech timestamps per audio content and VAD parameters in `cache.cache_dir`. Files
+        without speech get empty outputs without loading the model, the batched pipeline decodes
+        the cached speech, and the speech durations order the workers and the progress, by default False.
+    min_speech_duration : float, optional
+        Seconds of speech below which the VAD stage skips a file as silence or music, by default 0.5.
+    enable_checkpoints : bool, optional
+        Whether to periodically save the decoded segments so an interrupted transcription resumes
+        where it stopped. The decoding resumes at the end of the last saved segment without the
+        earlier text as context, so the segments after that point can differ slightly from an
+        uninterrupted run, by default False.
+    checkpoint_interval : float, optional
+        Minimum number of seconds between two checkpoint commits, by default 30.
 
     Notes
     -----
     If the model name ends with ".en", the language will be automatically set to "en".
+
+    Transformers Whisper checkpoints (e.g. "openai/whisper-small") are converted to CTranslate2
+    with the resolved compute type once and stored in `cache.cache_dir`/models, which needs the
+    `convert` extra. `transcriber-calibrate` compares the compute types on local samples.
     """
 
     model_name_or_path: str = "large-v3"
@@ -113,12 +214,28 @@ class Whisper(BaseModel):
     language: str | None = Field(None, examples=["ar", "en"])
     use_faster_whisper: bool = True
     beam_size: int = 5
-    ct2_compute_type: str = "float16"
+    ct2_compute_type: str = "auto"
+    cpu_threads: int = 0
+    num_workers: int = 1
     use_batched_transcription: bool = True
     batch_size: int = 16
+    auto_batch_size: bool = False
+    batch_size_candidates: list[int] = [1, 2, 4, 8, 16, 32]
+    calibration_clip_duration: float = 15.0
+    micro_batching: bool = False
+    micro_batch_max_duration: float = 60.0
+    micro_batch_files: int = 64
+    language_prepass: bool = False
+    language_sample_files: int = 3
+    language_sample_duration: float = 30.0
+    language_threshold: float = 0.8
     vad_filter: bool = True
     vad_parameters: dict = dict(min_silence_duration_ms=500)
+    vad_stage: bool = False
+    min_speech_duration: float = 0.5
     verbose: bool = False
+    enable_checkpoints: bool = False
+    checkpoint_interval: float = 30.0
 
     @model_validator(mode="after")
     def set_language(self) -> "Whisper":
@@ -127,6 +244,72 @@ class Whisper(BaseModel):
         return self
 
 
+class Workers(BaseModel):
+    """Configuration class for the worker pool used on local directories.
+
+    Parameters
+    ----------
+    num_processes : int, optional
+        Number of worker processes, each loading its own model. 1 transcribes the files in the
+        main process, by default 1.
+    cpu_threads_per_process : int, optional
+        Number of CPU threads given to each worker model. 0 splits the available cores evenly
+        between the workers, by default 0.
+    split_long_files : bool, optional
+        Whether to cut a long file into chunks at silences and transcribe the chunks on the
+        `num_processes` workers in parallel, by default False.
+    chunk_length : float, optional
+        Target length in seconds of the chunks of a split file, the cuts are moved to the nearest
+        silence, by default 600.
+    auto_topology : bool, optional
+        Whether to replace `num_processes` with the number of workers planned from the available
+        cores and NUMA nodes, with `cpu_threads_per_process` threads each or 4 when it is 0,
+        by default False.
+    pin_cpus : bool, optional
+        Whether to pin every worker process to its own cores, within a single NUMA node when
+        possible, by default False.
+
+    Notes
+    -----
+    `python -m benchmarks.cpu_topology audio.mp3` measures every split of the cores for the
+    configured model and reports the fastest one.
+    """
+
+    num_processes: int = 1
+    cpu_threads_per_process: int = 0
+    split_long_files: bool = False
+    chunk_length: float = 600.0
+    auto_topology: bool = False
+    pin_cpus: bool = False
+
+
+class Cache(BaseModel):
+    """Configuration class for the persistent caches.
+
+    Parameters
+    ----------
+    cache_dir : Path, optional
+        Directory where the caches are stored, by default ".transcriber_cache" in the project root.
+    enable_transcription_cache : bool, optional
+        Whether to reuse the segments of media already transcribed with the same decode settings,
+        by default False.
+    transcription_cache_max_size_mb : int, optional
+        Size budget of the transcription cache, least recently used entries are evicted first,
+        by default 1024.
+    enable_audio_cache : bool, optional
+        Whether to keep the decoded audio as memory-mapped files so re-runs skip decoding,
+        by default False.
+    audio_cache_max_size_mb : int, optional
+        Size budget of the decoded audio cache, about 230 MB per hour of audio, by default 10240.
+    """
+
+    cache_dir: Path = Path.joinpath(PROJECT_ROOT, ".transcriber_cache")
+    enable_transcription_cache: bool = False
+    transcription_cache_max_size_mb: int = 1024
+    enable_audio_cache: bool = False
+    audio_cache_max_size_mb: int = 10240
+
+
 class Logging(BaseModel):
     """Configuration class for logging settings."""
 
@@ -138,12 +321,78 @@ class Logging(BaseModel):
     backtrace: bool = True
     diagnose: bool = True
     save_metadata: bool = True
-    metadata_csv_path: str = "metadata.csv"
+    # Transcription metadata is buffered and written to SQLite in batches
+    metadata_db_path: str = "metadata.sqlite3"
+    metadata_batch_size: int = 50
+    metadata_flush_interval: float = 5.0
+    # Deprecated, replaced by metadata_db_path. Only read to warn the configurations still setting it
+    metadata_csv_path: str | None = None
     # logfire settings
     enable_logfire: bool = False
     logfire_token: str | None = None
 
 
+class JobQueue(BaseModel):
+    """Configuration class for the durable job queue.
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        Whether to expand the inputs into a persistent queue of jobs drained by the workers, so an
+        interrupted run resumes where it stopped, by default False.
+    lease_timeout : float, optional
+        Seconds after which a job claimed by a worker that stopped renewing it is claimed again,
+        by default 600.
+    max_attempts : int, optional
+        Number of attempts before a job is marked as failed, by default 3.
+    """
+
+    enabled: bool = False
+    lease_timeout: float = 600.0
+    max_attempts: int = 3
+
+
+class Server(BaseModel):
+    """Configuration class for the resident server mode.
+
+    Parameters
+    ----------
+    host : str, optional
+        Address the HTTP API listens on, by default "127.0.0.1".
+    port : int, optional
+        Port the HTTP API listens on, by default 8765.
+    concurrency : int, optional
+        Number of jobs processed at the same time, all sharing the resident model, by default 1.
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 8765
+    concurrency: int = 1
+
+
+class Watch(BaseModel):
+    """Configuration class for the watch mode.
+
+    Parameters
+    ----------
+    settle_time : float, optional
+        Seconds a file must keep the same size and modification time, without any new event, before
+        it is considered completely written, by default 2.0.
+    poll_interval : float, optional
+        Seconds between two checks of the pending files, and between two scans when polling, by default 1.0.
+    concurrency : int, optional
+        Number of files transcribed at the same time, all sharing the resident model, by default 1.
+    use_polling : bool, optional
+        Whether to scan the folders periodically instead of using filesystem events, which is
+        also the fallback when the watchdog extra is not installed, by default False.
+    """
+
+    settle_time: float = 2.0
+    poll_interval: float = 1.0
+    concurrency: int = 1
+    use_polling: bool = False
+
+
 class Settings(BaseSettings):
     """Main settings class that combines all configuration components.
 
@@ -159,6 +408,16 @@ class Settings(BaseSettings):
         Logging configuration settings.
     yt_dlp : YtDlp
         YouTube-DL configuration settings.
+    workers : Workers
+        Worker pool configuration settings.
+    cache : Cache
+        Cache configuration settings.
+    job_queue : JobQueue
+        Job queue configuration settings.
+    server : Server
+        Server mode configuration settings.
+    watch : Watch
+        Watch mode configuration settings.
     """
 
     model_config = SettingsConfigDict(
@@ -173,6 +432,11 @@ class Settings(BaseSettings):
     whisper: Whisper = Field(default_factory=Whisper)
     logging: Logging = Field(default_factory=Logging)
     yt_dlp: YtDlp = Field(default_factory=YtDlp)
+    workers: Workers = Field(default_factory=Workers)
+    cache: Cache = Field(default_factory=Cache)
+    job_queue: JobQueue = Field(default_factory=JobQueue)
+    server: Server = Field(default_factory=Server)
+    watch: Watch = Field(default_factory=Watch)
 
 
 @lru_cache
@@ -183,6 +447,16 @@ def get_settings() -> Settings:
 settings = get_settings()
 
 
+def restore_settings(snapshot: dict[str, Any]) -> None:
+    """Replace the current settings with a snapshot taken with `settings.model_dump()`.
+
+    Used to hand the settings of the main process over to worker processes.
+    """
+    restored = Settings.model_validate(snapshot)
+    for name in Settings.model_fields:
+        setattr(settings, name, getattr(restored, name))
+
+
 def update_settings(
     urls_or_paths: list[str] | None = None,
     output_dir: str | None = None,
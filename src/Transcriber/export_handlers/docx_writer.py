@@ -0,0 +1,145 @@
+import io
+import os
+import re
+import zipfile
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from xml.sax.saxutils import escape, quoteattr
+
+from docx import Document
+
+from Transcriber.config import settings
+
+BODY_STYLE_ID = "TranscriptBody"
+DOCUMENT_PART = "word/document.xml"
+STYLES_PART = "word/styles.xml"
+
+# Characters that are not allowed in XML 1.0
+_INVALID_XML_CHARACTERS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+# Paragraphs are joined and written to the zip in blocks of this many
+_WRITE_BLOCK_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class DocxTemplate:
+    """Parts of an empty document, with the transcript body style added to its styles."""
+
+    # Every part except the document, as (name, content) in their original order
+    parts: tuple[tuple[str, bytes], ...]
+    # The document part before and after the paragraphs of the body
+    document_prefix: str
+    document_suffix: str
+
+
+@lru_cache(maxsize=8)
+def load_template(body_font_name: str, body_font_size: int, rtl: bool) -> DocxTemplate:
+    """
+    Build the template once per body font and direction from the default python-docx document.
+
+    The body font, size, alignment and direction are defined once in a paragraph style instead of
+    being repeated on every run.
+    """
+    buffer = io.BytesIO()
+    Document().save(buffer)
+
+    parts = []
+    document = ""
+    with zipfile.ZipFile(buffer) as archive:
+        for name in archive.namelist():
+            content = archive.read(name)
+            if name == DOCUMENT_PART:
+                document = content.decode("utf-8")
+                continue
+            if name == STYLES_PART:
+                content = _add_body_style(content.decode("utf-8"), body_font_name, body_font_size, rtl).encode("utf-8")
+            parts.append((name, content))
+
+    # The empty body only holds the section properties, paragraphs go before them
+    body_start = document.index("<w:body>") + len("<w:body>")
+    return DocxTemplate(tuple(parts), document[:body_start], document[body_start:])
+
+
+def write_docx(file_path: str, title: str, paragraphs: Iterable[str], rtl: bool = False) -> None:
+    """
+    Write a DOCX file with a centered title and one paragraph per text, streaming the document XML.
+
+    The output looks the same as the one built with the python-docx object model, but the
+    paragraphs are written straight into the zip and never held in memory all at once.
+
+    Args:
+        file_path: Path of the DOCX file
+        title: Text of the title
+        paragraphs: Texts of the body paragraphs
+        rtl: Whether the paragraphs are right-to-left
+    """
+    template = load_template(settings.output.body_font_name, settings.output.body_font_size, rtl)
+
+    partial_path = file_path + ".part"
+    with zipfile.ZipFile(partial_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in template.parts:
+            archive.writestr(name, content)
+
+        with archive.open(DOCUMENT_PART, "w") as document:
+            document.write(template.document_prefix.encode("utf-8"))
+            document.write(_title_paragraph(title, rtl).encode("utf-8"))
+
+            block = []
+            for text in paragraphs:
+                block.append(_body_paragraph(text))
+                if len(block) == _WRITE_BLOCK_SIZE:
+                    document.write("".join(block).encode("utf-8"))
+                    block.clear()
+            document.write("".join(block).encode("utf-8"))
+
+            document.write(template.document_suffix.encode("utf-8"))
+
+    os.replace(partial_path, file_path)
+
+
+def _add_body_style(styles: str, font_name: str, font_size: int, rtl: bool) -> str:
+    bidi = "<w:bidi/>" if rtl else ""
+    font = quoteattr(font_name)
+    style = (
+        f'<w:style w:type="paragraph" w:customStyle="1" w:styleId="{BODY_STYLE_ID}">'
+        '<w:name w:val="Transcript Body"/><w:basedOn w:val="Normal"/><w:qFormat/>'
+        f'<w:pPr>{bidi}<w:jc w:val="left"/></w:pPr>'
+        f'<w:rPr><w:rFonts w:ascii={font} w:hAnsi={font}/><w:sz w:val="{font_size * 2}"/></w:rPr>'
+        "</w:style>"
+    )
+    return styles.replace("</w:styles>", style + "</w:styles>")
+
+
+def _title_paragraph(title: str, rtl: bool) -> str:
+    # A single paragraph, formatted directly like python-docx does to keep the heading style fonts overridden
+    bidi = "<w:bidi/>" if rtl else ""
+    font = quoteattr(settings.output.title_font_name)
+    return (
+        f'<w:p><w:pPr><w:pStyle w:val="Heading1"/>{bidi}<w:jc w:val="center"/></w:pPr>'
+        f'<w:r><w:rPr><w:rFonts w:ascii={font} w:hAnsi={font}/><w:sz w:val="{settings.output.title_font_size * 2}"/>'
+        f"</w:rPr>{_run_content(title)}</w:r></w:p>"
+    )
+
+
+def _body_paragraph(text: str) -> str:
+    if not text:
+        return f'<w:p><w:pPr><w:pStyle w:val="{BODY_STYLE_ID}"/></w:pPr></w:p>'
+    return f'<w:p><w:pPr><w:pStyle w:val="{BODY_STYLE_ID}"/></w:pPr><w:r>{_run_content(text)}</w:r></w:p>'
+
+
+def _run_content(text: str) -> str:
+    """Content of a run, with tabs and line breaks as their own elements like python-docx writes them."""
+    text = escape(_INVALID_XML_CHARACTERS.sub("", text))
+    if "\t" not in text and "\n" not in text:
+        return f'<w:t xml:space="preserve">{text}</w:t>'
+
+    content = []
+    for piece in re.split(r"([\t\n])", text):
+        if piece == "\t":
+            content.append("<w:tab/>")
+        elif piece == "\n":
+            content.append("<w:br/>")
+        elif piece:
+            content.append(f'<w:t xml:space="preserve">{piece}</w:t>')
+    return "".join(content)
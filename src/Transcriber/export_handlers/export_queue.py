@@ -0,0 +1,117 @@
+import contextvars
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+
+from Transcriber.config import settings
+from Transcriber.export_handlers.exporter import Writer
+from Transcriber.logging import logger
+from Transcriber.types.segment_store import SegmentStore
+from Transcriber.utils.stage_timer import stage_timer
+
+
+class ExportQueue:
+    """
+    Background stage writing the outputs of a file while the next file is transcribed.
+
+    Exports run on a small thread pool, the model keeps decoding since inference releases the GIL.
+    At most `max_workers + max_pending` transcripts are held at once: when exports fall behind,
+    `submit` blocks until one of them is written, so memory stays bounded.
+
+    An export runs in the context of the code that submitted it, so its "export" stage is added to
+    the stages tracked for the file. A failed export is raised by the future `submit` returns.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        """
+        Initialize the export queue.
+
+        Args:
+            max_workers: Number of threads writing the outputs
+            max_pending: Number of transcripts that can wait for a free thread before `submit` blocks
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._futures: set[Future] = set()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        output_name: str,
+        segments: SegmentStore,
+        on_written: Callable[[BaseException | None], None] | None = None,
+    ) -> Future:
+        """
+        Queue the outputs of a file to be written, waiting for a free slot if the queue is full.
+
+        Args:
+            output_name: Base name of the output files
+            segments: Segments of the file
+            on_written: Called on the export thread once the outputs are written, with the error of a failed
+                export, before the returned future is done
+
+        Returns:
+            Future: Done once the outputs are written, raising the error of a failed export
+        """
+        with stage_timer.measure("export_wait"):
+            self._slots.acquire()
+
+        # The writer is created here, with the settings of the file rather than the ones at export time
+        context = contextvars.copy_context()
+        future = self._executor.submit(context.run, write_outputs, Writer(), output_name, segments, on_written)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def wait(self) -> None:
+        """Block until every queued export is written, failed or not. Failures are raised by the futures of `submit`."""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures)
+
+    def close(self) -> None:
+        """Write the queued exports and stop the threads."""
+        self._executor.shutdown(wait=True)
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+        self._slots.release()
+
+        if future.exception() is not None:
+            logger.opt(exception=future.exception()).error("Failed to write outputs in the background")
+
+
+def write_outputs(
+    writer: Writer,
+    output_name: str,
+    segments: SegmentStore,
+    on_written: Callable[[BaseException | None], None] | None = None,
+) -> None:
+    """
+    Write all the output formats of a file, then call `on_written` with the error of a failed write.
+
+    Args:
+        writer: Writer holding the output settings of the file
+        output_name: Base name of the output files
+        segments: Segments of the file
+        on_written: Called once the outputs are written, with None or the error of a failed write
+    """
+    try:
+        writer.write_all(output_name, segments)
+    except Exception as e:
+        if on_written is not None:
+            on_written(e)
+        raise
+    if on_written is not None:
+        on_written(None)
+
+
+@lru_cache
+def get_export_queue() -> ExportQueue:
+    return ExportQueue(
+        max_workers=settings.output.export_workers,
+        max_pending=settings.output.max_pending_exports,
+    )
@@ -1,19 +1,30 @@
+import json
 import os
+from collections.abc import Iterable, Sequence
 from pathlib import Path
 
-from docx import Document
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
-from docx.oxml import OxmlElement
-from docx.shared import Pt
-
 from Transcriber.config import settings
+from Transcriber.export_handlers import docx_writer
 from Transcriber.types.export_type import ExportType
+from Transcriber.types.segment_store import SegmentStore
 from Transcriber.types.segment_type import SegmentType
 from Transcriber.utils import time_utils
+from Transcriber.utils.stage_timer import stage_timer
 
 
 class Writer:
-    def write_all(self, file_name: str, segments: list[SegmentType]) -> None:
+    VTT_HEADER = "WEBVTT\n\n"
+
+    def __init__(self):
+        # The language is read when the writer is created, outputs written later in the background keep
+        # the language they were transcribed with even once the settings moved on to another source
+        self.language = settings.whisper.language
+
+    def write_all(self, file_name: str, segments: Sequence[SegmentType]) -> None:
+        with stage_timer.measure("export"):
+            self._write_all(file_name, SegmentStore.from_segments(segments))
+
+    def _write_all(self, file_name: str, segments: SegmentStore) -> None:
         should_compact = settings.output.min_words_per_segment > 0
         segments_to_write = (
             self.compact_segments(segments, settings.output.min_words_per_segment) if should_compact else segments
@@ -29,12 +40,12 @@ class Writer:
                     segments,
                 )
 
-            # Save compacted or regular version
+            # Save compacted or regular version, JSONL keeps the raw segments
             self.write(
                 ExportType(output_format),
                 format_output_dir,
                 f"{file_name}.{output_format}",
-                segments_to_write,
+                segments if ExportType(output_format) == ExportType.JSONL else segments_to_write,
             )
 
     def write(
@@ -42,9 +53,11 @@ class Writer:
         export_format: ExportType,
         output_dir: str,
         file_path: str,
-        segments: list[SegmentType],
+        segments: Sequence[SegmentType],
     ) -> None:
         file_path = os.path.join(output_dir, file_path)
+        # Files found in subdirectories keep their subdirectories in the output directory
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
         if export_format == ExportType.TXT:
             self.write_txt(file_path, segments)
         elif export_format == ExportType.SRT:
@@ -53,102 +66,67 @@ class Writer:
             self.write_vtt(file_path, segments)
         elif export_format == ExportType.DOCX:
             self.write_docx(file_path, segments)
+        elif export_format == ExportType.JSONL:
+            self.write_jsonl(file_path, segments)
 
-    def write_txt(self, file_path: str, segments: list[SegmentType]) -> None:
+    def write_txt(self, file_path: str, segments: Sequence[SegmentType]) -> None:
         self._write_to_file(file_path, self.generate_txt(segments))
 
-    def write_srt(self, file_path: str, segments: list[SegmentType]) -> None:
+    def write_srt(self, file_path: str, segments: Sequence[SegmentType]) -> None:
         self._write_to_file(file_path, self.generate_srt(segments))
 
-    def write_vtt(self, file_path: str, segments: list[SegmentType]) -> None:
+    def write_vtt(self, file_path: str, segments: Sequence[SegmentType]) -> None:
         self._write_to_file(file_path, self.generate_vtt(segments))
 
-    def write_docx(self, file_path: str, segments: list[SegmentType]) -> None:
-        doc = Document()
-        file_name = os.path.basename(file_path)
-        title = os.path.splitext(file_name)[0]
-        header = doc.add_heading(title, level=1)
-
-        if self.is_rtl():
-            # Set the header direction to RTL
-            self.set_element_rtl(header)
-
-        # Set the header alignment to center
-        header.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        # Set the font size and name for the header
-        header_font = header.runs[0].font
-        header_font.size = Pt(settings.output.title_font_size)
-        header_font.name = settings.output.title_font_name
-
-        for segment in segments:
-            paragraph_text = segment["text"].strip()
-
-            if self.is_rtl():
-                # Replace characters for RTL
-                paragraph_text = self.prepare_text_for_rtl(paragraph_text)
-
-            paragraph = doc.add_paragraph(paragraph_text)
-
-            if self.is_rtl():
-                # Set the paragraph direction to RTL using XML
-                self.set_element_rtl(paragraph)
-                # In RTL mode, LEFT alignment is actually right-aligned
-                # Set the alignment to LEFT, which will be interpreted as right-aligned in RTL mode
-                paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-            else:
-                paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.LEFT
-
-            # change font size
-            for run in paragraph.runs:
-                font = run.font
-                font.size = Pt(settings.output.body_font_size)
-                font.name = settings.output.body_font_name
-
-        doc.save(file_path)
-
-    def generate_txt(self, segments: list[SegmentType]) -> str:
-        return "\n".join(list(map(lambda segment: segment["text"].strip(), segments))) + "\n"
-
-    def generate_srt(self, segments: list[SegmentType]) -> str:
-        return "".join(
-            f"{i}\n"
+    def write_jsonl(self, file_path: str, segments: Sequence[SegmentType]) -> None:
+        self._write_to_file(file_path, self.generate_jsonl(segments))
+
+    def write_docx(self, file_path: str, segments: Iterable[SegmentType]) -> None:
+        rtl = self.is_rtl()
+        title = os.path.splitext(os.path.basename(file_path))[0]
+        paragraphs = (segment["text"].strip() for segment in segments)
+        if rtl:
+            # Replace characters for RTL
+            paragraphs = (self.prepare_text_for_rtl(paragraph) for paragraph in paragraphs)
+        docx_writer.write_docx(file_path, title, paragraphs, rtl=rtl)
+
+    def generate_txt(self, segments: Sequence[SegmentType]) -> str:
+        return "".join(self.format_txt_line(segment) for segment in segments)
+
+    def generate_srt(self, segments: Sequence[SegmentType]) -> str:
+        return "".join(self.format_srt_entry(i, segment) for i, segment in enumerate(segments, start=1))
+
+    def generate_vtt(self, segments: Sequence[SegmentType]) -> str:
+        return self.VTT_HEADER + "".join(self.format_vtt_entry(segment) for segment in segments)
+
+    def generate_jsonl(self, segments: Sequence[SegmentType]) -> str:
+        return "".join(self.format_jsonl_line(segment) for segment in segments)
+
+    def format_jsonl_line(self, segment: SegmentType) -> str:
+        return json.dumps(segment, ensure_ascii=False) + "\n"
+
+    def format_txt_line(self, segment: SegmentType) -> str:
+        return f"{segment['text'].strip()}\n"
+
+    def format_srt_entry(self, index: int, segment: SegmentType) -> str:
+        return (
+            f"{index}\n"
             f"{time_utils.format_timestamp(segment['start'], include_hours=True, decimal_marker=',')} --> "
             f"{time_utils.format_timestamp(segment['end'], include_hours=True, decimal_marker=',')}\n"
             f"{segment['text'].strip()}\n\n"
-            for i, segment in enumerate(segments, start=1)
         )
 
-    def generate_vtt(self, segments: list[SegmentType]) -> str:
-        return "WEBVTT\n\n" + "".join(
+    def format_vtt_entry(self, segment: SegmentType) -> str:
+        return (
             f"{time_utils.format_timestamp(segment['start'])} --> {time_utils.format_timestamp(segment['end'])}\n"
             f"{segment['text'].strip()}\n\n"
-            for segment in segments
         )
 
-    def compact_segments(self, segments: list[SegmentType], min_words_per_segment: int) -> list[SegmentType]:
+    def compact_segments(self, segments: Sequence[SegmentType], min_words_per_segment: int) -> Sequence[SegmentType]:
         if min_words_per_segment == 0:
             return segments
 
-        compacted_segments = []
-        tmp_segment = None
-
-        for segment in segments:
-            if tmp_segment:
-                tmp_segment["text"] += f" {segment['text'].strip()}"
-                tmp_segment["end"] = segment["end"]
-
-                if len(tmp_segment["text"].split()) >= min_words_per_segment:
-                    compacted_segments.append(tmp_segment)
-                    tmp_segment = None
-            elif len(segment["text"].split()) < min_words_per_segment:
-                tmp_segment = segment.copy()
-            elif len(segment["text"].split()) >= min_words_per_segment:
-                compacted_segments.append(segment.copy())
-
-        if tmp_segment:
-            compacted_segments.append(tmp_segment)
-
-        return compacted_segments
+        return SegmentStore.from_segments(segments).compact(min_words_per_segment)
 
     def is_output_exist(self, file_name: str):
         if settings.output.save_files_before_compact and not all(
@@ -179,19 +157,10 @@ class Writer:
 
     def is_rtl(self) -> bool:
         """Checks if the current output setting is right-to-left."""
-        if settings.whisper.language == "ar":
+        if self.language == "ar":
             return True
         return False
 
-    def set_element_rtl(self, element):
-        """Sets the element to right-to-left using XML."""
-        # Get element properties container that holds formatting attributes
-        element_properties = element._element.get_or_add_pPr()
-        # Create a new XML element for right-to-left direction
-        rtl_element = OxmlElement("w:bidi")
-        # Append the element to the element properties container
-        element_properties.append(rtl_element)
-
     def prepare_text_for_rtl(self, text: str) -> str:
         """
         Replaces characters in the text from LTR to RTL.
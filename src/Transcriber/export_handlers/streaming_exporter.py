@@ -0,0 +1,159 @@
+import json
+import os
+from collections.abc import Iterator
+from typing import IO
+
+from Transcriber.config import settings
+from Transcriber.export_handlers.exporter import Writer
+from Transcriber.types.export_type import ExportType
+from Transcriber.types.segment_store import SegmentCompactor
+from Transcriber.types.segment_type import SegmentType
+from Transcriber.utils.stage_timer import stage_timer
+
+PARTIAL_SUFFIX = ".part"
+
+
+class IncrementalFileWriter:
+    """
+    Appends formatted segments to a temporary file and moves it in place once it is complete.
+
+    Readers never see a half written transcript: the output only appears, atomically, when
+    `finalize` is called.
+    """
+
+    def __init__(self, export_format: ExportType, file_path: str, formatter: Writer):
+        self.export_format = export_format
+        self.file_path = file_path
+        self.partial_path = file_path + PARTIAL_SUFFIX
+        self.formatter = formatter
+        self.count = 0
+        self._file: IO[str] = open(self.partial_path, "w", encoding="utf-8")
+
+        if export_format == ExportType.VTT:
+            self._file.write(Writer.VTT_HEADER)
+
+    def write(self, segment: SegmentType) -> None:
+        self.count += 1
+        if self.export_format == ExportType.TXT:
+            self._file.write(self.formatter.format_txt_line(segment))
+        elif self.export_format == ExportType.SRT:
+            self._file.write(self.formatter.format_srt_entry(self.count, segment))
+        elif self.export_format == ExportType.VTT:
+            self._file.write(self.formatter.format_vtt_entry(segment))
+        elif self.export_format == ExportType.JSONL:
+            self._file.write(self.formatter.format_jsonl_line(segment))
+
+    def finalize(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.partial_path, self.file_path)
+
+    def abort(self) -> None:
+        self._file.close()
+        if os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
+
+
+class StreamingWriter:
+    """
+    Streaming counterpart of `Writer.write_all`.
+
+    Segments are compacted and appended to the TXT, SRT and VTT outputs as the recognizer yields
+    them, so nothing has to be held in memory and progress is visible on disk during long
+    transcriptions. The JSONL output gets the raw segments, like with `Writer.write_all`. The DOCX
+    output (which cannot be written incrementally) is rendered from a JSONL spool of its segments
+    when the transcript is finalized.
+
+    Use it as a context manager: outputs are finalized when the block exits normally and discarded
+    if it raises.
+    """
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.formatter = Writer()
+        self.min_words_per_segment = settings.output.min_words_per_segment
+        self.should_compact = self.min_words_per_segment > 0
+        self.save_original = settings.output.save_files_before_compact and self.should_compact
+        self.count = 0
+        # Writers of the raw segments, and of the compacted ones
+        self._raw_writers: list[IncrementalFileWriter] = []
+        self._compacted_writers: list[IncrementalFileWriter] = []
+        self._docx_paths: list[tuple[str, str]] = []
+        self.compactor = SegmentCompactor(
+            self.min_words_per_segment,
+            lambda start, end, text: self._write(self._compacted_writers, SegmentType(text=text, start=start, end=end)),
+        )
+
+        for suffix in ("-original", "") if self.save_original else ("",):
+            for output_format in settings.output.output_formats:
+                export_format = ExportType(output_format)
+                file_path = os.path.join(
+                    settings.output.output_dir, output_format, f"{self.file_name}{suffix}.{output_format}"
+                )
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                compacted = suffix == "" and self.should_compact and export_format != ExportType.JSONL
+                writers = self._compacted_writers if compacted else self._raw_writers
+                if export_format == ExportType.DOCX:
+                    spool_path = file_path + ".jsonl"
+                    self._docx_paths.append((file_path, spool_path))
+                    writers.append(IncrementalFileWriter(ExportType.JSONL, spool_path, self.formatter))
+                else:
+                    writers.append(IncrementalFileWriter(export_format, file_path, self.formatter))
+
+    def __enter__(self) -> "StreamingWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.finalize()
+        else:
+            self.abort()
+
+    def write(self, segment: SegmentType) -> None:
+        """Append a raw segment to the outputs, compacting it first for the compacted ones."""
+        self.count += 1
+        with stage_timer.measure("export"):
+            self._write(self._raw_writers, segment)
+            if self._compacted_writers:
+                self.compactor.push(segment["start"], segment["end"], segment["text"])
+
+    def finalize(self) -> bool:
+        """
+        Move the outputs in place, rendering the DOCX outputs from their spool.
+
+        Returns:
+            bool: False if no segment was written, in which case no output is created.
+        """
+        if self.count == 0:
+            self.abort()
+            return False
+
+        with stage_timer.measure("export"):
+            self._finalize()
+        return True
+
+    def _finalize(self) -> None:
+        self.compactor.flush()
+        for writer in (*self._raw_writers, *self._compacted_writers):
+            writer.finalize()
+
+        for docx_path, spool_path in self._docx_paths:
+            self.formatter.write_docx(docx_path, self._read_spool(spool_path))
+            os.remove(spool_path)
+
+    def abort(self) -> None:
+        """Discard all partial outputs."""
+        for writer in (*self._raw_writers, *self._compacted_writers):
+            writer.abort()
+
+    @staticmethod
+    def _write(writers: list[IncrementalFileWriter], segment: SegmentType) -> None:
+        for writer in writers:
+            writer.write(segment)
+
+    @staticmethod
+    def _read_spool(spool_path: str) -> Iterator[SegmentType]:
+        with open(spool_path, encoding="utf-8") as file:
+            for line in file:
+                yield json.loads(line)
@@ -82,6 +82,15 @@ def get_logfire() -> None:
         return
 
 
+def warn_deprecated_settings() -> None:
+    """Warn about the settings that are still set but no longer used."""
+    if settings.logging.metadata_csv_path:
+        logger.warning(
+            "LOGGING__METADATA_CSV_PATH is deprecated and ignored, the transcription metadata is stored in "
+            "LOGGING__METADATA_DB_PATH, export it as CSV with the transcriber-metrics command"
+        )
+
+
 def setup_logging() -> None:
     """Set up logging configuration."""
     # Remove the default console handler
@@ -96,6 +105,7 @@ def setup_logging() -> None:
 
     # Log initialization
     logger.debug("Settings", settings=settings)
+    warn_deprecated_settings()
     logger.info("Logging initialized")
 
 
@@ -0,0 +1,6 @@
+"""Resident server mode: a long-running process keeping the model loaded and accepting jobs over HTTP."""
+
+from Transcriber.server.app import serve
+from Transcriber.server.jobs import Job, JobManager
+
+__all__ = ["Job", "JobManager", "serve"]
@@ -0,0 +1,107 @@
+import json
+import mimetypes
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from Transcriber.logging import logger
+from Transcriber.server.jobs import JobManager
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    Local HTTP API of the server.
+
+    Routes:
+        POST /jobs                             Submit a job, the body is {"source": "<path or URL>"}
+        GET  /jobs                             List the jobs
+        GET  /jobs/<job_id>                    Status of a job
+        GET  /jobs/<job_id>/outputs/<file>     Content of an output file of a finished job
+        GET  /health                           Liveness check
+    """
+
+    server: "JobServer"
+
+    def do_GET(self) -> None:
+        parts = self.path.strip("/").split("/")
+
+        if parts == ["health"]:
+            self._send_json(HTTPStatus.OK, {"status": "ok"})
+        elif parts == ["jobs"]:
+            self._send_json(HTTPStatus.OK, {"jobs": [job.to_dict() for job in self.server.jobs.list()]})
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.server.jobs.get(parts[1])
+            if job is None:
+                self._send_error(HTTPStatus.NOT_FOUND, "Job not found")
+            else:
+                self._send_json(HTTPStatus.OK, job.to_dict())
+        elif len(parts) == 4 and parts[0] == "jobs" and parts[2] == "outputs":
+            self._send_output(parts[1], parts[3])
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+
+    def do_POST(self) -> None:
+        if self.path.strip("/") != "jobs":
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+            return
+
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except json.JSONDecodeError:
+            self._send_error(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+            return
+
+        source = body.get("source") if isinstance(body, dict) else None
+        if not isinstance(source, str) or not source:
+            self._send_error(HTTPStatus.BAD_REQUEST, 'Body must contain a "source" path or URL')
+            return
+
+        job = self.server.jobs.submit(source)
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict(), headers={"Location": f"/jobs/{job.id}"})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def _send_output(self, job_id: str, file_name: str) -> None:
+        job = self.server.jobs.get(job_id)
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, "Job not found")
+            return
+
+        # Only the files written by the job can be fetched
+        paths = [Path(path) for paths in job.outputs.values() for path in paths]
+        path = next((path for path in paths if path.name == file_name), None)
+        if path is None or not path.is_file():
+            self._send_error(HTTPStatus.NOT_FOUND, "Output not found")
+            return
+
+        content = path.read_bytes()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", mimetypes.guess_type(path.name)[0] or "application/octet-stream")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _send_json(self, status: HTTPStatus, payload: Any, headers: dict[str, str] | None = None) -> None:
+        content = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_json(status, {"error": message})
+
+
+class JobServer(ThreadingHTTPServer):
+    """HTTP server giving the request handlers access to the job manager."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], jobs: JobManager):
+        super().__init__(address, JobRequestHandler)
+        self.jobs = jobs
@@ -0,0 +1,48 @@
+from Transcriber.config import settings
+from Transcriber.export_handlers.export_queue import get_export_queue
+from Transcriber.logging import logger
+from Transcriber.server.api import JobServer
+from Transcriber.server.jobs import JobManager
+from Transcriber.transcriber import prepare_output_directory
+from Transcriber.utils.whisper.whisper_utils import LazyModel
+
+
+def serve(host: str | None = None, port: int | None = None, concurrency: int | None = None) -> None:
+    """
+    Run the resident server: load the model once and process the jobs submitted over HTTP.
+
+    Args:
+        host: Address to listen on, defaults to the server settings.
+        port: Port to listen on, defaults to the server settings.
+        concurrency: Number of jobs processed at the same time, defaults to the server settings.
+    """
+    host = host or settings.server.host
+    port = port or settings.server.port
+    concurrency = concurrency or settings.server.concurrency
+
+    settings.output.process_formats()
+    prepare_output_directory()
+
+    # Loaded up front so the jobs only pay for inference
+    model = LazyModel()
+    model.get()
+
+    jobs = JobManager(concurrency, model)
+    jobs.start()
+
+    server = JobServer((host, port), jobs)
+    logger.info(
+        "Serving the job API on http://{host}:{port}",
+        host=host,
+        port=server.server_address[1],
+        concurrency=concurrency,
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopping the server")
+    finally:
+        server.server_close()
+        jobs.stop()
+        get_export_queue().close()
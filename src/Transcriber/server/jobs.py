@@ -0,0 +1,224 @@
+import queue
+import threading
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal
+
+from Transcriber.config import settings
+from Transcriber.export_handlers.exporter import Writer
+from Transcriber.logging import logger
+from Transcriber.source_loaders import directory_scanner
+from Transcriber.source_loaders.download_pipeline import DownloadPipeline
+from Transcriber.transcriber import (
+    create_downloader,
+    extract_elements_from_url_data,
+    scan_local_path,
+    should_skip,
+    transcribe_file,
+)
+from Transcriber.utils.whisper.whisper_utils import LazyModel
+
+JobStatus = Literal["queued", "running", "done", "failed"]
+
+
+@dataclass
+class Job:
+    """A transcription job submitted to the server, for a local path or a URL."""
+
+    id: str
+    source: str
+    status: JobStatus = "queued"
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+    # Output files of every transcribed media, by output name
+    outputs: dict[str, list[str]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "source": self.source,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+            "outputs": self.outputs,
+        }
+
+
+def output_paths(output_name: str) -> list[str]:
+    """Paths of the output files written for a transcribed media."""
+    paths = []
+    for output_format in settings.output.output_formats:
+        for suffix in ("", "-original"):
+            path = Path(settings.output.output_dir, output_format, f"{output_name}{suffix}.{output_format}")
+            if path.is_file():
+                paths.append(str(path.absolute()))
+    return paths
+
+
+def resolve_media(source: str) -> Iterator[tuple[str, str | None]]:
+    """
+    Yield the media files of a job as (output_name, file_path) pairs, downloading them for URLs.
+
+    The elements of a URL are downloaded in the background and yielded as soon as they are
+    downloaded, so the first one is transcribed while the next ones are still downloading.
+
+    Args:
+        source: Local file or directory, or URL supported by yt-dlp
+
+    Yields:
+        tuple: The output name and the path of a media file, the path is None when the outputs
+            already exist and the media is skipped. Elements that could not be downloaded are left out
+    """
+    path = Path(source)
+    if path.exists():
+        for file in scan_local_path(path):
+            output_name = directory_scanner.output_name(file.path, path)
+            yield output_name, None if is_done(output_name) else str(file.path.absolute())
+        return
+
+    if not (source.startswith("http") or source.startswith("www")):
+        raise ValueError(f"Unsupported source: {source}")
+
+    downloader = create_downloader()
+    pending_elements = []
+    for element in extract_elements_from_url_data(downloader.extract_info(source)):
+        if should_skip(element):
+            logger.info(f"Skipping element: {element.get('title', 'Unknown')}")
+        elif is_done(element["id"]):
+            yield element["id"], None
+        else:
+            pending_elements.append(element)
+
+    pipeline = DownloadPipeline(
+        downloader,
+        max_workers=settings.yt_dlp.concurrent_downloads,
+        retries=settings.yt_dlp.download_retries,
+    )
+    for result in pipeline.run(pending_elements):
+        if result.file_path is None:
+            logger.error(f"Failed to download element: {result.element['id']}")
+            continue
+        yield result.element["id"], result.file_path
+
+
+def is_done(output_name: str) -> bool:
+    """Whether the outputs of a media already exist and it is skipped."""
+    return settings.input.skip_if_output_exist and Writer().is_output_exist(output_name)
+
+
+class JobManager:
+    """
+    Runs the submitted jobs on an internal queue with a fixed number of threads.
+
+    Every job shares the same resident model, so a job only pays for inference. Jobs are kept in
+    memory and lost when the server stops.
+    """
+
+    def __init__(self, concurrency: int, model: LazyModel):
+        """
+        Initialize the job manager.
+
+        Args:
+            concurrency: Number of jobs processed at the same time
+            model: Model shared by all the jobs
+        """
+        self.concurrency = concurrency
+        self.model = model
+        self._jobs: dict[str, Job] = {}
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        for index in range(self.concurrency):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        """Stop the worker threads once the running jobs are finished."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+    def submit(self, source: str) -> Job:
+        job = Job(id=uuid.uuid4().hex, source=source)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._queue.put(job.id)
+        logger.info("Queued job {job_id}", job_id=job.id, source=source)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            job = self.get(job_id)
+            if job is not None:
+                self._run(job)
+
+    def _run(self, job: Job) -> None:
+        job.status = "running"
+        job.started_at = datetime.now(UTC)
+        logger.info("Running job {job_id}", job_id=job.id, source=job.source)
+
+        try:
+            failures = self._transcribe(job)
+        except Exception as e:
+            logger.exception(f"Job {job.id} failed")
+            job.error = str(e)
+            job.status = "failed"
+        else:
+            if failures:
+                job.error = f"{failures} media failed to transcribe"
+            job.status = "failed" if failures else "done"
+        finally:
+            job.finished_at = datetime.now(UTC)
+
+        logger.info("Finished job {job_id}", job_id=job.id, status=job.status)
+
+    def _transcribe(self, job: Job) -> int:
+        """Transcribe the media of a job, returning the number of media that failed."""
+        failures = 0
+        output_names = []
+        exports: list[tuple[str, Future]] = []
+        for output_name, file_path in resolve_media(job.source):
+            output_names.append(output_name)
+            if file_path is None:
+                continue
+            try:
+                export = transcribe_file(file_path, output_name, self.model, None)
+            except Exception:
+                logger.exception(f"Error processing file {output_name}")
+                failures += 1
+            else:
+                if export is not None:
+                    exports.append((output_name, export))
+
+        # The outputs are listed once they are all written
+        for output_name, export in exports:
+            if export.exception() is not None:
+                logger.error(f"Error writing the outputs of {output_name}")
+                failures += 1
+        # Assigned at once, the HTTP handlers read the outputs from other threads
+        job.outputs = {output_name: output_paths(output_name) for output_name in output_names}
+        return failures
@@ -0,0 +1,137 @@
+import itertools
+import mimetypes
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+# Leading bytes of the audio/video containers recognized by content sniffing, as (offset, signature)
+MEDIA_SIGNATURES = (
+    (0, b"ID3"),  # MP3 with ID3 tag
+    (0, b"\xff\xfb"),  # MP3 frame
+    (0, b"\xff\xf3"),
+    (0, b"\xff\xf2"),
+    (0, b"\xff\xf1"),  # AAC ADTS
+    (0, b"\xff\xf9"),
+    (0, b"fLaC"),
+    (0, b"OggS"),  # Ogg (Vorbis/Opus)
+    (0, b"\x1a\x45\xdf\xa3"),  # Matroska/WebM
+    (0, b"#!AMR"),
+    (0, b"\x30\x26\xb2\x75\x8e\x66\xcf\x11"),  # ASF (WMA/WMV)
+    (4, b"ftyp"),  # MP4/M4A/MOV
+    (8, b"WAVE"),  # RIFF WAVE
+    (8, b"AVI "),  # RIFF AVI
+    (8, b"AIFF"),  # FORM AIFF
+    (8, b"AIFC"),
+)
+
+SNIFF_SIZE = 16
+
+
+@dataclass(frozen=True)
+class ScannedFile:
+    """A media file found by the scanner, with the stat fields the manifest compares."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+
+
+def is_media_name(name: str) -> bool:
+    """Whether the extension of a file name is an audio or video type."""
+    mime = mimetypes.guess_type(name)[0]
+    return mime is not None and mime.split("/")[0] in ("audio", "video")
+
+
+def sniff_media(path: str) -> bool:
+    """Whether the first bytes of a file match a known audio or video container."""
+    try:
+        with open(path, "rb") as file:
+            head = file.read(SNIFF_SIZE)
+    except OSError:
+        return False
+    return any(head.startswith(signature, offset) for offset, signature in MEDIA_SIGNATURES)
+
+
+def is_media_file(path: str, sniff_content: bool = False) -> bool:
+    """Whether a file is an audio or video file, by its extension or, when sniffing, by its first bytes."""
+    return is_media_name(os.path.basename(path)) or (sniff_content and sniff_media(path))
+
+
+def scan_media_files(
+    path: Path,
+    recursive: bool = False,
+    sniff_content: bool = False,
+    max_workers: int = 8,
+) -> list[ScannedFile]:
+    """
+    List the media files of a file or directory with `os.scandir`.
+
+    Sibling directories are scanned in parallel, one level at a time. The size and modification time
+    come from the directory entries, so a file costs at most one `stat` call. Symbolic links to
+    directories are not followed.
+
+    Args:
+        path: Media file or directory to scan
+        recursive: Whether to scan the subdirectories as well
+        sniff_content: Whether files without a media extension are recognized by their first bytes
+        max_workers: Number of directories scanned at the same time
+
+    Returns:
+        list: The media files, sorted by path
+    """
+    if path.is_file():
+        stat = path.stat()
+        if is_media_file(str(path), sniff_content):
+            return [ScannedFile(path, stat.st_size, stat.st_mtime_ns)]
+        return []
+
+    files: list[ScannedFile] = []
+    directories = [str(path)]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="scan") as executor:
+        while directories:
+            results = list(executor.map(lambda directory: _scan_directory(directory, sniff_content), directories))
+            files.extend(itertools.chain.from_iterable(found for found, _ in results))
+            directories = list(itertools.chain.from_iterable(subdirectories for _, subdirectories in results))
+            if not recursive:
+                break
+
+    return sorted(files, key=lambda file: file.path)
+
+
+def output_name(path: Path, root: Path) -> str:
+    """
+    Base name of the output files of a scanned media file.
+
+    The name is the path of the file relative to the scanned directory, without its extension, so
+    the files of subdirectories get their outputs in the same subdirectories and `a/01.mp3` never
+    shares its outputs with `b/01.mp3`. A scanned file is named after its stem.
+
+    Args:
+        path: Media file found by the scanner
+        root: File or directory that was scanned
+    """
+    root = root.absolute()
+    if not root.is_dir():
+        root = root.parent
+    return path.absolute().relative_to(root).with_suffix("").as_posix()
+
+
+def _scan_directory(directory: str, sniff_content: bool) -> tuple[list[ScannedFile], list[str]]:
+    """Media files and subdirectories of a single directory, unreadable entries are left out."""
+    files = []
+    subdirectories = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                    elif entry.is_file() and is_media_file(entry.path, sniff_content):
+                        stat = entry.stat()
+                        files.append(ScannedFile(Path(entry.path), stat.st_size, stat.st_mtime_ns))
+                except OSError:
+                    continue
+    except OSError:
+        return [], []
+    return files, subdirectories
@@ -0,0 +1,93 @@
+import queue
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+from Transcriber.logging import logger
+from Transcriber.source_loaders.downloader import Downloader
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of downloading a single playlist entry."""
+
+    element: dict[str, Any]
+    file_path: str | None
+    started_at: float
+    finished_at: float
+
+
+class DownloadPipeline:
+    """
+    Producer side of the URL processing pipeline.
+
+    Entries are downloaded by a bounded thread pool and handed over through a queue in the order
+    they finish, so the consumer can start transcribing the first entry while the next ones are
+    still downloading. The queue is bounded as well: when transcription falls behind, download
+    threads wait instead of filling the disk with files nobody is ready to process.
+
+    Attributes:
+        intervals (list[tuple[float, float]]): Monotonic (start, end) times of every finished download
+    """
+
+    def __init__(self, downloader: Downloader, max_workers: int = 2, retries: int = 3):
+        """
+        Initialize the pipeline.
+        Args:
+            downloader (Downloader): Downloader used to fetch the entries
+            max_workers (int, optional): Number of entries downloaded at the same time. Defaults to 2.
+            retries (int, optional): Number of retry attempts per entry. Defaults to 3.
+        """
+        self.downloader = downloader
+        self.max_workers = max(1, max_workers)
+        self.retries = retries
+        self.intervals: list[tuple[float, float]] = []
+        self._results: queue.Queue[DownloadResult] = queue.Queue(maxsize=self.max_workers)
+        self._stop = threading.Event()
+
+    def run(self, elements: list[dict[str, Any]]) -> Iterator[DownloadResult]:
+        """
+        Download the elements and yield each result as soon as it is available.
+        Leaving the loop early stops scheduling new downloads.
+        Args:
+            elements (list[dict[str, Any]]): Entries to download
+        Yields:
+            DownloadResult: The downloaded entry and the path of its audio file
+        """
+        if not elements:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="download")
+        try:
+            for element in elements:
+                executor.submit(self._download, element)
+
+            for _ in range(len(elements)):
+                result = self._results.get()
+                self.intervals.append((result.started_at, result.finished_at))
+                yield result
+        finally:
+            self._stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _download(self, element: dict[str, Any]) -> None:
+        if self._stop.is_set():
+            return
+
+        started_at = time.monotonic()
+        file_path = None
+        try:
+            file_path = self.downloader.download_entry(element, retries=self.retries)
+        except Exception:
+            logger.exception(f"Error downloading element: {element.get('id', 'Unknown')}")
+
+        result = DownloadResult(element, file_path, started_at, time.monotonic())
+        while not self._stop.is_set():
+            try:
+                self._results.put(result, timeout=0.5)
+                return
+            except queue.Full:
+                continue
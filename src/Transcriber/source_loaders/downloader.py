@@ -1,9 +1,23 @@
 import json
 import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import yt_dlp
 
+from Transcriber.logging import logger
+
+# How downloaded audio is stored:
+# - mp3: re-encoded to MP3
+# - native: the best audio stream in its original container (opus/m4a/webm), no re-encoding
+# - pcm: decoded once to mono 16 kHz 16-bit WAV, which the recognizer reads without decoding
+AUDIO_FORMATS = ("mp3", "native", "pcm")
+
+# Extensions of the audio files that can be left in the output directory by a download
+AUDIO_EXTENSIONS = ("mp3", "wav", "m4a", "webm", "opus", "ogg", "aac", "flac", "mp4")
+
 
 class Downloader:
     """
@@ -13,8 +27,7 @@ class Downloader:
     retrying failed downloads and saving response data.
     Attributes:
         yt_dlp_options (str): JSON string containing custom options for yt-dlp configuration
-        youtube_dl_with_archive: YoutubeDL instance that tracks download history
-        youtube_dl_without_archive: YoutubeDL instance that doesn't track download history
+        youtube_dl_without_archive: YoutubeDL instance used for the flat metadata extraction
         ```python
         downloader = Downloader(
             yt_dlp_options='{"format": "bestaudio"}',
@@ -23,68 +36,186 @@ class Downloader:
         ```
     """
 
-    def __init__(self, yt_dlp_options: str, output_dir: str):
+    def __init__(
+        self,
+        yt_dlp_options: str,
+        output_dir: str,
+        audio_format: str = "mp3",
+        max_workers: int = 1,
+        retry_backoff: float = 1.0,
+        youtube_dl_factory: Callable[[dict[str, Any]], yt_dlp.YoutubeDL] = yt_dlp.YoutubeDL,
+    ):
         """
         Initialize a source loader with YouTube-DL configuration.
         Args:
             yt_dlp_options (str): Options string for yt-dlp configuration
             output_dir (str): Directory path where downloaded files will be saved
+            audio_format (str, optional): How the audio is stored, see `AUDIO_FORMATS`. Defaults to "mp3".
+            max_workers (int, optional): Number of entries `download` fetches at the same time. Defaults to 1.
+            retry_backoff (float, optional): Seconds to wait before the first retry of an entry, doubled on
+                every further retry. Defaults to 1.0.
+            youtube_dl_factory (Callable, optional): Builds a YoutubeDL instance from a configuration, can be
+                replaced to point the downloader at a stand-in. Defaults to `yt_dlp.YoutubeDL`.
         Description:
-            Creates a new loader instance and initializes two YouTube-DL configurations:
-            - One with download archive tracking
-            - One without download archive tracking
-        The configurations are used for different download scenarios based on whether
-        history tracking is needed.
+            Creates a new loader instance and initializes the YouTube-DL configuration used for
+            the flat metadata extraction. Downloads use a fresh instance per entry, which tracks
+            the download history in the archive.
         """
         self.yt_dlp_options = yt_dlp_options
         self.output_dir = output_dir
+        self.audio_format = audio_format
+        self.max_workers = max(1, max_workers)
+        self.retry_backoff = retry_backoff
+        self.youtube_dl_factory = youtube_dl_factory
 
-        self._initialize_youtube_dl_with_archive()
         self._initialize_youtube_dl_without_archive()
 
     def download(self, url: str, retries: int = 3, save_response: bool = False) -> dict[str, Any]:
         """Downloads and extracts information from a given URL using youtube-dl.
-        This method attempts to download content from the provided URL and extract its information.
-        It includes a retry mechanism for failed attempts and an option to save the response data.
+        The metadata is extracted once, flat, then every entry is downloaded on its own on a bounded
+        thread pool. A failed entry is retried alone, with an exponential backoff, without walking the
+        rest of the playlist again.
         Args:
             url (str): The URL to download content from
-            retries (int, optional): Number of retry attempts if download fails. Defaults to 3.
+            retries (int, optional): Number of retry attempts per entry if its download fails. Defaults to 3.
             save_response (bool, optional): Whether to save the extracted information to a file. Defaults to False.
         Returns:
-            dict[str, Any]: Dictionary containing the extracted information from the URL
+            dict[str, Any]: Dictionary containing the extracted information from the URL, the downloaded
+                entries carry the path of their audio file under 'filepath'
         Example:
             url_data = loader.download("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
         """
-        while True:
-            self.youtube_dl_with_archive.download(url)
-            url_data = self.youtube_dl_without_archive.extract_info(url, download=False)
+        url_data = self.extract_info(url)
+        entries = self.list_entries(url_data)
 
-            if retries <= 0 or not self._should_retry(url_data):
-                break
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="download") as executor:
+            file_paths = list(executor.map(lambda entry: self.download_entry(entry, retries=retries), entries))
 
-            self._initialize_youtube_dl_with_archive()
-            retries -= 1
+        failed = []
+        for entry, file_path in zip(entries, file_paths, strict=True):
+            if file_path is None:
+                failed.append(entry.get("id") or entry.get("url"))
+            else:
+                entry["filepath"] = file_path
+
+        if failed:
+            logger.error("Failed to download {failed_count} entries", failed_count=len(failed), entries=failed, url=url)
 
         if save_response:
             self._save_response(url_data)
 
         return url_data
 
-    def _initialize_youtube_dl_with_archive(self) -> None:
+    def extract_info(self, url: str, save_response: bool = False) -> dict[str, Any]:
         """
-        Initializes a YoutubeDL instance with download archive functionality.
+        Extracts flat metadata for a URL without downloading any media.
+        For playlists, the entries only carry the fields needed to download them one by one later.
+        Args:
+            url (str): The URL to extract information from
+            save_response (bool, optional): Whether to save the extracted information to a file. Defaults to False.
+        Returns:
+            dict[str, Any]: Dictionary containing the extracted information from the URL
+        """
+        url_data = self.youtube_dl_without_archive.extract_info(url, download=False)
 
-        The archive file keeps track of previously downloaded videos to avoid re-downloading.
-        The archive is stored in 'archive.txt' within the output directory.
+        if save_response:
+            self._save_response(url_data)
 
+        return url_data
+
+    @staticmethod
+    def list_entries(url_data: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Lists the entries to download from the metadata returned by `extract_info`.
+        Playlists of playlists (e.g. the tabs of a channel) are flattened one level, unavailable
+        entries are left out. A single video or track is its own entry.
+        Args:
+            url_data (dict[str, Any]): Metadata extracted from a URL
         Returns:
-            None
+            list[dict[str, Any]]: The entries, in playlist order
+        """
+        if url_data.get("_type", "") != "playlist":
+            return [url_data]
+
+        entries = []
+        for entry in url_data["entries"]:
+            if entry is None:
+                continue
+            if entry.get("_type", "") == "playlist":
+                entries.extend(entry.get("entries", []))
+            else:
+                entries.append(entry)
+        return [entry for entry in entries if entry is not None]
+
+    def download_entry(self, entry: dict[str, Any], retries: int = 3) -> str | None:
+        """
+        Downloads the audio of a single entry (video/track) extracted by `extract_info`.
+        A fresh YoutubeDL instance is used for every entry so several entries can be downloaded
+        from different threads at the same time. Entries already recorded in the download archive
+        are not downloaded again, the existing file is returned instead. Failed attempts are
+        retried after `retry_backoff` seconds, doubled on every further attempt.
+        Args:
+            entry (dict[str, Any]): Entry metadata, must contain an 'id' or a URL
+            retries (int, optional): Number of retry attempts if the file is missing after download. Defaults to 3.
+        Returns:
+            str | None: Path of the downloaded audio file, or None if it could not be downloaded.
+        """
+        url = entry.get("webpage_url") or entry.get("url") or entry["id"]
+
+        for attempt in range(retries + 1):
+            if attempt > 0:
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+
+            try:
+                config = self._config(download_archive=os.path.join(self.output_dir, "archive.txt"))
+                with self.youtube_dl_factory(config) as ydl:
+                    info = ydl.extract_info(url, download=True)
+            except yt_dlp.utils.DownloadError as e:
+                logger.warning(f"Download attempt {attempt + 1} failed for {url}: {e}")
+                continue
+
+            if info:
+                # Flat entries of some extractors (e.g. feeds) only get their id once resolved
+                entry.setdefault("id", info["id"])
+
+            # Entries recorded in the archive return no info, their file is already on disk
+            file_path = self.resolve_file_path(info) if info else None
+            if file_path is None and "id" in entry:
+                file_path = self.find_downloaded_file(entry["id"])
+            if file_path is not None:
+                return file_path
+
+        return None
+
+    def resolve_file_path(self, info: dict[str, Any]) -> str | None:
+        """
+        Resolves the path of the downloaded file from the info dict returned by yt-dlp.
+        The path is updated by the post-processors, so it points to the final file whatever its container.
+        Args:
+            info (dict[str, Any]): Info dict of a downloaded entry
+        Returns:
+            str | None: Path of the downloaded file, or None if it is not on disk.
+        """
+        file_paths = [download.get("filepath") for download in info.get("requested_downloads") or []]
+        file_paths.append(info.get("filepath"))
+        for file_path in file_paths:
+            if file_path and os.path.exists(file_path):
+                return file_path
+        return None
+
+    def find_downloaded_file(self, file_name: str) -> str | None:
+        """
+        Looks up the downloaded audio file for an entry id in the output directory.
+        Args:
+            file_name (str): The entry id used as the file name by the output template
+        Returns:
+            str | None: Path of the first matching audio file, or None if nothing was downloaded.
         """
-        self.youtube_dl_with_archive = yt_dlp.YoutubeDL(
-            self._config(
-                download_archive=os.path.join(self.output_dir, "archive.txt"),
-            )
-        )
+        for ext in AUDIO_EXTENSIONS:
+            file_path = os.path.join(self.output_dir, f"{file_name}.{ext}")
+            if os.path.exists(file_path):
+                return file_path
+        return None
 
     def _initialize_youtube_dl_without_archive(self) -> None:
         """
@@ -98,12 +229,14 @@ class Downloader:
         Returns:
             None
         """
-        self.youtube_dl_without_archive = yt_dlp.YoutubeDL(self._config(extract_flat=True))
+        self.youtube_dl_without_archive = self.youtube_dl_factory(self._config(extract_flat=True))
 
     def _config(self, **kwargs: Any) -> dict[str, Any]:
         """Configure YouTube downloader options.
         Generates a configuration dictionary for yt-dlp with audio extraction settings.
         Default configuration extracts the best available audio stream and converts it to MP3.
+        With the "native" audio format the stream is kept as is, with "pcm" it is converted to
+        mono 16 kHz WAV.
         Args:
             **kwargs: Additional keyword arguments to override default configuration.
         Returns:
@@ -112,7 +245,7 @@ class Downloader:
                 - format: 'bestaudio' (selects best audio quality)
                 - ignoreerrors: True (continues on download errors)
                 - outtmpl: Output template for saving files
-                - postprocessors: FFmpeg settings for MP3 conversion
+                - postprocessors: FFmpeg settings for MP3 or PCM conversion
                 - quiet: True (minimal console output)
                 - verbose: False (no debug output)
         Note:
@@ -133,39 +266,17 @@ class Downloader:
             "verbose": False,
         }
 
+        if self.audio_format == "native":
+            config["postprocessors"] = []
+        elif self.audio_format == "pcm":
+            config["postprocessors"] = [{"key": "FFmpegExtractAudio", "preferredcodec": "wav"}]
+            config["postprocessor_args"] = {"extractaudio+ffmpeg_o": ["-ar", "16000", "-ac", "1"]}
+
         config.update(kwargs)
         config.update(json.loads(self.yt_dlp_options))
 
         return config
 
-    def _should_retry(self, url_data: dict[str, Any]) -> bool:
-        """
-        Determines if downloading should be retried based on URL data and existing files.
-        This method checks whether audio files need to be downloaded by verifying their existence
-        in the output directory. For playlists, it checks all entries. For single items, it checks
-        the individual file.
-        Args:
-            url_data (dict[str, Any]): Dictionary containing URL metadata, including information
-                about audio files or playlists to be downloaded.
-        Returns:
-            bool: True if any file needs to be downloaded (doesn't exist), False if all files exist.
-        """
-
-        def file_exists(file_name: str) -> bool:
-            extensions = ["mp3", "wav", "m4a", "webm", "opus"]
-
-            return any(os.path.exists(os.path.join(self.output_dir, f"{file_name}.{ext}")) for ext in extensions)
-
-        if "_type" in url_data and url_data["_type"] == "playlist":
-            for entry in url_data["entries"]:
-                if entry and not file_exists(entry["id"]):
-                    return True
-        else:
-            if not file_exists(url_data["id"]):
-                return True
-
-        return False
-
     def _save_response(self, url_data: dict[str, Any]) -> None:
         """
         Saves the provided URL data to a JSON file in the output directory.
@@ -208,4 +319,4 @@ class Downloader:
             None
         """
         for requested_download in requested_downloads:
-            requested_download.pop("__postprocessors")
+            requested_download.pop("__postprocessors", None)
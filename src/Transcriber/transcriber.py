@@ -1,13 +1,42 @@
+import itertools
+import multiprocessing
+import os
+import socket
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any
 
 from Transcriber.config import LOG_LEVELS, settings, update_settings
+from Transcriber.export_handlers.export_queue import get_export_queue, write_outputs
 from Transcriber.export_handlers.exporter import Writer
+from Transcriber.export_handlers.streaming_exporter import StreamingWriter
 from Transcriber.logging import logfire, logger
+from Transcriber.source_loaders import directory_scanner
+from Transcriber.source_loaders.directory_scanner import ScannedFile
+from Transcriber.source_loaders.download_pipeline import DownloadPipeline, DownloadResult
 from Transcriber.source_loaders.downloader import Downloader
+from Transcriber.transcription_core import chunked_recognizer, language_detector, micro_batcher, speech_cache
+from Transcriber.transcription_core.chunked_recognizer import ChunkedRecognizer
+from Transcriber.transcription_core.file_manifest import FileManifest, get_file_manifest, output_profile
+from Transcriber.transcription_core.job_queue import InputJob, get_job_queue
+from Transcriber.transcription_core.metrics_store import get_metrics_store
+from Transcriber.transcription_core.micro_batcher import MicroBatchRecognizer
+from Transcriber.transcription_core.transcription_cache import get_transcription_cache
+from Transcriber.transcription_core.transcription_metadata import TranscriptionMetadata
 from Transcriber.transcription_core.whisper_recognizer import WhisperRecognizer
-from Transcriber.utils import file_utils
+from Transcriber.transcription_core.worker_pool import (
+    WorkerPool,
+    configure_topology,
+    get_worker_model,
+    initialize_worker,
+    worker_initargs,
+)
+from Transcriber.types.segment_store import SegmentStore
+from Transcriber.utils import file_utils, time_utils
 from Transcriber.utils.progress import MultipleProgress
+from Transcriber.utils.stage_timer import stage_timer
 from Transcriber.utils.whisper import whisper_utils
 
 
@@ -23,9 +52,221 @@ def prepare_output_directory():
     logger.info("Created output directory", output_dir=str(output_dir))
 
 
+def transcribe_file(file_path: str, output_name: str, model, progress) -> Future | None:
+    """
+    Transcribe a single media file and write all configured output formats.
+
+    The file is recorded in the metrics store once its outputs are written, as failed if writing them failed.
+
+    Args:
+        file_path: Path of the media file to transcribe
+        output_name: Base name of the output files
+        model: Lazily loaded Whisper model, only loaded if the file is not cached
+        progress: Progress display used for the per-file progress bar
+
+    Returns:
+        Future | None: The export of the outputs when they are written in the background, raising if it
+            failed, None when they are already written
+    """
+    started_at = time.perf_counter()
+    with stage_timer.track() as stages:
+        try:
+            status, segments = _transcribe_file(file_path, output_name, model, progress)
+        except Exception as e:
+            if settings.logging.save_metadata:
+                record_metadata(file_path, "failed", time.perf_counter() - started_at, stages, str(e))
+            raise
+        # Recorded once the outputs are written, the stages of the file include its export
+        on_written = written_recorder(file_path, status, time.perf_counter() - started_at, stages)
+        if segments is None:
+            on_written(None)
+            return None
+        return write_segments(output_name, segments, on_written)
+
+
+def _transcribe_file(file_path: str, output_name: str, model, progress) -> tuple[str, SegmentStore | None]:
+    """
+    Transcribe a single media file, without writing the outputs left to `write_segments`.
+
+    Returns:
+        tuple: "cached" if it was served from the cache, "success" otherwise, and the segments to write,
+            None if the outputs are already written
+    """
+    cache = get_transcription_cache() if settings.cache.enable_transcription_cache else None
+    segments = None
+
+    if cache is not None:
+        audio_hash = file_utils.hash_file(file_path)
+        cache_key = cache.make_key(audio_hash)
+        segments = cache.get(cache_key)
+        if segments is not None:
+            logger.info(f"Loaded transcription from cache: {output_name}")
+
+    if (
+        segments is None
+        and speech_cache.is_enabled()
+        and not speech_cache.has_speech(speech_cache.detect_speech(file_path))
+    ):
+        # Silence or music only, the model is never loaded for it. Its outputs are written empty, so the
+        # next runs and the manifest see it as done instead of transcribing it again
+        logger.info(f"No speech found in: {output_name}")
+        Writer().write_all(output_name, SegmentStore())
+        return "success", None
+
+    if segments is None:
+        recognizer = WhisperRecognizer(progress=progress)
+        if chunked_recognizer.should_split(file_path):
+            # One long file, cut at silences and transcribed on all the workers
+            segments = ChunkedRecognizer(
+                settings.workers.num_processes,
+                settings.workers.chunk_length,
+                progress=progress,
+            ).recognize(file_path)
+        elif settings.output.streaming_export:
+            streamed = stream_file(recognizer, file_path, output_name, model.get(), keep_segments=cache is not None)
+            if cache is not None:
+                cache.put(cache_key, streamed, audio_hash)
+            return "success", None
+        else:
+            segments = recognizer.recognize(file_path, model.get())
+
+        if cache is not None:
+            cache.put(cache_key, segments, audio_hash)
+        return "success", segments
+
+    return "cached", segments
+
+
+def record_metadata(
+    file_path: str,
+    status: str,
+    processing_time: float,
+    stages: dict[str, float],
+    error: str | None = None,
+) -> None:
+    """
+    Record the outcome of a file in the metrics store.
+
+    Args:
+        file_path: Path of the media file
+        status: Outcome of the file (success/cached/failed)
+        processing_time: Seconds spent on the file
+        stages: Seconds spent in every stage on the file, as collected by `stage_timer.track`
+        error: Error message of a failed file
+    """
+    stages = {stage: round(seconds, 6) for stage, seconds in stages.items() if seconds > 0}
+    TranscriptionMetadata(
+        file_name=Path(file_path).name,
+        file_path=file_path,
+        status=status,
+        duration=file_utils.probe_duration(file_path),
+        processing_time=processing_time,
+        error=error,
+        stages=stages,
+    )
+
+
+def written_recorder(
+    file_path: str, status: str, processing_time: float, stages: dict[str, float]
+) -> Callable[[BaseException | None], None]:
+    """Return the `on_written` callback recording a file in the metrics store once its outputs are written."""
+
+    def on_written(error: BaseException | None) -> None:
+        if not settings.logging.save_metadata:
+            return
+        if error is None:
+            record_metadata(file_path, status, processing_time, stages)
+        else:
+            record_metadata(file_path, "failed", processing_time, stages, str(error))
+
+    return on_written
+
+
+def write_segments(
+    output_name: str,
+    segments: SegmentStore,
+    on_written: Callable[[BaseException | None], None] | None = None,
+) -> Future | None:
+    """
+    Write all configured output formats for the segments of a file.
+
+    Args:
+        output_name: Base name of the output files
+        segments: Segments of the file
+        on_written: Called once the outputs are written, with None or the error of a failed write
+
+    Returns:
+        Future | None: The export when the outputs are written in the background, None once they are written
+    """
+    if not segments:
+        logger.warning(f"No segments returned for: {output_name}")
+        if on_written is not None:
+            on_written(None)
+        return None
+
+    logger.success(f"Successfully transcribed: {output_name}")
+    if settings.output.background_export:
+        # Written while the next file is transcribed
+        return get_export_queue().submit(output_name, segments, on_written)
+    write_outputs(Writer(), output_name, segments, on_written)
+    return None
+
+
+def stream_file(
+    recognizer: WhisperRecognizer,
+    file_path: str,
+    output_name: str,
+    model,
+    keep_segments: bool = False,
+) -> SegmentStore:
+    """
+    Transcribe a file while appending every decoded segment to the output files.
+
+    Args:
+        recognizer: Recognizer used to decode the file
+        file_path: Path of the media file to transcribe
+        output_name: Base name of the output files
+        model: Whisper model for transcription
+        keep_segments: Whether to also collect the segments in memory, e.g. to cache them
+
+    Returns:
+        SegmentStore: The decoded segments if keep_segments is True, otherwise an empty store
+    """
+    segments = SegmentStore()
+    with StreamingWriter(output_name) as writer:
+        for segment in recognizer.stream(file_path, model):
+            writer.write(segment)
+            if keep_segments:
+                segments.append(segment["start"], segment["end"], segment["text"])
+
+    if writer.count == 0:
+        logger.warning(f"No segments returned for: {output_name}")
+    else:
+        logger.success(f"Successfully transcribed: {output_name}")
+    return segments
+
+
+def scan_local_path(path: Path) -> list[ScannedFile]:
+    """List the media files of a local file or directory with the scan settings."""
+    return directory_scanner.scan_media_files(
+        path,
+        recursive=settings.input.recursive,
+        sniff_content=settings.input.sniff_content,
+        max_workers=settings.input.scan_workers,
+    )
+
+
 def process_local_directory(path, model):
-    filtered_media_files = file_utils.filter_media_files([path] if path.is_file() else list(path.iterdir()))
-    files: list[dict[str, Any]] = [{"file_name": file.name, "file_path": file} for file in filtered_media_files]
+    scanned_files = scan_local_path(path)
+    files: list[dict[str, Any]] = [
+        {
+            "file_name": file.path.name,
+            "file_path": file.path,
+            "output_name": directory_scanner.output_name(file.path, path),
+            "scanned": file,
+        }
+        for file in scanned_files
+    ]
 
     total_files = len(files)
     # Check if there are any files to process
@@ -40,6 +281,13 @@ def process_local_directory(path, model):
         path=path,
     )
 
+    manifest = get_file_manifest() if settings.input.use_manifest else None
+    profile = output_profile()
+    # Files already done with the same size and modification time are skipped without checking their outputs
+    unchanged = set()
+    if manifest is not None and settings.input.skip_if_output_exist:
+        unchanged = manifest.unchanged(path, scanned_files, profile)
+
     with (
         MultipleProgress() as progress,
         logfire.span("Transcribing", description=f"Transcribing {total_files} files"),
@@ -50,35 +298,46 @@ def process_local_directory(path, model):
             progress_type="total",
         )
 
+        pending_files = []
         for file in files:
-            try:
-                writer = Writer()
-                file_name = Path(file["file_name"]).stem
-                if settings.input.skip_if_output_exist and writer.is_output_exist(file_name):
-                    logger.info(
-                        f"Skipping existing file: {file_name}",
-                    )
-                    progress.advance(total_task)
-                    continue
-
-                file_path = str(file["file_path"].absolute())
+            output_name = file["output_name"]
+            if file["file_path"] in unchanged:
+                progress.advance(total_task)
+                continue
+            if settings.input.skip_if_output_exist and Writer().is_output_exist(output_name):
+                logger.info(
+                    f"Skipping existing file: {output_name}",
+                )
+                progress.advance(total_task)
+                continue
+            pending_files.append(file)
 
-                with logfire.span(f"Transcribing {file_name}"):
-                    recognizer = WhisperRecognizer(progress=progress)
-                    segments = recognizer.recognize(
-                        file_path,
-                        model,
+        try:
+            # Resolve the cache hits up front, only the remaining files need the model or the workers. The
+            # language is part of the cache keys, the files cached with the configured one need no detection
+            configured_language = settings.whisper.language
+            pending_files = resolve_cached_files(pending_files, on_cached=lambda file: progress.advance(total_task))
+            with language_detector.source_language(
+                str(Path(path).absolute()), [file["file_path"] for file in pending_files], model
+            ) as language:
+                if language != configured_language:
+                    pending_files = resolve_cached_files(
+                        pending_files, on_cached=lambda file: progress.advance(total_task)
                     )
-
-                if not segments:
-                    logger.warning(f"No segments returned for file: {file_name}")
-                else:
-                    logger.success(f"Successfully transcribed file: {file_name}")
-                    writer.write_all(file_name, segments)
-            except Exception:
-                logger.exception(f"Error processing file {file_name}")
-            finally:
-                progress.advance(total_task)
+                if speech_cache.is_enabled():
+                    pending_files = resolve_speech(pending_files, model, progress, total_task)
+                logger.info(
+                    "Planned {files_count} files for transcription",
+                    files_count=len(pending_files),
+                    skipped_or_cached=total_files - len(pending_files),
+                    unchanged=len(unchanged),
+                )
+                transcribe_local_files(
+                    pending_files, model, progress, track_progress(progress, total_task, pending_files)
+                )
+        finally:
+            if manifest is not None:
+                record_manifest(manifest, [file for file in files if file["file_path"] not in unchanged], profile)
 
         progress.update(
             total_task,
@@ -86,6 +345,272 @@ def process_local_directory(path, model):
         )
 
 
+def transcribe_local_files(
+    files: list[dict[str, Any]],
+    model,
+    progress: MultipleProgress,
+    on_done: Callable[[dict[str, Any]], None],
+) -> None:
+    """
+    Transcribe the files on the worker pool, or one by one in this process with a single worker.
+
+    Args:
+        files: Files to transcribe, as dictionaries with "file_name", "file_path" and "output_name"
+        model: Lazily loaded Whisper model
+        progress: Progress display used for the per-file progress bars
+        on_done: Callback called for every finished file, successful or not
+    """
+    if settings.workers.num_processes > 1 and len(files) > 1:
+        worker_pool = WorkerPool(settings.workers.num_processes, transcribe_file)
+        worker_pool.run(files, on_done=lambda file, duration: on_done(file))
+        return
+
+    if micro_batcher.is_enabled():
+        files = transcribe_short_files(files, model, on_done)
+
+    for file in files:
+        output_name = file["output_name"]
+        try:
+            file_path = str(file["file_path"].absolute())
+
+            with logfire.span(f"Transcribing {output_name}"):
+                transcribe_file(file_path, output_name, model, progress)
+        except Exception:
+            logger.exception(f"Error processing file {output_name}")
+        finally:
+            on_done(file)
+
+
+def track_progress(
+    progress: MultipleProgress, total_task, files: list[dict[str, Any]]
+) -> Callable[[dict[str, Any]], None]:
+    """
+    Return the callback advancing the progress of a finished file.
+
+    When the VAD stage measured the speech of the files, a second bar counts the seconds of speech
+    transcribed, its time estimate follows the work left better than the number of files.
+    """
+    speech_duration = sum(file.get("speech_duration") or 0.0 for file in files)
+    speech_task = None
+    if speech_duration > 0:
+        speech_task = progress.add_task(
+            f"[bold blue]Transcribing {speech_duration / 60:.1f} minutes of speech",
+            total=speech_duration,
+            progress_type="transcribe",
+        )
+
+    def on_done(file: dict[str, Any]) -> None:
+        progress.advance(total_task)
+        if speech_task is not None:
+            progress.advance(speech_task, file.get("speech_duration") or 0.0)
+
+    return on_done
+
+
+def transcribe_short_files(
+    files: list[dict[str, Any]],
+    model,
+    on_done: Callable[[dict[str, Any]], None],
+) -> list[dict[str, Any]]:
+    """
+    Transcribe the short files together, in micro-batches of `micro_batch_files` files.
+
+    The next micro-batch is decoded and passed through the VAD while the current one is transcribed.
+    The files of a micro-batch that fails are transcribed again one by one.
+
+    Returns:
+        list: The files left to transcribe one by one
+    """
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        is_short = list(executor.map(lambda file: micro_batcher.is_short(str(file["file_path"])), files))
+    short_files = [file for file, short in zip(files, is_short, strict=True) if short]
+    if len(short_files) < 2:
+        return files
+
+    logger.info("Transcribing {files_count} short files in micro-batches", files_count=len(short_files))
+    batch_files = max(1, settings.whisper.micro_batch_files)
+    batches = [short_files[index : index + batch_files] for index in range(0, len(short_files), batch_files)]
+    recognizer = MicroBatchRecognizer(model.get())
+    remaining_files = [file for file, short in zip(files, is_short, strict=True) if not short]
+
+    with ThreadPoolExecutor(max_workers=8, thread_name_prefix="micro-batch") as executor:
+
+        def prepare(batch: list[dict[str, Any]]) -> tuple[list[Future], dict[str, float]]:
+            # The stages of a micro-batch, from the preparation of its files on
+            stages: dict[str, float] = {}
+            return [
+                executor.submit(prepare_short_file, recognizer, str(file["file_path"].absolute()), stages)
+                for file in batch
+            ], stages
+
+        prepared = prepare(batches[0])
+        for index, batch in enumerate(batches):
+            (current, stages), prepared = prepared, prepare(batches[index + 1]) if index + 1 < len(batches) else None
+            if not transcribe_micro_batch(recognizer, batch, current, stages, on_done):
+                remaining_files.extend(batch)
+
+    return remaining_files
+
+
+def prepare_short_file(recognizer: MicroBatchRecognizer, file_path: str, stages: dict[str, float]):
+    """Prepare a file of a micro-batch on a preparation thread, adding its stages to the ones of the batch."""
+    with stage_timer.track(stages):
+        return recognizer.prepare(file_path)
+
+
+def transcribe_micro_batch(
+    recognizer: MicroBatchRecognizer,
+    files: list[dict[str, Any]],
+    prepared: list[Future],
+    stages: dict[str, float],
+    on_done: Callable[[dict[str, Any]], None],
+) -> bool:
+    """Transcribe one micro-batch and write the outputs of its files, returning whether it succeeded."""
+    started_at = time.perf_counter()
+    try:
+        with stage_timer.track(stages):
+            results = recognizer.recognize([future.result() for future in prepared])
+    except Exception:
+        logger.exception("Error transcribing a micro-batch, transcribing its files one by one")
+        return False
+
+    # The time and the stages of a micro-batch are shared by its files, they are split evenly between them
+    processing_time = (time.perf_counter() - started_at) / len(files)
+    file_stages = {stage: seconds / len(files) for stage, seconds in stages.items()}
+    cache = get_transcription_cache() if settings.cache.enable_transcription_cache else None
+    for file, segments in zip(files, results, strict=True):
+        file_path = str(file["file_path"].absolute())
+        try:
+            with stage_timer.track(dict(file_stages)) as stages_of_file:
+                on_written = written_recorder(file_path, "success", processing_time, stages_of_file)
+                if not segments:
+                    # No speech in the file, its outputs are written empty and it is not cached, like in
+                    # `_transcribe_file`
+                    logger.info(f"No speech found in: {file['output_name']}")
+                    write_outputs(Writer(), file["output_name"], segments, on_written)
+                    continue
+                if cache is not None:
+                    audio_hash = file.get("content_hash") or file_utils.hash_file(file_path)
+                    cache.put(cache.make_key(audio_hash), segments, audio_hash)
+                write_segments(file["output_name"], segments, on_written)
+        except Exception:
+            logger.exception(f"Error writing the outputs of {file_path}")
+        finally:
+            on_done(file)
+    return True
+
+
+def record_manifest(manifest: FileManifest, files: list[dict[str, Any]], profile: str) -> None:
+    """
+    Record the outcome of the scanned files in the manifest, once their outputs are written.
+
+    Args:
+        manifest: Manifest of the processed files
+        files: Files processed or skipped in this run, as dictionaries with "output_name" and "scanned"
+        profile: Output profile the outputs were written with
+    """
+    get_export_queue().wait()
+    manifest.record(
+        [
+            (
+                file["scanned"],
+                "done" if Writer().is_output_exist(file["output_name"]) else "failed",
+                file.get("content_hash"),
+            )
+            for file in files
+        ],
+        profile,
+    )
+
+
+def resolve_cached_files(
+    files: list[dict[str, Any]],
+    on_cached: Callable[[dict[str, Any]], None],
+) -> list[dict[str, Any]]:
+    """
+    Write the outputs of the files found in the transcription cache.
+
+    Args:
+        files: Files to transcribe, as dictionaries with "file_name", "file_path" and "output_name"
+        on_cached: Callback called for every file served from the cache
+
+    Returns:
+        list: The files that still need to be transcribed
+    """
+    if not settings.cache.enable_transcription_cache or not files:
+        return files
+
+    cache = get_transcription_cache()
+    # Hashing is mostly I/O, the files are hashed in parallel
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+        audio_hashes = list(executor.map(lambda file: file_utils.hash_file(file["file_path"]), files))
+
+    remaining_files = []
+    for file, audio_hash in zip(files, audio_hashes, strict=True):
+        file["content_hash"] = audio_hash
+        segments = cache.get(cache.make_key(audio_hash))
+        if segments is None:
+            remaining_files.append(file)
+            continue
+
+        started_at = time.perf_counter()
+        output_name = file["output_name"]
+        logger.info(f"Loaded transcription from cache: {output_name}")
+        with stage_timer.track() as stages:
+            try:
+                write_segments(
+                    output_name,
+                    segments,
+                    on_written=written_recorder(
+                        str(file["file_path"]), "cached", time.perf_counter() - started_at, stages
+                    ),
+                )
+            except Exception:
+                logger.exception(f"Error writing the outputs of {output_name}")
+        on_cached(file)
+
+    return remaining_files
+
+
+def resolve_speech(files: list[dict[str, Any]], model, progress: MultipleProgress, total_task) -> list[dict[str, Any]]:
+    """
+    Find the speech of the files with the VAD stage, and finish the files without speech.
+
+    The speech duration of every remaining file is stored under "speech_duration".
+
+    Returns:
+        list: The files with speech to transcribe
+    """
+    if not files:
+        return files
+
+    # Decoding and the VAD release the GIL, the files are processed in parallel
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+        speeches = list(executor.map(lambda file: speech_cache.detect_speech(file["file_path"]), files))
+
+    remaining_files = []
+    for file, speech in zip(files, speeches, strict=True):
+        file["speech_duration"] = speech.speech_duration
+        if speech_cache.has_speech(speech):
+            remaining_files.append(file)
+            continue
+        # Written and recorded like any other file, the model is not loaded for it
+        try:
+            transcribe_file(str(file["file_path"].absolute()), file["output_name"], model, progress)
+        except Exception:
+            logger.exception(f"Error processing file {file['file_name']}")
+        finally:
+            progress.advance(total_task)
+
+    logger.info(
+        "Found {speech_duration}s of speech",
+        speech_duration=round(sum(file["speech_duration"] for file in remaining_files), 2),
+        audio_duration=round(sum(speech.duration for speech in speeches), 2),
+        no_speech_files=len(files) - len(remaining_files),
+    )
+    return remaining_files
+
+
 def should_skip(element: dict[str, Any]) -> bool:
     """
     Determine if an element from a playlist should be skipped.
@@ -108,27 +633,16 @@ def process_url(url: str, model):
     """
     Process a URL by downloading its audio content and transcribing it.
 
+    Entries are downloaded in the background while the already downloaded ones are transcribed.
+
     Args:
         url: URL to process
-        model: Whisper model for transcription
+        model: Lazily loaded Whisper model
     """
-    # Get the download directory
-    download_dir = settings.yt_dlp.download_dir
-    download_dir.mkdir(parents=True, exist_ok=True)
+    downloader = create_downloader()
 
-    # Initialize the downloader
-    yt_dlp_options = settings.yt_dlp.yt_dlp_options or "{}"
-    downloader = Downloader(
-        yt_dlp_options=yt_dlp_options,
-        output_dir=str(download_dir),
-    )
-
-    # Download the content
-    url_data = downloader.download(
-        url,
-        retries=settings.yt_dlp.download_retries,
-        save_response=settings.yt_dlp.save_responses,
-    )
+    # Extract the entries without downloading them
+    url_data = downloader.extract_info(url, save_response=settings.yt_dlp.save_responses)
 
     # Prepare elements list for processing
     elements = extract_elements_from_url_data(url_data)
@@ -144,7 +658,22 @@ def process_url(url: str, model):
         logger.warning(f"⚠️ No media found in URL: {url}")
         return
 
-    process_url_elements(elements, model, download_dir)
+    process_url_elements(elements, model, downloader, source=url)
+
+
+def create_downloader() -> Downloader:
+    """Create a downloader with the yt-dlp settings, creating the download directory."""
+    download_dir = settings.yt_dlp.download_dir
+    download_dir.mkdir(parents=True, exist_ok=True)
+
+    yt_dlp_options = settings.yt_dlp.yt_dlp_options or "{}"
+    return Downloader(
+        yt_dlp_options=yt_dlp_options,
+        output_dir=str(download_dir),
+        audio_format=settings.yt_dlp.audio_format,
+        max_workers=settings.yt_dlp.concurrent_downloads,
+        retry_backoff=settings.yt_dlp.retry_backoff,
+    )
 
 
 def extract_elements_from_url_data(url_data: dict[str, Any]) -> list[dict[str, Any]]:
@@ -157,31 +686,25 @@ def extract_elements_from_url_data(url_data: dict[str, Any]) -> list[dict[str, A
     Returns:
         list: List of elements to process
     """
-    elements = [url_data]
-    if url_data.get("_type", "") == "playlist":
-        entries = url_data["entries"]
-        elements = []
-        for entry in entries:
-            if entry is None:
-                continue
-            if entry.get("_type", "") == "playlist":
-                elements.extend(entry.get("entries", []))
-            else:
-                elements.append(entry)
-        elements = list(filter(lambda element: element is not None, elements))
-    return elements
+    return Downloader.list_entries(url_data)
 
 
-def process_url_elements(elements: list[dict[str, Any]], model, download_dir: Path) -> None:
+def process_url_elements(elements: list[dict[str, Any]], model, downloader: Downloader, source: str) -> None:
     """
-    Process URL elements by transcribing them.
+    Process URL elements by downloading and transcribing them as a pipeline.
+
+    Downloads run on a bounded pool, the first finished download is transcribed while the
+    remaining ones are still downloading. Without a configured language, the language is detected
+    on the first downloads and used for all the elements.
 
     Args:
         elements: List of elements (videos/audios) to process
-        model: Whisper model for transcription
-        download_dir: Directory where downloaded files are stored
+        model: Lazily loaded Whisper model
+        downloader: Downloader used to fetch the elements
+        source: URL the elements come from, its detected language is stored under it
     """
     total_elements = len(elements)
+    started_at = time.monotonic()
 
     with (
         MultipleProgress() as progress,
@@ -193,51 +716,267 @@ def process_url_elements(elements: list[dict[str, Any]], model, download_dir: Pa
             progress_type="total",
         )
 
+        pending_elements = []
         for element in elements:
-            try:
-                # Skip certain types of videos
-                if should_skip(element):
-                    logger.info(f"Skipping element: {element.get('title', 'Unknown')}")
-                    progress.advance(total_task)
-                    continue
+            # Skip certain types of videos
+            if should_skip(element):
+                logger.info(f"Skipping element: {element.get('title', 'Unknown')}")
+                progress.advance(total_task)
+                continue
 
-                # Initialize the writer
-                writer = Writer()
-                element_id = element["id"]
+            # Skip if output already exists and skip_if_output_exist is True
+            if settings.input.skip_if_output_exist and Writer().is_output_exist(element["id"]):
+                logger.info(f"Skipping existing element: {element['id']}")
+                progress.advance(total_task)
+                continue
 
-                # Skip if output already exists and skip_if_output_exist is True
-                if settings.input.skip_if_output_exist and writer.is_output_exist(element_id):
-                    logger.info(f"Skipping existing element: {element_id}")
-                    progress.advance(total_task)
-                    continue
+            pending_elements.append(element)
 
-                # Get the file path for the downloaded audio
-                file_path = download_dir / f"{element_id}.mp3"
+        pipeline = DownloadPipeline(
+            downloader,
+            max_workers=settings.yt_dlp.concurrent_downloads,
+            retries=settings.yt_dlp.download_retries,
+        )
+        transcription_intervals: list[tuple[float, float]] = []
 
-                # Transcribe the audio
-                with logfire.span(f"Transcribing {element.get('title', element_id)}"):
-                    recognizer = WhisperRecognizer(progress=progress)
-                    segments = recognizer.recognize(
-                        str(file_path),
-                        model,
-                    )
+        results = pipeline.run(pending_elements)
+        first_results = []
+        if language_detector.is_enabled():
+            first_results = list(itertools.islice(results, settings.whisper.language_sample_files))
+        samples = [result.file_path for result in first_results if result.file_path is not None]
 
-                # Write the transcription
-                if not segments:
-                    logger.warning(f"No segments returned for element: {element_id}")
-                else:
-                    logger.success(f"Successfully transcribed element: {element_id}")
-                    writer.write_all(element_id, segments)
-            except Exception as e:
-                logger.exception(f"Error processing element: {element.get('id', 'Unknown')}, Error: {e!s}")
-            finally:
-                progress.advance(total_task)
+        with language_detector.source_language(source, samples, model):
+            for result in itertools.chain(first_results, results):
+                transcribe_download(result, model, progress, total_task, transcription_intervals)
 
         progress.update(
             total_task,
             description="[green]URL Transcription Complete 🎉",
         )
 
+    log_pipeline_summary(pipeline.intervals, transcription_intervals, time.monotonic() - started_at)
+
+
+def transcribe_download(
+    result: DownloadResult, model, progress, total_task, transcription_intervals: list[tuple[float, float]]
+) -> None:
+    """Transcribe a downloaded element, recording when its transcription ran."""
+    element = result.element
+    element_id = element.get("id", "Unknown")
+    try:
+        if result.file_path is None:
+            logger.error(f"Failed to download element: {element_id}")
+            return
+
+        # Transcribe the audio and write the transcription
+        transcription_started_at = time.monotonic()
+        with logfire.span(f"Transcribing {element.get('title', element_id)}"):
+            transcribe_file(result.file_path, element_id, model, progress)
+        transcription_intervals.append((transcription_started_at, time.monotonic()))
+    except Exception as e:
+        logger.exception(f"Error processing element: {element_id}, Error: {e!s}")
+    finally:
+        progress.advance(total_task)
+
+
+def log_pipeline_summary(
+    download_intervals: list[tuple[float, float]],
+    transcription_intervals: list[tuple[float, float]],
+    wall_time: float,
+) -> None:
+    """
+    Log how much of the download time was hidden behind transcription.
+
+    Args:
+        download_intervals: Monotonic (start, end) times of the downloads
+        transcription_intervals: Monotonic (start, end) times of the transcriptions
+        wall_time: Total time spent processing the URL in seconds
+    """
+    download_time = time_utils.total_duration(download_intervals)
+    transcription_time = time_utils.total_duration(transcription_intervals)
+    overlap_time = time_utils.overlap_duration(download_intervals, transcription_intervals)
+
+    logger.info(
+        "URL run summary: {overlap_time}s of downloading overlapped with transcription",
+        overlap_time=round(overlap_time, 2),
+        download_time=round(download_time, 2),
+        transcription_time=round(transcription_time, 2),
+        wall_time=round(wall_time, 2),
+        downloads=len(download_intervals),
+        transcriptions=len(transcription_intervals),
+    )
+
+
+def process_job_queue(model) -> None:
+    """
+    Expand the inputs into the durable job queue and drain it.
+
+    Inputs already expanded by a previous run are not scanned again, the jobs they left pending,
+    or claimed by a worker that died, are picked up where they stopped.
+
+    Args:
+        model: Lazily loaded Whisper model
+    """
+    job_queue = get_job_queue()
+    for item in settings.input.urls_or_paths:
+        if job_queue.is_input_enqueued(item):
+            logger.info(f"Input already in the job queue: {item}")
+            continue
+
+        jobs = list_input_jobs(item)
+        if jobs is None:
+            logger.warning(f"Unsupported input: {item}")
+            continue
+        added = job_queue.enqueue_input(item, jobs)
+        logger.info("Queued {jobs_count} jobs from {item}", jobs_count=added, item=item)
+
+    counts = job_queue.counts()
+    total_jobs = counts["pending"] + counts["claimed"]
+    logger.info("Draining the job queue", **counts)
+
+    with (
+        MultipleProgress() as progress,
+        logfire.span("Transcribing", description=f"Draining {total_jobs} jobs"),
+    ):
+        total_task = progress.add_task(
+            f"[bold blue]Transcribing {total_jobs} jobs",
+            total=total_jobs,
+            progress_type="total",
+        )
+
+        if settings.workers.num_processes > 1 and total_jobs > 1:
+            drain_job_queue_on_workers(settings.workers.num_processes, lambda: progress.advance(total_task))
+        else:
+            drain_job_queue(model, progress, on_done=lambda: progress.advance(total_task))
+
+        progress.update(
+            total_task,
+            description="[green]Transcription Complete 🎉",
+        )
+
+    logger.info("Job queue statistics", **job_queue.counts())
+
+
+def list_input_jobs(item: str) -> list[InputJob] | None:
+    """
+    List the (kind, source, output_name, signature) jobs of an input, or return None if it is not supported.
+
+    Args:
+        item: Local file or directory, or URL supported by yt-dlp
+    """
+    path = Path(item)
+    if path.exists():
+        return [
+            (
+                "file",
+                str(file.path.absolute()),
+                directory_scanner.output_name(file.path, path),
+                f"{file.size}:{file.mtime_ns}",
+            )
+            for file in scan_local_path(path)
+        ]
+
+    if not (item.startswith("http") or item.startswith("www")):
+        return None
+
+    url_data = create_downloader().extract_info(item, save_response=settings.yt_dlp.save_responses)
+    jobs: list[InputJob] = []
+    for element in extract_elements_from_url_data(url_data):
+        if should_skip(element):
+            logger.info(f"Skipping element: {element.get('title', 'Unknown')}")
+            continue
+        jobs.append(("url", element.get("webpage_url") or element.get("url") or element["id"], element["id"], None))
+    return jobs
+
+
+def drain_job_queue(model, progress=None, on_done: Callable[[], None] | None = None) -> int:
+    """
+    Claim and run jobs from the job queue until it is empty.
+
+    Args:
+        model: Lazily loaded Whisper model
+        progress: Progress display used for the per-file progress bar
+        on_done: Callback called after every job, successful or not
+
+    Returns:
+        int: Number of jobs run
+    """
+    job_queue = get_job_queue()
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    downloader: Downloader | None = None
+    processed = 0
+
+    while (job := job_queue.claim(worker_id)) is not None:
+        try:
+            with job_queue.lease(job, worker_id), logfire.span(f"Transcribing {job.output_name}"):
+                if (
+                    settings.input.skip_if_output_exist
+                    and not job.requeued
+                    and Writer().is_output_exist(job.output_name)
+                ):
+                    logger.info(f"Skipping existing file: {job.output_name}")
+                else:
+                    file_path = job.source
+                    if job.kind == "url":
+                        downloader = downloader or create_downloader()
+                        file_path = downloader.download_entry(
+                            {"id": job.output_name, "url": job.source},
+                            retries=settings.yt_dlp.download_retries,
+                        )
+                        if file_path is None:
+                            raise RuntimeError(f"Failed to download element: {job.output_name}")
+                    export = transcribe_file(file_path, job.output_name, model, progress)
+                    # A job is only done once its outputs are on disk
+                    if export is not None:
+                        export.result()
+        except Exception as e:
+            logger.exception(f"Error processing job {job.output_name}, attempt {job.attempts}")
+            job_queue.fail(job.id, worker_id, str(e))
+        else:
+            job_queue.complete(job.id, worker_id)
+        finally:
+            processed += 1
+            if on_done is not None:
+                on_done()
+
+    return processed
+
+
+def drain_job_queue_on_workers(num_processes: int, on_done: Callable[[], None]) -> None:
+    """Drain the job queue on several worker processes, each holding its own model."""
+    job_queue = get_job_queue()
+    finished = job_queue.counts()["done"] + job_queue.counts()["failed"]
+
+    with ProcessPoolExecutor(
+        max_workers=num_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initialize_worker,
+        initargs=worker_initargs(num_processes),
+    ) as executor:
+        futures = [executor.submit(_drain_job_queue_in_worker) for _ in range(num_processes)]
+
+        # The workers claim the jobs themselves, progress is read back from the queue
+        while futures:
+            done, futures = wait(futures, timeout=1)
+            for future in done:
+                try:
+                    future.result()
+                except Exception:
+                    logger.exception("Job queue worker crashed")
+
+            counts = job_queue.counts()
+            for _ in range(counts["done"] + counts["failed"] - finished):
+                on_done()
+            finished = counts["done"] + counts["failed"]
+
+
+def _drain_job_queue_in_worker() -> int:
+    try:
+        return drain_job_queue(get_worker_model())
+    finally:
+        # Worker processes exit without running the atexit handlers
+        get_metrics_store().flush()
+
 
 def transcribe(
     urls_or_paths: list[str] | None = None,
@@ -278,21 +1017,32 @@ def transcribe(
         logger.warning("No input files provided. Exiting transcription.")
         return
     logger.info("Starting transcription...")
-    # Initialize the output directory and Whisper model
+    if settings.workers.auto_topology:
+        configure_topology()
+    # Initialize the output directory, the model is only loaded by the first file that needs it
     prepare_output_directory()
-    model = whisper_utils.load_model()
-    logger.debug("Loaded Whisper model")
+    model = whisper_utils.LazyModel()
 
-    for item in settings.input.urls_or_paths:
-        if Path(item).exists():
-            # Handle local file or directory input
-            logger.info(f"Processing local path: {item}")
-            process_local_directory(Path(item), model)
-
-        elif item.startswith("http") or item.startswith("www"):
-            # Handle URL input
-            logger.info(f"Processing URL: {item}")
-            process_url(item, model)
-        else:
-            # Handle unsupported input
-            logger.warning(f"Unsupported input: {item}")
+    if settings.job_queue.enabled:
+        process_job_queue(model)
+    else:
+        for item in settings.input.urls_or_paths:
+            if Path(item).exists():
+                # Handle local file or directory input
+                logger.info(f"Processing local path: {item}")
+                process_local_directory(Path(item), model)
+
+            elif item.startswith("http") or item.startswith("www"):
+                # Handle URL input
+                logger.info(f"Processing URL: {item}")
+                process_url(item, model)
+            else:
+                # Handle unsupported input
+                logger.warning(f"Unsupported input: {item}")
+
+    # Write the outputs still queued in the background and stop the export threads
+    get_export_queue().close()
+    get_export_queue.cache_clear()
+
+    if settings.cache.enable_transcription_cache:
+        logger.info("Transcription cache statistics", **get_transcription_cache().stats())
@@ -0,0 +1,105 @@
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from Transcriber.config import settings
+from Transcriber.logging import logger
+from Transcriber.utils import audio_utils, file_utils
+
+
+class AudioCache:
+    """
+    On-disk cache of decoded audio, stored as 16 kHz float32 `.npy` files named after the source hash.
+
+    Cached audio is memory-mapped instead of read, so it is handed to the backend without copying and
+    re-runs with other models or decode settings skip decoding entirely. Access times are tracked
+    through the file modification time and the least recently used files are deleted once the cache
+    grows past `max_size_bytes`.
+
+    Attributes:
+        hits (int): Number of cache hits in this process
+        misses (int): Number of cache misses in this process
+    """
+
+    def __init__(self, cache_dir: Path, max_size_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory where the decoded audio is stored
+            max_size_bytes: Size budget of the stored audio
+        """
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def load(self, file_path: Path | str) -> np.ndarray:
+        """Return the decoded audio of a media file as a read-only memory-mapped array."""
+        cache_path = self.cache_dir / f"{file_utils.hash_file(file_path)}.npy"
+
+        if cache_path.is_file():
+            self.hits += 1
+            # Mark the entry as recently used
+            os.utime(cache_path)
+            return np.load(cache_path, mmap_mode="r")
+
+        self.misses += 1
+        audio = audio_utils.load_audio(file_path)
+
+        # Write to a temporary file first so concurrent readers never see a partial array, the name is
+        # unique to the writer as threads of the same process can decode the same file at once
+        file = tempfile.NamedTemporaryFile(dir=self.cache_dir, prefix=cache_path.stem, suffix=".tmp", delete=False)
+        try:
+            with file:
+                np.save(file, audio.astype(np.float32, copy=False))
+            os.replace(file.name, cache_path)
+        except BaseException:
+            os.remove(file.name)
+            raise
+
+        self._evict(keep=cache_path)
+        return np.load(cache_path, mmap_mode="r")
+
+    def _evict(self, keep: Path) -> None:
+        entries = []
+        for path in self.cache_dir.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            if path == keep:
+                continue
+            # Arrays that are still memory-mapped stay readable after the file is removed
+            path.unlink(missing_ok=True)
+            total_size -= size
+            evicted += 1
+
+        if evicted:
+            logger.debug("Evicted entries from the audio cache", evicted=evicted, size_bytes=total_size)
+
+
+@lru_cache
+def get_audio_cache() -> AudioCache:
+    return AudioCache(
+        Path(settings.cache.cache_dir) / "audio",
+        max_size_bytes=settings.cache.audio_cache_max_size_mb * 1024 * 1024,
+    )
+
+
+def load_audio(file_path: Path | str) -> np.ndarray:
+    """Decode a media file to 16 kHz mono audio, through the audio cache when it is enabled."""
+    if settings.cache.enable_audio_cache:
+        return get_audio_cache().load(file_path)
+    return audio_utils.load_audio(file_path)
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import IO
+
+from Transcriber.config import settings
+from Transcriber.logging import logger
+from Transcriber.types.segment_type import SegmentType
+from Transcriber.utils.whisper import whisper_utils
+
+
+class TranscriptionCheckpoint:
+    """
+    Append-only log of the segments decoded so far for a single file.
+
+    Segments are appended as they are decoded and committed to disk (flush + fsync) at most every
+    `interval` seconds. After a crash, `load` returns the committed segments so decoding can resume
+    from the end of the last one instead of starting again from zero. A line torn by the crash is
+    ignored. The first line holds a fingerprint of the file and the decode settings, a checkpoint
+    written for another version of the file or other settings is discarded.
+    """
+
+    def __init__(self, path: Path, fingerprint: str, interval: float):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            path: Path of the checkpoint file
+            fingerprint: Identifies the audio file and the decode settings
+            interval: Minimum number of seconds between two commits
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.interval = interval
+        self._file: IO[str] | None = None
+        self._last_commit = time.monotonic()
+
+    @classmethod
+    def for_file(cls, file_path: str) -> "TranscriptionCheckpoint":
+        """Create the checkpoint of a media file in the cache directory."""
+        stat = os.stat(file_path)
+        payload = json.dumps(
+            {
+                "file_path": os.path.abspath(file_path),
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+                **whisper_utils.decode_settings(),
+            },
+            sort_keys=True,
+        )
+        fingerprint = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return cls(
+            Path(settings.cache.cache_dir) / "checkpoints" / f"{fingerprint}.jsonl",
+            fingerprint,
+            settings.whisper.checkpoint_interval,
+        )
+
+    def load(self) -> list[SegmentType]:
+        """Return the segments committed by a previous run, or an empty list."""
+        if not self.path.is_file():
+            return []
+
+        segments: list[SegmentType] = []
+        with open(self.path, encoding="utf-8") as file:
+            lines = file.read().split("\n")
+
+        try:
+            header = json.loads(lines[0])
+        except json.JSONDecodeError:
+            header = {}
+        if header.get("fingerprint") != self.fingerprint:
+            logger.debug("Discarding stale checkpoint", path=str(self.path))
+            return []
+
+        # Only newline terminated lines were fully written, the last element is either empty or torn
+        for line in lines[1:-1]:
+            segments.append(json.loads(line))
+
+        return segments
+
+    def start(self, segments: list[SegmentType]) -> None:
+        """Open the checkpoint for appending, rewriting it with the segments kept from a previous run."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(json.dumps({"fingerprint": self.fingerprint}) + "\n")
+        for segment in segments:
+            self._file.write(json.dumps(segment, ensure_ascii=False) + "\n")
+        self.commit()
+
+    def append(self, segment: SegmentType) -> None:
+        """Append a decoded segment, committing the checkpoint if the interval has passed."""
+        if self._file is None:
+            return
+        self._file.write(json.dumps(segment, ensure_ascii=False) + "\n")
+        if time.monotonic() - self._last_commit >= self.interval:
+            self.commit()
+
+    def commit(self) -> None:
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_commit = time.monotonic()
+
+    def close(self) -> None:
+        """Commit and close the checkpoint, keeping it on disk for a later resume."""
+        if self._file is None:
+            return
+        self.commit()
+        self._file.close()
+        self._file = None
+
+    def remove(self) -> None:
+        """Delete the checkpoint once the file is fully transcribed."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.path.unlink(missing_ok=True)
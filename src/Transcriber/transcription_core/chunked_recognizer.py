@@ -0,0 +1,212 @@
+import atexit
+import itertools
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from Transcriber.config import settings
+from Transcriber.logging import logger
+from Transcriber.transcription_core import audio_cache
+from Transcriber.transcription_core.worker_pool import get_worker_model, initialize_worker, worker_initargs
+from Transcriber.types.segment_store import SegmentStore
+from Transcriber.types.segment_type import SegmentType
+from Transcriber.utils import file_utils
+from Transcriber.utils.audio_utils import SAMPLE_RATE
+from Transcriber.utils.stage_timer import stage_timer
+from Transcriber.utils.whisper import whisper_utils
+
+
+def should_split(file_path: str) -> bool:
+    """Whether a file is long enough to be split across the worker processes."""
+    if not (
+        settings.workers.split_long_files and settings.workers.num_processes > 1 and settings.whisper.use_faster_whisper
+    ):
+        return False
+
+    duration = file_utils.probe_duration(file_path)
+    return duration is not None and duration > 1.5 * settings.workers.chunk_length
+
+
+def plan_chunks(speech: list[dict[str, int]], total_samples: int, chunk_samples: int) -> list[tuple[int, int]]:
+    """
+    Cut the audio into chunks of roughly `chunk_samples`, only in the silences between speech.
+
+    Every cut is placed in the middle of the silence closest to the target length, so no word
+    can straddle two chunks. Chunks are never shorter than half the target length, and a chunk
+    grows past the target when a speech region is longer than that.
+
+    Args:
+        speech: Speech regions found by the VAD, as {"start", "end"} sample indexes
+        total_samples: Length of the audio in samples
+        chunk_samples: Target length of a chunk in samples
+
+    Returns:
+        list: (start, end) sample indexes of the chunks, covering the whole audio
+    """
+    gaps = [(previous["end"] + current["start"]) // 2 for previous, current in itertools.pairwise(speech)]
+    minimum_samples = chunk_samples // 2
+
+    cuts = [0]
+    while total_samples - cuts[-1] > chunk_samples + minimum_samples:
+        candidates = [
+            gap for gap in gaps if gap - cuts[-1] >= minimum_samples and total_samples - gap >= minimum_samples
+        ]
+        if not candidates:
+            break
+        target = cuts[-1] + chunk_samples
+        cuts.append(min(candidates, key=lambda gap: abs(gap - target)))
+
+    cuts.append(total_samples)
+    return list(itertools.pairwise(cuts))
+
+
+@lru_cache
+def get_chunk_pool(num_processes: int) -> ProcessPoolExecutor:
+    """
+    Worker processes transcribing the chunks of long files, started once and kept for the whole run.
+
+    The workers load their model with the first chunk they get, every later long file reuses them
+    instead of starting the processes and loading the models again.
+    """
+    executor = ProcessPoolExecutor(
+        max_workers=num_processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initialize_worker,
+        initargs=worker_initargs(num_processes),
+    )
+    atexit.register(executor.shutdown)
+    return executor
+
+
+def _transcribe_chunk(audio_path: str, start: int, end: int, options: dict[str, Any]) -> list[SegmentType]:
+    """Transcribe one chunk of the decoded audio in a worker process."""
+    # Only the chunk is read from the memory-mapped audio
+    audio = np.array(np.load(audio_path, mmap_mode="r")[start:end])
+    offset = start / SAMPLE_RATE
+    chunk_end = end / SAMPLE_RATE
+
+    segments, _ = get_worker_model().get().transcribe(audio=audio, **options)
+    return [
+        SegmentType(
+            start=segment.start + offset,
+            end=min(segment.end + offset, chunk_end),
+            text=segment.text.strip(),
+        )
+        for segment in segments
+    ]
+
+
+class ChunkedRecognizer:
+    """
+    Transcribes a single long file on several processes.
+
+    The file is decoded and passed through the VAD once, cut into chunks in the silences and the
+    chunks are transcribed in parallel, each worker holding its own model. The decoded audio is
+    shared with the workers through a memory-mapped file. Segments are shifted back to the file
+    timeline and merged in order. The workers are shared by every long file of the run, see
+    `get_chunk_pool`.
+    """
+
+    def __init__(self, num_processes: int, chunk_length: float, progress: Any = None):
+        """
+        Initialize the recognizer.
+
+        Args:
+            num_processes: Number of worker processes
+            chunk_length: Target length of a chunk in seconds
+            progress: Progress display used for the per-file progress bar
+        """
+        self.num_processes = num_processes
+        self.chunk_length = chunk_length
+        self.progress = progress
+
+    def recognize(self, file_path: str) -> SegmentStore:
+        file_name = Path(file_path).name
+
+        with stage_timer.measure("decode"):
+            audio = audio_cache.load_audio(file_path)
+
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        with stage_timer.measure("vad"):
+            speech = get_speech_timestamps(audio, VadOptions(**settings.whisper.vad_parameters))
+
+        chunks = plan_chunks(speech, audio.shape[0], int(self.chunk_length * SAMPLE_RATE))
+        file_duration = round(audio.shape[0] / SAMPLE_RATE, 2)
+
+        logger.info(
+            "Transcribing file {file_name} in {chunks_count} chunks",
+            file_name=file_name,
+            chunks_count=len(chunks),
+            file_duration=file_duration,
+        )
+
+        file_task = None
+        if self.progress is not None:
+            file_task = self.progress.add_task(
+                f"[bold blue]Transcribing {file_name}",
+                total=file_duration,
+                progress_type="transcribe",
+            )
+
+        with tempfile.TemporaryDirectory() as temporary_dir:
+            # Audio from the audio cache is already on disk, otherwise it is written once for the workers
+            if isinstance(audio, np.memmap):
+                audio_path = str(audio.filename)
+            else:
+                audio_path = str(Path(temporary_dir) / "audio.npy")
+                np.save(audio_path, audio)
+            del audio
+
+            with stage_timer.measure("inference"):
+                chunk_segments = self._transcribe_chunks(audio_path, chunks, file_task)
+
+        segments = SegmentStore.from_segments(itertools.chain.from_iterable(chunk_segments))
+
+        if file_task is not None:
+            self.progress.update(
+                file_task,
+                completed=file_duration,
+                description=f"[bold green]Transcribing {file_name} Complete 🎉",
+                refresh=True,
+            )
+
+        return segments
+
+    def _transcribe_chunks(
+        self,
+        audio_path: str,
+        chunks: list[tuple[int, int]],
+        file_task: Any,
+    ) -> list[list[SegmentType]]:
+        """Transcribe the chunks in parallel and return their segments in chunk order."""
+        chunk_segments: list[list[SegmentType]] = [[] for _ in chunks]
+        executor = get_chunk_pool(self.num_processes)
+        # The workers keep the settings they started with, the options of the current file are sent with its chunks
+        options = whisper_utils.transcribe_options()
+
+        # Longest chunks first, so the last chunks do not leave workers idle
+        order = sorted(range(len(chunks)), key=lambda index: chunks[index][0] - chunks[index][1])
+        try:
+            futures = {
+                executor.submit(_transcribe_chunk, audio_path, *chunks[index], options): index for index in order
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                chunk_segments[index] = future.result()
+
+                if file_task is not None:
+                    start, end = chunks[index]
+                    self.progress.update(file_task, advance=(end - start) / SAMPLE_RATE)
+        except BrokenProcessPool:
+            # A worker died, the next long file starts a new pool
+            get_chunk_pool.cache_clear()
+            raise
+
+        return chunk_segments
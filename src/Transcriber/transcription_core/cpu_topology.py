@@ -0,0 +1,130 @@
+import itertools
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from Transcriber.logging import logger
+
+NODE_DIR = Path("/sys/devices/system/node")
+
+# Threads a CTranslate2 replica uses efficiently, past that more replicas scale better than more threads
+THREADS_PER_REPLICA = 4
+
+
+def parse_cpu_list(text: str) -> list[int]:
+    """Parse a kernel CPU list such as "0-3,8-11" into CPU ids."""
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def available_cpus() -> list[int]:
+    """CPU ids this process is allowed to run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def numa_nodes(cpus: list[int]) -> list[list[int]]:
+    """
+    Group the CPUs by NUMA node, from /sys on Linux.
+
+    Machines without NUMA information, or with a single node, return all the CPUs as one node.
+    """
+    allowed = set(cpus)
+    nodes = []
+    for cpulist in sorted(NODE_DIR.glob("node[0-9]*/cpulist"), key=lambda path: int(path.parent.name[4:])):
+        try:
+            node = [cpu for cpu in parse_cpu_list(cpulist.read_text()) if cpu in allowed]
+        except (OSError, ValueError):
+            continue
+        if node:
+            nodes.append(node)
+
+    if sum(len(node) for node in nodes) != len(allowed):
+        return [sorted(allowed)]
+    return nodes
+
+
+@dataclass(frozen=True)
+class TopologyPlan:
+    """The CPUs of every model replica."""
+
+    replicas: tuple[tuple[int, ...], ...]
+
+    @property
+    def num_processes(self) -> int:
+        return len(self.replicas)
+
+    @property
+    def threads_per_process(self) -> int:
+        return min(len(cpus) for cpus in self.replicas)
+
+
+def plan_topology(
+    num_processes: int = 0,
+    threads_per_process: int = 0,
+    cpus: list[int] | None = None,
+    nodes: list[list[int]] | None = None,
+) -> TopologyPlan:
+    """
+    Split the CPUs between model replicas.
+
+    A replica gets contiguous CPUs of a single NUMA node whenever a node has room for it, so its
+    threads share the memory local to that node, and consecutive replicas alternate between the
+    nodes. Without a number of replicas, the CPUs are split in replicas of `THREADS_PER_REPLICA`
+    threads. When the requested replicas need more CPUs than available, they share CPUs.
+
+    Args:
+        num_processes: Number of replicas, 0 fits as many as the CPUs allow
+        threads_per_process: Number of threads of every replica, 0 splits the CPUs evenly
+        cpus: CPUs to split, by default the ones this process may run on
+        nodes: NUMA nodes of the CPUs, by default read from the system
+
+    Returns:
+        TopologyPlan: The CPUs of every replica
+    """
+    cpus = cpus if cpus is not None else available_cpus()
+    nodes = nodes if nodes is not None else numa_nodes(cpus)
+
+    if threads_per_process <= 0:
+        threads_per_process = len(cpus) // num_processes if num_processes > 0 else THREADS_PER_REPLICA
+    threads_per_process = max(1, min(threads_per_process, len(cpus)))
+    if num_processes <= 0:
+        num_processes = max(1, len(cpus) // threads_per_process)
+
+    per_node: list[list[tuple[int, ...]]] = []
+    leftovers: list[int] = []
+    for node in nodes:
+        fitting = len(node) // threads_per_process * threads_per_process
+        per_node.append(
+            [tuple(node[start : start + threads_per_process]) for start in range(0, fitting, threads_per_process)]
+        )
+        leftovers.extend(node[fitting:])
+
+    # Alternate between the nodes, then use the CPUs left over on every node for replicas across nodes
+    replicas = [replica for replica in itertools.chain(*itertools.zip_longest(*per_node)) if replica is not None]
+    replicas.extend(
+        tuple(leftovers[start : start + threads_per_process])
+        for start in range(0, len(leftovers) - threads_per_process + 1, threads_per_process)
+    )
+
+    # More replicas than the CPUs allow share them
+    all_cpus = list(itertools.chain(*replicas)) or cpus
+    while len(replicas) < num_processes:
+        start = len(replicas) * threads_per_process
+        replicas.append(tuple(all_cpus[(start + offset) % len(all_cpus)] for offset in range(threads_per_process)))
+
+    return TopologyPlan(tuple(replicas[:num_processes]))
+
+
+def pin_process(cpus: tuple[int, ...]) -> None:
+    """Restrict the current process to the CPUs, where the platform supports it (Linux)."""
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    else:
+        logger.debug("CPU pinning is not supported on this platform")
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
+
+from Transcriber.config import settings
+from Transcriber.source_loaders.directory_scanner import ScannedFile
+
+FileStatus = Literal["done", "failed"]
+
+
+def output_profile() -> str:
+    """Fingerprint of the output settings, outputs written with other settings do not count as done."""
+    payload = json.dumps(
+        {
+            "output_dir": str(Path(settings.output.output_dir).absolute()),
+            "output_formats": sorted(str(output_format) for output_format in settings.output.output_formats),
+            "min_words_per_segment": settings.output.min_words_per_segment,
+            "save_files_before_compact": settings.output.save_files_before_compact,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class FileManifest:
+    """
+    Persistent index of the local media files already processed, stored in SQLite (WAL).
+
+    Every scanned file is recorded with its size, modification time, content hash (when it was
+    computed for the transcription cache) and status. A re-run over the same directories only
+    processes the files that are new, changed, failed or written with other output settings, the
+    others are skipped from the scan alone without checking their outputs on disk.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the manifest, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_hash TEXT,
+                    status TEXT NOT NULL,
+                    profile TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    def unchanged(self, root: Path, files: Iterable[ScannedFile], profile: str) -> set[Path]:
+        """
+        Return the files already done with the same size, modification time and output profile.
+
+        Args:
+            root: Scanned file or directory, only its entries are read from the manifest
+            files: Files found by the scanner
+            profile: Current `output_profile()`
+        """
+        prefix = str(root.absolute())
+        with self._connect() as connection:
+            # A range on the primary key reads the entries under the root only
+            rows = connection.execute(
+                """
+                SELECT path, size, mtime_ns FROM files
+                WHERE path >= ? AND path < ? AND status = 'done' AND profile = ?
+                """,
+                (prefix, prefix + "\U0010ffff", profile),
+            ).fetchall()
+
+        done = {path: (size, mtime_ns) for path, size, mtime_ns in rows}
+        return {file.path for file in files if done.get(str(file.path.absolute())) == (file.size, file.mtime_ns)}
+
+    def record(self, entries: Iterable[tuple[ScannedFile, FileStatus, str | None]], profile: str) -> None:
+        """Record the (file, status, content_hash) entries in a single transaction."""
+        now = time.time()
+        with self._connect() as connection:
+            connection.executemany(
+                """
+                INSERT OR REPLACE INTO files (path, size, mtime_ns, content_hash, status, profile, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (str(file.path.absolute()), file.size, file.mtime_ns, content_hash, status, profile, now)
+                    for file, status, content_hash in entries
+                ],
+            )
+
+    def counts(self) -> dict[str, int]:
+        """Number of recorded files in every status."""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT status, COUNT(*) FROM files GROUP BY status").fetchall()
+        return {"done": 0, "failed": 0, **dict(rows)}
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+@lru_cache
+def get_file_manifest() -> FileManifest:
+    return FileManifest(Path(settings.cache.cache_dir) / "manifest.sqlite3")
@@ -0,0 +1,258 @@
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Literal
+
+from Transcriber.config import settings
+from Transcriber.logging import logger
+
+JobKind = Literal["file", "url"]
+
+# (kind, source, output_name, signature) of a job found in an input, the signature is the size and
+# modification time of a local file, None for a URL
+InputJob = tuple[JobKind, str, str, str | None]
+
+
+@dataclass
+class QueuedJob:
+    """A media to transcribe, claimed from the job queue."""
+
+    id: int
+    kind: JobKind
+    source: str
+    output_name: str
+    attempts: int
+    # Queued again because its file changed since it was done, its existing outputs are stale
+    requeued: bool = False
+
+
+class JobQueue:
+    """
+    Durable queue of the media to transcribe, stored in SQLite.
+
+    Jobs move from "pending" to "claimed" when a worker takes them, then to "done", or back to
+    "pending" after a failure until `max_attempts` is reached and they are marked "failed". A claim
+    is a lease: a worker that crashes or hangs loses its jobs once the lease expires, and they are
+    claimed again by another worker. Claims are a single UPDATE statement, so several processes can
+    drain the same queue without taking the same job twice.
+
+    Inputs (directories, playlists) are expanded into jobs and linked to them. A restarted run does
+    not scan an input again while it has jobs left to transcribe, once they are all finished the
+    input is scanned again and only its new media are added, along with the finished files whose
+    size or modification time changed since.
+    """
+
+    def __init__(self, db_path: Path, lease_timeout: float, max_attempts: int):
+        """
+        Initialize the queue, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+            lease_timeout: Seconds after which a claimed job that was not renewed can be claimed again
+            max_attempts: Number of attempts before a job is marked as failed
+        """
+        self.db_path = db_path
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    output_name TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker_id TEXT,
+                    lease_expires_at REAL,
+                    error TEXT,
+                    signature TEXT,
+                    requeued INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    UNIQUE (kind, source)
+                )
+                """
+            )
+            # Queues created before the signatures of the files were recorded
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+            for column, definition in (("signature", "TEXT"), ("requeued", "INTEGER NOT NULL DEFAULT 0")):
+                if column not in columns:
+                    connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+            connection.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id)")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS input_jobs (
+                    input TEXT NOT NULL,
+                    job_id INTEGER NOT NULL,
+                    PRIMARY KEY (input, job_id)
+                )
+                """
+            )
+
+    def is_input_enqueued(self, source: str) -> bool:
+        """Whether an input still has pending or claimed jobs, and is not scanned again."""
+        with self._connect() as connection:
+            row = connection.execute(
+                """
+                SELECT 1 FROM input_jobs JOIN jobs ON jobs.id = input_jobs.job_id
+                WHERE input_jobs.input = ? AND jobs.state IN ('pending', 'claimed')
+                LIMIT 1
+                """,
+                (source,),
+            ).fetchone()
+        return row is not None
+
+    def enqueue_input(self, source: str, jobs: list[InputJob]) -> int:
+        """
+        Add the jobs found in an input and link them to the input, in one transaction.
+
+        Jobs already in the queue are ignored, unless they are finished and their signature changed:
+        the file was edited since, they are queued again with fresh attempts.
+
+        Args:
+            source: Input the jobs were found in, a local path or a URL
+            jobs: (kind, source, output_name, signature) of every job
+
+        Returns:
+            int: Number of jobs added or queued again
+        """
+        now = time.time()
+        with self._connect() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                """
+                INSERT INTO jobs (kind, source, output_name, signature, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (kind, source) DO UPDATE SET
+                    state = 'pending', attempts = 0, worker_id = NULL, lease_expires_at = NULL, error = NULL,
+                    requeued = 1, output_name = excluded.output_name, signature = excluded.signature,
+                    updated_at = excluded.updated_at
+                WHERE jobs.state IN ('done', 'failed') AND jobs.signature IS NOT excluded.signature
+                """,
+                [
+                    (kind, job_source, output_name, signature, now, now)
+                    for kind, job_source, output_name, signature in jobs
+                ],
+            )
+            added = connection.total_changes - before
+            connection.executemany(
+                "INSERT OR IGNORE INTO input_jobs (input, job_id) SELECT ?, id FROM jobs WHERE kind = ? AND source = ?",
+                [(source, kind, job_source) for kind, job_source, _, _ in jobs],
+            )
+        return added
+
+    def claim(self, worker_id: str) -> QueuedJob | None:
+        """Atomically claim the oldest available job, or return None if there is none."""
+        now = time.time()
+        with self._connect() as connection:
+            # Jobs whose last attempt expired are not retried forever
+            connection.execute(
+                """
+                UPDATE jobs SET state = 'failed', error = 'Lease expired', updated_at = ?
+                WHERE state = 'claimed' AND lease_expires_at < ? AND attempts >= ?
+                """,
+                (now, now, self.max_attempts),
+            )
+            row = connection.execute(
+                """
+                UPDATE jobs
+                SET state = 'claimed', worker_id = ?, lease_expires_at = ?, attempts = attempts + 1, updated_at = ?
+                WHERE id = (
+                    SELECT id FROM jobs
+                    WHERE state = 'pending' OR (state = 'claimed' AND lease_expires_at < ?)
+                    ORDER BY id
+                    LIMIT 1
+                )
+                RETURNING id, kind, source, output_name, attempts, requeued
+                """,
+                (worker_id, now + self.lease_timeout, now, now),
+            ).fetchone()
+
+        return QueuedJob(*row[:5], requeued=bool(row[5])) if row else None
+
+    def renew(self, job_id: int, worker_id: str) -> bool:
+        """Extend the lease of a claimed job, returning False if the worker lost it."""
+        return self._update_claimed(
+            job_id,
+            worker_id,
+            "lease_expires_at = ?",
+            (time.time() + self.lease_timeout,),
+        )
+
+    def complete(self, job_id: int, worker_id: str) -> None:
+        self._update_claimed(job_id, worker_id, "state = 'done', error = NULL, requeued = 0", ())
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> None:
+        """Put the job back in the queue, or mark it as failed once it has used all its attempts."""
+        self._update_claimed(
+            job_id,
+            worker_id,
+            "state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, error = ?",
+            (self.max_attempts, error),
+        )
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs in every state."""
+        with self._connect() as connection:
+            rows = connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {"pending": 0, "claimed": 0, "done": 0, "failed": 0, **dict(rows)}
+
+    @contextmanager
+    def lease(self, job: QueuedJob, worker_id: str) -> Iterator[None]:
+        """Keep renewing the lease of a job from a background thread while the block runs."""
+        stop = threading.Event()
+
+        def renew() -> None:
+            while not stop.wait(self.lease_timeout / 3):
+                if not self.renew(job.id, worker_id):
+                    logger.warning("Lost the lease of job {job_id}", job_id=job.id, source=job.source)
+                    return
+
+        thread = threading.Thread(target=renew, name=f"lease-{job.id}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _update_claimed(self, job_id: int, worker_id: str, assignments: str, parameters: tuple) -> bool:
+        # Only the worker holding the lease can update the job
+        with self._connect() as connection:
+            cursor = connection.execute(
+                f"""
+                UPDATE jobs SET {assignments}, updated_at = ?
+                WHERE id = ? AND worker_id = ? AND state = 'claimed'
+                """,
+                (*parameters, time.time(), job_id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation keeps the queue usable from threads and worker processes
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+@lru_cache
+def get_job_queue() -> JobQueue:
+    return JobQueue(
+        Path(settings.cache.cache_dir) / "jobs.sqlite3",
+        lease_timeout=settings.job_queue.lease_timeout,
+        max_attempts=settings.job_queue.max_attempts,
+    )
@@ -0,0 +1,175 @@
+from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any
+
+import numpy as np
+
+from Transcriber.config import settings
+from Transcriber.logging import logger
+from Transcriber.transcription_core import audio_cache
+from Transcriber.transcription_core.metrics_store import get_metrics_store
+from Transcriber.utils.audio_utils import SAMPLE_RATE
+from Transcriber.utils.stage_timer import stage_timer
+
+
+def is_enabled() -> bool:
+    """Whether the language of a batch is detected up front, only when no language is configured."""
+    return (
+        settings.whisper.language_prepass
+        and settings.whisper.language is None
+        and settings.whisper.use_faster_whisper
+        and settings.whisper.language_sample_files > 0
+    )
+
+
+def pick_samples(file_paths: list[Any], count: int) -> list[Any]:
+    """Pick `count` files spread evenly over the batch, rather than the first ones of a single series."""
+    if len(file_paths) <= count:
+        return list(file_paths)
+    step = len(file_paths) / count
+    return [file_paths[int(index * step)] for index in range(count)]
+
+
+def sample_audio(audio: np.ndarray, duration: float) -> np.ndarray:
+    """Cut `duration` seconds from the middle of the audio, past the intros and jingles of its start."""
+    length = int(duration * SAMPLE_RATE)
+    start = max(0, (audio.shape[0] - length) // 2)
+    return np.asarray(audio[start : start + length])
+
+
+def combine_detections(detections: list[tuple[str, float]]) -> tuple[str, float]:
+    """
+    Combine the languages detected on several samples.
+
+    Returns:
+        tuple: The language with the highest total probability, and its mean probability over all the
+            samples, where a sample detected with another language counts as 0
+    """
+    totals: dict[str, float] = defaultdict(float)
+    for language, probability in detections:
+        totals[language] += probability
+    language = max(totals, key=totals.__getitem__)
+    return language, totals[language] / len(detections)
+
+
+class LanguageDetector:
+    """
+    Detects the language of a whole directory or playlist from samples of a few of its files.
+
+    Without a configured language, every file pays its own language detection. A source such as a
+    channel is usually in a single language, so the language is detected once on short samples of
+    a few files, in parallel, and used for every file of the source. When the samples disagree or
+    the model is unsure, the language stays unset and every file detects its own.
+
+    A confident detection is stored per source in the metadata database, the next runs on the same
+    source reuse it without loading the model.
+    """
+
+    def __init__(self, model: Any):
+        """
+        Initialize the detector.
+
+        Args:
+            model: Lazily loaded Whisper model
+        """
+        self.model = model
+
+    def detect(self, source: str, file_paths: list[Any]) -> str | None:
+        """
+        Return the language of a source, or None when it is not confident enough to be reused.
+
+        Args:
+            source: Directory path or URL the files come from
+            file_paths: Files of the source to sample
+        """
+        store = get_metrics_store()
+        stored = store.get_language(source)
+        if stored is not None:
+            logger.info("Reusing the language of {source}: {language}", source=source, language=stored[0])
+            return stored[0]
+
+        samples = pick_samples(file_paths, settings.whisper.language_sample_files)
+        if not samples:
+            return None
+
+        with ThreadPoolExecutor(max_workers=len(samples)) as executor:
+            detections = [detection for detection in executor.map(self._detect_file, samples) if detection is not None]
+        if not detections:
+            return None
+
+        language, probability = combine_detections(detections)
+        logger.info(
+            "Detected the language of {source}: {language}",
+            source=source,
+            language=language,
+            probability=round(probability, 3),
+            samples_count=len(detections),
+        )
+        if probability < settings.whisper.language_threshold:
+            logger.info("Language detection is not confident enough, every file detects its own language")
+            return None
+
+        store.set_language(source, language, probability)
+        return language
+
+    def _detect_file(self, file_path: Any) -> tuple[str, float] | None:
+        """Detect the language of a sample of a file, None when it cannot be decoded or has no speech."""
+        try:
+            with stage_timer.measure("decode"):
+                audio = audio_cache.load_audio(file_path)
+            sample = sample_audio(audio, settings.whisper.language_sample_duration)
+            if settings.whisper.vad_filter:
+                sample = self._speech(sample)
+            if not sample.size:
+                return None
+
+            whisper_model = self.model.get()
+            if settings.whisper.use_batched_transcription:
+                # The batched pipeline wraps the model the detection runs on
+                whisper_model = whisper_model.model
+            if not whisper_model.model.is_multilingual:
+                return "en", 1.0
+            language, probability, _ = whisper_model.detect_language(audio=sample)
+        except Exception as e:
+            logger.warning(f"Failed to detect the language of {file_path}: {e!s}")
+            return None
+        return language, probability
+
+    @staticmethod
+    def _speech(sample: np.ndarray) -> np.ndarray:
+        """Keep the speech of a sample, so the detection never runs on music or silence."""
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        with stage_timer.measure("vad"):
+            speech = get_speech_timestamps(sample, VadOptions(**settings.whisper.vad_parameters))
+        if not speech:
+            return sample[:0]
+        return np.concatenate([sample[region["start"] : region["end"]] for region in speech])
+
+
+@contextmanager
+def source_language(source: str, file_paths: list[Any], model: Any) -> Iterator[str | None]:
+    """
+    Transcribe the files of a source with its detected language.
+
+    The language is set on the settings for the duration of the block, so worker processes started
+    in it receive it too, and restored afterwards. Exports still queued at that point keep the
+    language of their file, their writer is created when they are submitted.
+
+    Args:
+        source: Directory path or URL the files come from
+        file_paths: Files of the source to sample
+        model: Lazily loaded Whisper model
+    """
+    if not is_enabled():
+        yield settings.whisper.language
+        return
+
+    language = LanguageDetector(model).detect(source, file_paths)
+    settings.whisper.language = language
+    try:
+        yield language
+    finally:
+        settings.whisper.language = None
@@ -0,0 +1,281 @@
+"""
+Store of the outcome and timings of every transcribed file, and aggregate queries on it.
+
+The language detected for a directory or playlist is stored next to it, so later runs on the same
+source reuse it without detecting it again.
+
+Usage:
+    transcriber-metrics --group-by model --since-days 7
+    transcriber-metrics --csv metadata.csv
+"""
+
+import argparse
+import atexit
+import csv
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from Transcriber.config import settings
+from Transcriber.utils.stage_timer import stage_timer
+
+COLUMNS = (
+    "file_name",
+    "file_path",
+    "status",
+    "error",
+    "backend",
+    "model",
+    "compute_type",
+    "duration",
+    "processing_time",
+    "file_size",
+    "stages",
+    "date_time",
+    "worker",
+)
+
+GROUP_BY = {
+    "model": "model",
+    "backend": "backend",
+    "status": "status",
+    "compute_type": "compute_type",
+    "day": "date(date_time, 'unixepoch')",
+}
+
+
+class MetricsStore:
+    """
+    SQLite (WAL) store of the transcription metadata.
+
+    Records are buffered in memory and written in batches, once `batch_size` records are waiting
+    or by a timer `flush_interval` seconds after the first of them was buffered, so recording a file
+    costs no I/O on the hot path and an idle process does not keep records unwritten. WAL and a
+    connection per batch let worker processes write to the same database without interleaving rows.
+    """
+
+    def __init__(self, db_path: Path, batch_size: int, flush_interval: float):
+        """
+        Initialize the store, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+            batch_size: Number of buffered records that triggers a write
+            flush_interval: Maximum number of seconds a record stays in the buffer
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS transcriptions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_name TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    backend TEXT,
+                    model TEXT,
+                    compute_type TEXT,
+                    duration REAL,
+                    processing_time REAL NOT NULL,
+                    file_size INTEGER,
+                    stages TEXT NOT NULL,
+                    date_time REAL NOT NULL,
+                    worker TEXT
+                )
+                """
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS transcriptions_date_time ON transcriptions (date_time)")
+            connection.execute("CREATE INDEX IF NOT EXISTS transcriptions_status ON transcriptions (status)")
+            connection.execute("CREATE INDEX IF NOT EXISTS transcriptions_model ON transcriptions (model)")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS languages (
+                    source TEXT PRIMARY KEY,
+                    language TEXT NOT NULL,
+                    probability REAL NOT NULL,
+                    date_time REAL NOT NULL
+                )
+                """
+            )
+
+    def record(self, record: dict[str, Any]) -> None:
+        """Buffer a record, with the keys of `COLUMNS`, writing the buffer if it is due."""
+        with self._lock:
+            self._buffer.append(record)
+            due = len(self._buffer) >= self.batch_size
+            # Timers do not survive a fork, a process inherits the store of its parent with a dead one
+            if not due and (self._timer is None or not self._timer.is_alive()):
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records in a single transaction."""
+        with self._lock:
+            records, self._buffer = self._buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not records:
+            return
+
+        with stage_timer.measure("metadata"), self._connect() as connection:
+            connection.executemany(
+                f"INSERT INTO transcriptions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                [
+                    tuple(
+                        json.dumps(record.get(column) or {}) if column == "stages" else record.get(column)
+                        for column in COLUMNS
+                    )
+                    for record in records
+                ],
+            )
+
+    def summary(self, group_by: str = "model", since: float | None = None) -> list[dict[str, Any]]:
+        """
+        Aggregate the recorded files for capacity planning.
+
+        The real-time factor (RTF) is the processing time divided by the audio duration of the
+        transcribed files, cached files are counted apart since they cost no inference. The model is
+        loaded by the first file of a process, its loading time is left out of the processing time
+        and reported apart.
+
+        Args:
+            group_by: One of `GROUP_BY`
+            since: Only count the files recorded after this Unix timestamp
+
+        Returns:
+            list: One dictionary per group with counts, audio seconds, RTF, throughput and stage totals
+        """
+        group = GROUP_BY[group_by]
+        self.flush()
+        with self._connect() as connection:
+            connection.row_factory = sqlite3.Row
+            rows = connection.execute(
+                f"""
+                SELECT
+                    {group} AS grp,
+                    COUNT(*) AS files,
+                    SUM(status = 'success') AS succeeded,
+                    SUM(status = 'failed') AS failed,
+                    SUM(status = 'cached') AS cached,
+                    SUM(CASE WHEN status = 'success' THEN duration END) AS audio_seconds,
+                    SUM(
+                        CASE WHEN status = 'success'
+                        THEN processing_time - COALESCE(json_extract(stages, '$.model_load'), 0) END
+                    ) AS processing_seconds,
+                    SUM(json_extract(stages, '$.decode')) AS decode_seconds,
+                    SUM(json_extract(stages, '$.vad')) AS vad_seconds,
+                    SUM(json_extract(stages, '$.inference')) AS inference_seconds,
+                    SUM(json_extract(stages, '$.export')) AS export_seconds,
+                    SUM(json_extract(stages, '$.model_load')) AS model_load_seconds,
+                    MIN(date_time) AS first_date_time,
+                    MAX(date_time) AS last_date_time
+                FROM transcriptions
+                WHERE date_time >= ?
+                GROUP BY grp
+                ORDER BY grp
+                """,
+                (since or 0,),
+            ).fetchall()
+
+        results = []
+        for row in rows:
+            result = dict(row)
+            result[group_by] = result.pop("grp")
+            audio_seconds, processing_seconds = row["audio_seconds"], row["processing_seconds"]
+            result["real_time_factor"] = processing_seconds / audio_seconds if audio_seconds else None
+            # Hours of audio transcribed per hour of processing, for one worker
+            result["throughput"] = audio_seconds / processing_seconds if processing_seconds else None
+            results.append(result)
+        return results
+
+    def export_csv(self, path: Path, since: float | None = None) -> int:
+        """Write the recorded files to a CSV file, returning the number of rows."""
+        self.flush()
+        with self._connect() as connection, open(path, "w", newline="", encoding="utf-8") as file:
+            cursor = connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM transcriptions WHERE date_time >= ? ORDER BY id", (since or 0,)
+            )
+            writer = csv.writer(file)
+            writer.writerow(COLUMNS)
+            count = 0
+            for row in cursor:
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def get_language(self, source: str) -> tuple[str, float] | None:
+        """Return the language detected for a source and its probability, None when it was never detected."""
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT language, probability FROM languages WHERE source = ?", (source,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set_language(self, source: str, language: str, probability: float) -> None:
+        """Store the language detected for a source, a directory path or a URL."""
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO languages (source, language, probability, date_time) VALUES (?, ?, ?, ?)",
+                (source, language, probability, time.time()),
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+@lru_cache
+def get_metrics_store() -> MetricsStore:
+    store = MetricsStore(
+        Path(settings.logging.metadata_db_path),
+        batch_size=settings.logging.metadata_batch_size,
+        flush_interval=settings.logging.metadata_flush_interval,
+    )
+    atexit.register(store.flush)
+    return store
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--group-by", choices=sorted(GROUP_BY), default="model")
+    parser.add_argument("--since-days", type=float, help="Only count the files recorded in the last days")
+    parser.add_argument("--csv", type=Path, help="Export the recorded files to a CSV file instead")
+    args = parser.parse_args(argv)
+
+    store = get_metrics_store()
+    since = time.time() - args.since_days * 86400 if args.since_days else None
+
+    if args.csv:
+        print(f"Exported {store.export_csv(args.csv, since)} files to {args.csv}")
+        return
+
+    for result in store.summary(args.group_by, since):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import bisect
+import itertools
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from Transcriber.config import settings
+from Transcriber.logging import logger
+from Transcriber.transcription_core import audio_cache, speech_cache
+from Transcriber.transcription_core.speech_cache import CHUNK_LENGTH, plan_speech_chunks
+from Transcriber.types.segment_store import SegmentStore
+from Transcriber.utils import file_utils
+from Transcriber.utils.audio_utils import SAMPLE_RATE
+from Transcriber.utils.stage_timer import stage_timer
+from Transcriber.utils.whisper import batch_tuner, whisper_utils
+
+# Tolerance of the segment timestamps, rounded to the millisecond by the pipeline
+TIMESTAMP_TOLERANCE = 1e-3
+
+
+def is_enabled() -> bool:
+    """Whether short files are transcribed in micro-batches, which needs the batched faster-whisper pipeline."""
+    return (
+        settings.whisper.micro_batching
+        and settings.whisper.use_faster_whisper
+        and settings.whisper.use_batched_transcription
+    )
+
+
+def is_short(file_path: str) -> bool:
+    """Whether a file is short enough to be transcribed in a micro-batch."""
+    duration = file_utils.probe_duration(file_path)
+    return duration is not None and duration <= settings.whisper.micro_batch_max_duration
+
+
+@dataclass
+class ShortFile:
+    """A short file decoded and cut into speech chunks, waiting for its micro-batch."""
+
+    file_path: str
+    audio: np.ndarray
+    chunks: list[tuple[int, int]]
+    language: str | None = None
+
+
+class MicroBatchRecognizer:
+    """
+    Transcribes many short files together with the batched pipeline.
+
+    With a single short file per call, the batched pipeline only gets one or two speech chunks to
+    decode and most of every batch is left empty. Here the speech chunks of all the files of a
+    micro-batch are laid end to end in one array and passed as `clip_timestamps`, so the pipeline
+    fills complete batches across the files. Every decoded segment is routed back to the chunk it
+    comes from, and so to its file, and moved to the file timeline.
+
+    Files are grouped by language, detected per file when no language is configured, because the
+    pipeline decodes a whole call with a single language.
+    """
+
+    def __init__(self, model: Any):
+        """
+        Initialize the recognizer.
+
+        Args:
+            model: Loaded `BatchedInferencePipeline`
+        """
+        self.model = model
+
+    @staticmethod
+    def prepare(file_path: str) -> ShortFile:
+        """Decode a file and find its speech chunks, safe to call from several threads."""
+        with stage_timer.measure("decode"):
+            audio = audio_cache.load_audio(file_path)
+
+        max_samples = int(CHUNK_LENGTH * SAMPLE_RATE)
+        if speech_cache.is_enabled():
+            speech = speech_cache.detect_speech(file_path, audio).regions
+        elif settings.whisper.vad_filter:
+            from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+            with stage_timer.measure("vad"):
+                speech = get_speech_timestamps(audio, VadOptions(**speech_cache.vad_parameters()))
+        else:
+            speech = [
+                {"start": start, "end": min(start + max_samples, audio.shape[0])}
+                for start in range(0, audio.shape[0], max_samples)
+            ]
+
+        return ShortFile(file_path, audio, plan_speech_chunks(speech, max_samples))
+
+    def recognize(self, short_files: list[ShortFile]) -> list[SegmentStore]:
+        """
+        Transcribe the files together.
+
+        Returns:
+            list: The segments of every file, in the order of the files
+        """
+        results = [SegmentStore() for _ in short_files]
+        groups: dict[str | None, list[int]] = defaultdict(list)
+        for index, short_file in enumerate(short_files):
+            # Files without speech are not decoded at all
+            if short_file.chunks:
+                groups[self._language(short_file)].append(index)
+
+        for language, indexes in groups.items():
+            self._recognize_group([short_files[index] for index in indexes], language, [results[i] for i in indexes])
+        return results
+
+    def _language(self, short_file: ShortFile) -> str | None:
+        if settings.whisper.language is not None:
+            return settings.whisper.language
+        if not self.model.model.model.is_multilingual:
+            return "en"
+        if short_file.language is None:
+            start, end = short_file.chunks[0]
+            short_file.language, _, _ = self.model.model.detect_language(audio=np.asarray(short_file.audio[start:end]))
+        return short_file.language
+
+    def _recognize_group(self, short_files: list[ShortFile], language: str | None, results: list[SegmentStore]) -> None:
+        """Transcribe the chunks of files sharing a language, appending the segments of every file to its store."""
+        # (file index, chunk start in the file, chunk end in the file) of every chunk, in batch order
+        chunks = [
+            (index, start / SAMPLE_RATE, end / SAMPLE_RATE)
+            for index, short_file in enumerate(short_files)
+            for start, end in short_file.chunks
+        ]
+        audio = np.concatenate(
+            [short_file.audio[start:end] for short_file in short_files for start, end in short_file.chunks]
+        )
+        offsets = list(itertools.accumulate((end - start for _, start, end in chunks), initial=0.0))
+        clip_timestamps = [{"start": start, "end": end} for start, end in itertools.pairwise(offsets)]
+
+        options = whisper_utils.transcribe_options()
+        options.pop("vad_parameters", None)
+        options.update(language=language, vad_filter=False, clip_timestamps=clip_timestamps)
+        if settings.whisper.auto_batch_size:
+            options["batch_size"] = batch_tuner.get_batch_tuner().batch_size(self.model, audio)
+
+        logger.debug(
+            "Transcribing a micro-batch",
+            files_count=len(short_files),
+            chunks_count=len(chunks),
+            language=language,
+            batch_size=options["batch_size"],
+        )
+        with stage_timer.measure("inference"):
+            segments, _ = self.model.transcribe(audio=audio, **options)
+
+            for segment in segments:
+                chunk_index = bisect.bisect_right(offsets, segment.start + TIMESTAMP_TOLERANCE) - 1
+                chunk_index = min(max(chunk_index, 0), len(chunks) - 1)
+                file_index, chunk_start, chunk_end = chunks[chunk_index]
+                shift = chunk_start - offsets[chunk_index]
+                results[file_index].append(
+                    max(segment.start + shift, chunk_start),
+                    min(segment.end + shift, chunk_end),
+                    segment.text.strip(),
+                )
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from Transcriber.config import settings
+from Transcriber.transcription_core import audio_cache
+from Transcriber.utils import file_utils
+from Transcriber.utils.audio_utils import SAMPLE_RATE
+from Transcriber.utils.stage_timer import stage_timer
+
+# Longest audio the model decodes in one pass, speech regions and chunks never exceed it
+CHUNK_LENGTH = 30.0
+
+
+def is_enabled() -> bool:
+    """Whether the VAD runs as its own cached stage, which needs the faster-whisper VAD."""
+    return settings.whisper.vad_stage and settings.whisper.vad_filter and settings.whisper.use_faster_whisper
+
+
+def vad_parameters() -> dict[str, Any]:
+    """VAD parameters of the stage, with speech regions cut like the batched pipeline cuts them."""
+    return {**settings.whisper.vad_parameters, "max_speech_duration_s": CHUNK_LENGTH}
+
+
+def plan_speech_chunks(speech: list[dict[str, int]], max_samples: int) -> list[tuple[int, int]]:
+    """
+    Merge consecutive speech regions into chunks spanning at most `max_samples`.
+
+    A chunk keeps the silences between its regions, so a segment decoded in a chunk is moved back
+    to the file timeline with the chunk start alone.
+
+    Args:
+        speech: Speech regions found by the VAD, as {"start", "end"} sample indexes
+        max_samples: Longest span of a chunk in samples
+
+    Returns:
+        list: (start, end) sample indexes of the chunks
+    """
+    chunks: list[tuple[int, int]] = []
+    for region in speech:
+        if chunks and region["end"] - chunks[-1][0] <= max_samples:
+            chunks[-1] = (chunks[-1][0], region["end"])
+        else:
+            chunks.append((region["start"], min(region["end"], region["start"] + max_samples)))
+    return chunks
+
+
+def shift_clips(clips: list[dict[str, float]], position: float) -> list[dict[str, float]]:
+    """Move clip timestamps to audio starting `position` seconds later, dropping the clips before it."""
+    return [
+        {"start": max(clip["start"] - position, 0.0), "end": clip["end"] - position}
+        for clip in clips
+        if clip["end"] > position
+    ]
+
+
+@dataclass
+class Speech:
+    """Speech regions of a media file found by the VAD."""
+
+    regions: list[dict[str, int]]
+    duration: float
+
+    @property
+    def speech_duration(self) -> float:
+        """Seconds of speech in the file."""
+        return sum(region["end"] - region["start"] for region in self.regions) / SAMPLE_RATE
+
+    def clip_timestamps(self) -> list[dict[str, float]]:
+        """Speech chunks of at most `CHUNK_LENGTH` seconds, as the `clip_timestamps` of the batched pipeline."""
+        return [
+            {"start": start / SAMPLE_RATE, "end": end / SAMPLE_RATE}
+            for start, end in plan_speech_chunks(self.regions, int(CHUNK_LENGTH * SAMPLE_RATE))
+        ]
+
+
+class SpeechCache:
+    """
+    Persistent cache of the speech regions found by the VAD, keyed by the audio content hash and the VAD parameters.
+
+    Re-runs and sweeps of the decode settings find the speech of a file without decoding it or
+    running the VAD again. Entries are a few hundred bytes per hour of audio, they are never evicted.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS speech (
+                    key TEXT PRIMARY KEY,
+                    audio_hash TEXT NOT NULL,
+                    vad_parameters TEXT NOT NULL,
+                    regions TEXT NOT NULL,
+                    duration REAL NOT NULL,
+                    speech_duration REAL NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+
+    def make_key(self, audio_hash: str) -> str:
+        """Build the cache key of a media file from its content hash and the current VAD parameters."""
+        payload = json.dumps({"audio_hash": audio_hash, "vad_parameters": vad_parameters()}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Speech | None:
+        """Return the cached speech for the key, or None on a miss."""
+        with self._connect() as connection:
+            row = connection.execute("SELECT regions, duration FROM speech WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return Speech(json.loads(row[0]), row[1])
+
+    def put(self, key: str, speech: Speech, audio_hash: str) -> None:
+        """Store the speech of a file under the key."""
+        with self._connect() as connection:
+            connection.execute(
+                """
+                INSERT OR REPLACE INTO speech
+                    (key, audio_hash, vad_parameters, regions, duration, speech_duration, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    audio_hash,
+                    json.dumps(vad_parameters(), sort_keys=True),
+                    json.dumps(speech.regions),
+                    speech.duration,
+                    speech.speech_duration,
+                    time.time(),
+                ),
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation keeps the cache usable from threads and worker processes
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+@lru_cache
+def get_speech_cache() -> SpeechCache:
+    return SpeechCache(Path(settings.cache.cache_dir) / "speech.sqlite3")
+
+
+def detect_speech(file_path: Path | str, audio: np.ndarray | None = None) -> Speech:
+    """
+    Find the speech of a media file, from the cache or with the VAD.
+
+    Args:
+        file_path: Path of the media file
+        audio: Decoded audio of the file, decoded here when it is needed and not given
+    """
+    cache = get_speech_cache()
+    audio_hash = file_utils.hash_file(file_path)
+    key = cache.make_key(audio_hash)
+    speech = cache.get(key)
+    if speech is not None:
+        return speech
+
+    if audio is None:
+        with stage_timer.measure("decode"):
+            audio = audio_cache.load_audio(file_path)
+
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    with stage_timer.measure("vad"):
+        regions = get_speech_timestamps(audio, VadOptions(**vad_parameters()))
+    speech = Speech(
+        [{"start": int(region["start"]), "end": int(region["end"])} for region in regions],
+        audio.shape[0] / SAMPLE_RATE,
+    )
+    cache.put(key, speech, audio_hash)
+    return speech
+
+
+def has_speech(speech: Speech) -> bool:
+    """Whether a media file has at least `min_speech_duration` seconds of speech worth transcribing."""
+    return bool(speech.regions) and speech.speech_duration >= settings.whisper.min_speech_duration
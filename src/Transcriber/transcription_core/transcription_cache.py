@@ -0,0 +1,157 @@
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from Transcriber.config import settings
+from Transcriber.logging import logger
+from Transcriber.types.segment_store import SegmentStore
+from Transcriber.types.segment_type import SegmentType
+from Transcriber.utils.whisper import whisper_utils
+
+
+class TranscriptionCache:
+    """
+    Persistent cache of raw segments, keyed by the audio content hash and the decode settings.
+
+    Identical media is served from the cache whatever its file name, directory or playlist, as long as
+    the settings that change the transcription are the same. Entries are stored compressed in SQLite,
+    the least recently used ones are evicted once the cache grows past `max_size_bytes`.
+
+    Attributes:
+        hits (int): Number of cache hits in this process
+        misses (int): Number of cache misses in this process
+    """
+
+    def __init__(self, db_path: Path, max_size_bytes: int):
+        """
+        Initialize the cache, creating the database if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+            max_size_bytes: Size budget of the stored segments
+        """
+        self.db_path = db_path
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS transcriptions (
+                    key TEXT PRIMARY KEY,
+                    audio_hash TEXT NOT NULL,
+                    decode_settings TEXT NOT NULL,
+                    segments BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS transcriptions_last_access ON transcriptions (last_access)")
+            connection.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+
+    def make_key(self, audio_hash: str) -> str:
+        """Build the cache key of a media file from its content hash and the current decode settings."""
+        payload = json.dumps({"audio_hash": audio_hash, **whisper_utils.decode_settings()}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> SegmentStore | None:
+        """Return the cached segments for the key, or None on a miss."""
+        with self._connect() as connection:
+            row = connection.execute("SELECT segments FROM transcriptions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                self._increment(connection, "misses")
+                return None
+
+            connection.execute("UPDATE transcriptions SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            self._increment(connection, "hits")
+
+        data = zlib.decompress(row[0])
+        if SegmentStore.is_serialized(data):
+            return SegmentStore.from_bytes(data)
+        # Entries written before the segment store, as a JSON list of segments
+        return SegmentStore.from_segments(json.loads(data))
+
+    def put(self, key: str, segments: Sequence[SegmentType], audio_hash: str) -> None:
+        """Store the segments under the key and evict old entries if the cache is over budget."""
+        blob = zlib.compress(SegmentStore.from_segments(segments).to_bytes())
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                """
+                INSERT OR REPLACE INTO transcriptions
+                    (key, audio_hash, decode_settings, segments, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, audio_hash, json.dumps(whisper_utils.decode_settings()), blob, len(blob), now, now),
+            )
+            self._evict(connection)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters of this process and of the cache lifetime, plus its current size."""
+        with self._connect() as connection:
+            counters = dict(connection.execute("SELECT name, value FROM counters").fetchall())
+            entries, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcriptions").fetchone()
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "total_hits": counters.get("hits", 0),
+            "total_misses": counters.get("misses", 0),
+            "evictions": counters.get("evictions", 0),
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        total_size = connection.execute("SELECT COALESCE(SUM(size), 0) FROM transcriptions").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+
+        evicted = 0
+        for key, size in connection.execute("SELECT key, size FROM transcriptions ORDER BY last_access").fetchall():
+            if total_size <= self.max_size_bytes:
+                break
+            connection.execute("DELETE FROM transcriptions WHERE key = ?", (key,))
+            total_size -= size
+            evicted += 1
+
+        self._increment(connection, "evictions", evicted)
+        logger.debug("Evicted entries from the transcription cache", evicted=evicted, size_bytes=total_size)
+
+    def _increment(self, connection: sqlite3.Connection, name: str, amount: int = 1) -> None:
+        connection.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + ?",
+            (name, amount, amount),
+        )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # A connection per operation keeps the cache usable from threads and worker processes
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+@lru_cache
+def get_transcription_cache() -> TranscriptionCache:
+    return TranscriptionCache(
+        Path(settings.cache.cache_dir) / "transcriptions.sqlite3",
+        max_size_bytes=settings.cache.transcription_cache_max_size_mb * 1024 * 1024,
+    )
@@ -1,10 +1,11 @@
-import csv
-from datetime import UTC, datetime, timedelta
+import os
+import socket
+from datetime import UTC, datetime
 from pathlib import Path
 
-import humanize
-
 from Transcriber.config import settings
+from Transcriber.transcription_core.metrics_store import get_metrics_store
+from Transcriber.utils.whisper import model_cache
 
 
 class TranscriptionMetadata:
@@ -15,59 +16,50 @@ class TranscriptionMetadata:
         file_name: str,
         file_path: str,
         status: str,
-        duration: float,
+        duration: float | None,
         processing_time: float,
+        error: str | None = None,
+        stages: dict[str, float] | None = None,
     ):
         """
-        Initialize transcription metadata.
+        Initialize transcription metadata and record it in the metrics store.
 
         Args:
             file_name: Name of the processed audio file
             file_path: Path to the processed audio file
-            status: Status of the processing (success/fail)
-            duration: Duration of the audio in seconds
+            status: Status of the processing (success/cached/failed)
+            duration: Duration of the audio in seconds, None if it could not be read
             processing_time: Time taken to process the audio in seconds
+            error: Error message of a failed file
+            stages: Seconds spent in every pipeline stage (decode, inference, export, ...) for this file
         """
         self.file_name = file_name
         self.status = status
         self.duration = duration
         self.processing_time = processing_time
-        self.file_size = Path(file_path).stat().st_size
+        self.error = error
+        self.stages = stages or {}
+        self.file_size = Path(file_path).stat().st_size if os.path.exists(file_path) else None
         self.file_path = file_path
         self.date_time = datetime.now(UTC)
-        self.append_to_csv()
-
-    def export_metadata(self):
-        """
-        Export metadata to a dictionary format.
-        Returns:
-            dict: Metadata dictionary
-        """
-        self.metadata = {
-            "File Name": self.file_name,
-            "Status": self.status,
-            "Duration": humanize.precisedelta(
-                timedelta(seconds=self.duration),
-            ),
-            "Processing Time": humanize.precisedelta(
-                timedelta(seconds=self.processing_time),
-            ),
-            "File Size": humanize.naturalsize(self.file_size),
-            "Duration (seconds)": self.duration,
-            "Processing Time (seconds)": self.processing_time,
-            "File Size (bytes)": self.file_size,
-            "File Path": self.file_path,
-            "Date Time": self.date_time,
-        }
+        self.save()
 
-    def append_to_csv(self):
-        """
-        Append the metadata to a CSV file.
-        Creates the file if it doesn't exist.
-        """
-        self.export_metadata()
-        with open(settings.logging.metadata_csv_path, "a") as file:
-            writer = csv.DictWriter(file, fieldnames=self.metadata.keys())
-            if file.tell() == 0:
-                writer.writeheader()
-            writer.writerow(self.metadata)
+    def save(self):
+        """Buffer the metadata in the metrics store, it is written with the next batch."""
+        get_metrics_store().record(
+            {
+                "file_name": self.file_name,
+                "file_path": self.file_path,
+                "status": self.status,
+                "error": self.error,
+                "backend": "faster-whisper" if settings.whisper.use_faster_whisper else "stable-whisper",
+                "model": settings.whisper.model_name_or_path,
+                "compute_type": model_cache.compute_type() if settings.whisper.use_faster_whisper else None,
+                "duration": self.duration,
+                "processing_time": self.processing_time,
+                "file_size": self.file_size,
+                "stages": self.stages,
+                "date_time": self.date_time.timestamp(),
+                "worker": f"{socket.gethostname()}:{os.getpid()}",
+            }
+        )
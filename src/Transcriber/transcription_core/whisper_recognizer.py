@@ -1,16 +1,25 @@
+import sys
+import time
 import warnings
-from datetime import UTC, datetime
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
-
-import faster_whisper
-import whisper
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
 
 from Transcriber.config import settings
 from Transcriber.logging import logger
-from Transcriber.transcription_core.transcription_metadata import TranscriptionMetadata
+from Transcriber.transcription_core import audio_cache, speech_cache
+from Transcriber.transcription_core.checkpoint import TranscriptionCheckpoint
+from Transcriber.types.segment_store import SegmentStore
 from Transcriber.types.segment_type import SegmentType
 from Transcriber.types.whisper.type_hints import WhisperModel
+from Transcriber.utils.audio_utils import SAMPLE_RATE
+from Transcriber.utils.stage_timer import stage_timer
+from Transcriber.utils.whisper import batch_tuner, whisper_utils
+
+if TYPE_CHECKING:
+    import faster_whisper
+    import whisper
 
 
 class WhisperRecognizer:
@@ -21,18 +30,31 @@ class WhisperRecognizer:
         self,
         file_path: str,
         model: WhisperModel,
-    ) -> list[SegmentType]:
+    ) -> SegmentStore:
+        return SegmentStore.from_segments(self.stream(file_path, model))
+
+    def stream(
+        self,
+        file_path: str,
+        model: WhisperModel,
+    ) -> Iterator[SegmentType]:
+        """Yield the segments one by one, as soon as the backend decodes them."""
+        # A model of a backend can only exist once the backend is imported, checking the loaded
+        # modules avoids importing both backends (and torch) just for the type checks
+        whisper = sys.modules.get("whisper")
+        faster_whisper = sys.modules.get("faster_whisper")
+
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
 
-            if isinstance(model, whisper.Whisper):
+            if whisper is not None and isinstance(model, whisper.Whisper):
                 logger.debug("Using stable-whisper model")
-                return self._recognize_stable_whisper(file_path, model)
-            elif isinstance(model, faster_whisper.WhisperModel) or isinstance(
-                model, faster_whisper.BatchedInferencePipeline
+                yield from self._recognize_stable_whisper(file_path, model)
+            elif faster_whisper is not None and isinstance(
+                model, faster_whisper.WhisperModel | faster_whisper.BatchedInferencePipeline
             ):
                 logger.debug("Using faster-whisper model")
-                return self._recognize_faster_whisper(file_path, model)
+                yield from self._recognize_faster_whisper(file_path, model)
 
             else:
                 logger.exception(
@@ -44,7 +66,7 @@ class WhisperRecognizer:
     def _recognize_stable_whisper(
         self,
         audio_file_path: str,
-        model: whisper.Whisper,
+        model: "whisper.Whisper",
     ) -> list[SegmentType]:
         segments = model.transcribe(
             audio=audio_file_path,
@@ -66,28 +88,40 @@ class WhisperRecognizer:
     def _recognize_faster_whisper(
         self,
         audio_file_path: str,
-        model: faster_whisper.WhisperModel,
-    ) -> list[SegmentType]:
-        kwargs = {
-            "task": settings.whisper.task,
-            "language": settings.whisper.language,
-            "beam_size": settings.whisper.beam_size,
-            "vad_filter": settings.whisper.vad_filter,
-        }
-        if settings.whisper.vad_filter:
-            kwargs["vad_parameters"] = settings.whisper.vad_parameters
-
-        if settings.whisper.use_batched_transcription:
-            kwargs["batch_size"] = settings.whisper.batch_size
+        model: "faster_whisper.WhisperModel",
+    ) -> Iterator[SegmentType]:
+        kwargs = whisper_utils.transcribe_options()
 
         logger.debug("Configuring faster-whisper", **kwargs, model_type=type(model))
 
-        start_time = datetime.now(UTC)
+        # Resume after the segments committed by an interrupted run
+        checkpoint, resumed_segments = self._open_checkpoint(audio_file_path)
 
-        segments, info = model.transcribe(
-            audio=audio_file_path,
-            **kwargs,
-        )
+        with stage_timer.measure("decode"):
+            audio = audio_cache.load_audio(audio_file_path)
+
+        offset = resumed_segments[-1]["end"] if resumed_segments else 0.0
+        if "batch_size" in kwargs and speech_cache.is_enabled():
+            # The batched pipeline decodes the speech found by the VAD stage instead of running the VAD again
+            clips = speech_cache.detect_speech(audio_file_path, audio).clip_timestamps()
+            kwargs.pop("vad_parameters", None)
+            kwargs.update(vad_filter=False, clip_timestamps=speech_cache.shift_clips(clips, offset))
+        if offset > 0:
+            logger.info(
+                "Resuming transcription of {file_name} from checkpoint",
+                file_name=audio_file_path,
+                offset=offset,
+                segments=len(resumed_segments),
+            )
+            # Only the audio after the last committed segment is transcribed again, the decoder starts
+            # without the text before it as context
+            audio = audio[int(offset * SAMPLE_RATE) :]
+
+        if "batch_size" in kwargs and settings.whisper.auto_batch_size and audio.size:
+            kwargs["batch_size"] = batch_tuner.get_batch_tuner().batch_size(model, audio)
+
+        with stage_timer.measure("inference"):
+            segments, info = self._transcribe(model, audio, kwargs)
 
         logger.debug(
             "Transcribing file {file_name}",
@@ -95,12 +129,11 @@ class WhisperRecognizer:
             info=info,
         )
 
-        converted_segments = []
-        last_end = 0
+        last_end = offset
 
         file_name = Path(audio_file_path).name
 
-        file_duration = round(info.duration, 2)
+        file_duration = round(info.duration + offset, 2)
 
         logger.info(
             "Transcribing file {file_name}",
@@ -108,47 +141,122 @@ class WhisperRecognizer:
             file_duration=file_duration,
         )
 
-        file_task = self.progress.add_task(
-            f"[bold blue]Transcribing {file_name}",
-            total=file_duration,
-            progress_type="transcribe",
-        )
+        # Worker processes run without a progress display
+        file_task = None
+        if self.progress is not None:
+            file_task = self.progress.add_task(
+                f"[bold blue]Transcribing {file_name}",
+                total=file_duration,
+                completed=min(offset, file_duration),
+                progress_type="transcribe",
+            )
 
-        for segment in segments:
-            converted_segments.append(
-                SegmentType(
-                    start=segment.start,
-                    end=segment.end,
-                    text=segment.text.strip(),
+        try:
+            yield from resumed_segments
+
+            # Segments are decoded lazily, only the time spent producing them counts as inference
+            inference_started_at = time.perf_counter()
+            for segment in self._decode_segments(model, audio, kwargs, segments):
+                stage_timer.add("inference", time.perf_counter() - inference_started_at, count=0)
+                converted_segment = SegmentType(
+                    start=segment["start"] + offset,
+                    end=segment["end"] + offset,
+                    text=segment["text"],
                 )
-            )
+                if checkpoint is not None:
+                    checkpoint.append(converted_segment)
+                yield converted_segment
 
-            # Update the progress bar
-            progress_update = min(
-                segment.end - last_end,
-                file_duration - self.progress.tasks[file_task].completed,
+                # Update the progress bar
+                self._advance_file_task(file_task, converted_segment["end"] - last_end, file_duration)
+                last_end = converted_segment["end"]
+                inference_started_at = time.perf_counter()
+            stage_timer.add("inference", time.perf_counter() - inference_started_at, count=0)
+        finally:
+            # Keep what was decoded so far if the transcription is interrupted
+            if checkpoint is not None:
+                checkpoint.close()
+
+        if checkpoint is not None:
+            checkpoint.remove()
+
+        if file_task is not None:
+            self.progress.update(
+                file_task,
+                completed=file_duration,
+                description=f"[bold green]Transcribing {file_name} Complete 🎉",
+                refresh=True,
             )
-            if progress_update > 0:
-                self.progress.update(file_task, advance=progress_update)
-            last_end = segment.end
-
-        end_time = datetime.now(UTC)
-        processing_time = (end_time - start_time).total_seconds()
-
-        self.progress.update(
-            file_task,
-            completed=file_duration,
-            description=f"[bold green]Transcribing {file_name} Complete 🎉",
-            refresh=True,
+
+    def _transcribe(self, model: "faster_whisper.WhisperModel", audio: Any, kwargs: dict[str, Any]) -> tuple[Any, Any]:
+        """Start the transcription, with a smaller batch while the batch does not fit in memory."""
+        if kwargs.get("clip_timestamps") == []:
+            # No speech left to decode, the pipeline would run the VAD on the whole audio instead
+            return iter(()), SimpleNamespace(duration=audio.shape[0] / SAMPLE_RATE)
+        while True:
+            try:
+                return model.transcribe(audio=audio, **kwargs)
+            except Exception as error:
+                self._lower_batch_size(kwargs, error)
+
+    def _decode_segments(
+        self,
+        model: "faster_whisper.WhisperModel",
+        audio: Any,
+        kwargs: dict[str, Any],
+        segments: Iterator[Any],
+    ) -> Iterator[SegmentType]:
+        """
+        Yield the decoded segments, timed from the start of the audio.
+
+        If a batch runs out of memory, the transcription continues after the last decoded segment
+        with half the batch size instead of failing the file.
+        """
+        position = last_end = 0.0
+        clips = kwargs.get("clip_timestamps")
+        while True:
+            try:
+                for segment in segments:
+                    last_end = segment.end + position
+                    yield SegmentType(start=segment.start + position, end=last_end, text=segment.text.strip())
+                return
+            except Exception as error:
+                self._lower_batch_size(kwargs, error)
+
+            position = last_end
+            if clips is not None:
+                kwargs["clip_timestamps"] = speech_cache.shift_clips(clips, position)
+            segments, _ = self._transcribe(model, audio[int(position * SAMPLE_RATE) :], kwargs)
+
+    @staticmethod
+    def _lower_batch_size(kwargs: dict[str, Any], error: Exception) -> None:
+        """Halve the batch size after running out of memory, re-raising any other error."""
+        batch_size = kwargs.get("batch_size", 1)
+        if batch_size <= 1 or not batch_tuner.is_out_of_memory(error):
+            raise error
+
+        kwargs["batch_size"] = batch_size // 2
+        logger.warning(
+            "Ran out of memory with a batch size of {batch_size}, retrying with {lower_batch_size}",
+            batch_size=batch_size,
+            lower_batch_size=kwargs["batch_size"],
         )
+        if settings.whisper.auto_batch_size:
+            batch_tuner.get_batch_tuner().lower(kwargs["batch_size"])
 
-        if settings.logging.save_metadata:
-            TranscriptionMetadata(
-                file_name=file_name,
-                file_path=audio_file_path,
-                status="success",
-                duration=file_duration,
-                processing_time=processing_time,
-            )
+    def _open_checkpoint(self, audio_file_path: str) -> tuple[TranscriptionCheckpoint | None, list[SegmentType]]:
+        """Open the checkpoint of the file and return it with the segments committed by a previous run."""
+        if not settings.whisper.enable_checkpoints:
+            return None, []
+
+        checkpoint = TranscriptionCheckpoint.for_file(audio_file_path)
+        resumed_segments = checkpoint.load()
+        checkpoint.start(resumed_segments)
+        return checkpoint, resumed_segments
 
-        return converted_segments
+    def _advance_file_task(self, file_task: Any, advance: float, file_duration: float) -> None:
+        if file_task is None:
+            return
+        progress_update = min(advance, file_duration - self.progress.tasks[file_task].completed)
+        if progress_update > 0:
+            self.progress.update(file_task, advance=progress_update)
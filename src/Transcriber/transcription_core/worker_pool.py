@@ -0,0 +1,204 @@
+import multiprocessing
+import os
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any
+
+from Transcriber.config import restore_settings, settings
+from Transcriber.logging import logger
+from Transcriber.transcription_core import cpu_topology
+from Transcriber.transcription_core.metrics_store import get_metrics_store
+from Transcriber.utils import file_utils
+from Transcriber.utils.whisper import whisper_utils
+
+# Signature of the function run for every file: (file_path, output_name, model, progress),
+# returning the export of its outputs when they are written in the background
+TranscribeTask = Callable[[str, str, whisper_utils.LazyModel, Any], Future | None]
+
+# Model of the worker process, created by `initialize_worker` and loaded by the first file that needs it
+_worker_model: whisper_utils.LazyModel | None = None
+
+
+def available_cores() -> int:
+    """Number of CPU cores this process is allowed to run on."""
+    return len(cpu_topology.available_cpus())
+
+
+def threads_per_process(num_processes: int) -> int:
+    """Number of CPU threads each worker model gets so the workers do not oversubscribe the cores."""
+    if settings.workers.cpu_threads_per_process > 0:
+        return settings.workers.cpu_threads_per_process
+    return max(1, available_cores() // num_processes)
+
+
+def configure_topology() -> None:
+    """Replace the number of workers and their threads with the split planned from the cores and NUMA nodes."""
+    plan = cpu_topology.plan_topology(threads_per_process=settings.workers.cpu_threads_per_process)
+    settings.workers.num_processes = plan.num_processes
+    settings.workers.cpu_threads_per_process = plan.threads_per_process
+    if plan.num_processes == 1 and settings.whisper.cpu_threads == 0:
+        # A single replica runs in the main process with all the cores
+        settings.whisper.cpu_threads = plan.threads_per_process
+
+    logger.info(
+        "Planned {num_processes} workers with {cpu_threads} threads each",
+        num_processes=plan.num_processes,
+        cpu_threads=plan.threads_per_process,
+        replicas=[list(cpus) for cpus in plan.replicas],
+    )
+
+
+def worker_initargs(num_processes: int) -> tuple[dict[str, Any], int, Any]:
+    """Arguments of `initialize_worker` for a pool of `num_processes` workers."""
+    cpu_threads = threads_per_process(num_processes)
+    cpu_sets = None
+    if settings.workers.pin_cpus:
+        # Every worker takes the CPUs of one replica when it starts
+        plan = cpu_topology.plan_topology(num_processes, cpu_threads)
+        cpu_sets = multiprocessing.get_context("spawn").SimpleQueue()
+        for cpus in plan.replicas:
+            cpu_sets.put(cpus)
+    return settings.model_dump(), cpu_threads, cpu_sets
+
+
+def probe_durations(files: list[dict[str, Any]]) -> dict[str, float | None]:
+    """
+    Read the duration of every file up front, in parallel since it is mostly I/O.
+
+    Files with a "speech_duration" measured by the VAD stage use it instead, the time a file takes
+    follows its speech rather than its length.
+    """
+    durations = {
+        str(file["file_path"]): file["speech_duration"] for file in files if file.get("speech_duration") is not None
+    }
+    paths = [str(file["file_path"]) for file in files if str(file["file_path"]) not in durations]
+    with ThreadPoolExecutor(max_workers=min(32, max(1, len(paths)))) as executor:
+        durations.update(zip(paths, executor.map(file_utils.probe_duration, paths), strict=True))
+    return durations
+
+
+def schedule_longest_first(files: list[dict[str, Any]], durations: dict[str, float | None]) -> list[dict[str, Any]]:
+    """
+    Order the files so the longest ones are dispatched first.
+
+    Starting with the long files keeps the end of the run from waiting on a single long file while
+    the other workers are idle. Files with an unknown duration are treated as long.
+    """
+
+    def duration(file: dict[str, Any]) -> float:
+        # Silent or empty files probe to 0.0, which is known and shortest
+        value = durations.get(str(file["file_path"]))
+        return float("inf") if value is None else value
+
+    return sorted(files, key=duration, reverse=True)
+
+
+def initialize_worker(settings_snapshot: dict[str, Any], cpu_threads: int, cpu_sets: Any = None) -> None:
+    """
+    Load the settings of the main process and prepare the model, once per worker process.
+
+    Args:
+        settings_snapshot: Settings of the main process
+        cpu_threads: Number of CPU threads of the worker model
+        cpu_sets: Queue of the CPUs of every worker, when the workers are pinned to their CPUs
+    """
+    global _worker_model
+    restore_settings(settings_snapshot)
+    # Workers already run in parallel, they never split a file across processes again
+    settings.workers.split_long_files = False
+    cpus = None
+    if cpu_sets is not None:
+        cpus = cpu_sets.get()
+        cpu_topology.pin_process(cpus)
+    _worker_model = whisper_utils.LazyModel(cpu_threads=cpu_threads)
+    logger.debug("Initialized worker", pid=os.getpid(), cpu_threads=cpu_threads, cpus=cpus)
+
+
+def get_worker_model() -> whisper_utils.LazyModel | None:
+    """Model loaded in the current worker process, None outside of the workers."""
+    return _worker_model
+
+
+def _run_task(task: TranscribeTask, file_path: str, output_name: str) -> str:
+    try:
+        export = task(file_path, output_name, _worker_model, None)
+        # The file is reported as done once its outputs are written, and as failed if writing them failed
+        if export is not None:
+            export.result()
+    finally:
+        # Worker processes exit without running the atexit handlers
+        get_metrics_store().flush()
+    return output_name
+
+
+class WorkerPool:
+    """
+    Transcribes files on several processes, each holding its own model.
+
+    A single CTranslate2 instance does not scale to many cores, so the cores are split between
+    `num_processes` independent models instead. Durations are probed before dispatching and the
+    files are submitted longest-first.
+    """
+
+    def __init__(self, num_processes: int, task: TranscribeTask):
+        """
+        Initialize the worker pool.
+
+        Args:
+            num_processes: Number of worker processes
+            task: Module level function called for every file in the worker, must be picklable
+        """
+        self.num_processes = num_processes
+        self.task = task
+
+    def run(
+        self,
+        files: list[dict[str, Any]],
+        on_done: Callable[[dict[str, Any], float | None], None],
+    ) -> None:
+        """
+        Transcribe the files and call `on_done(file, duration)` in the main process for every finished file.
+
+        Args:
+            files: Files to transcribe, as dictionaries with "file_name", "file_path" and "output_name"
+            on_done: Callback used to report progress, called for failed files as well
+        """
+        durations = probe_durations(files)
+        scheduled_files = schedule_longest_first(files, durations)
+        cpu_threads = threads_per_process(self.num_processes)
+
+        logger.info(
+            "Starting {num_processes} workers with {cpu_threads} threads each",
+            num_processes=self.num_processes,
+            cpu_threads=cpu_threads,
+            total_duration=round(sum(duration or 0 for duration in durations.values()), 2),
+        )
+
+        with ProcessPoolExecutor(
+            max_workers=self.num_processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=initialize_worker,
+            initargs=worker_initargs(self.num_processes),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _run_task,
+                    self.task,
+                    str(Path(file["file_path"]).absolute()),
+                    file["output_name"],
+                ): file
+                for file in scheduled_files
+            }
+
+            for future in as_completed(futures):
+                file = futures[future]
+                try:
+                    future.result()
+                except BrokenProcessPool:
+                    logger.exception(f"Worker pool crashed while processing file {file['file_name']}")
+                except Exception:
+                    logger.exception(f"Error processing file {file['file_name']}")
+                finally:
+                    on_done(file, durations.get(str(file["file_path"])))
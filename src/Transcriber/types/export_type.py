@@ -7,6 +7,7 @@ class ExportType(Enum):
     SRT = "srt"
     VTT = "vtt"
     DOCX = "docx"
+    JSONL = "jsonl"
     # PDF = "pdf"
 
     def __str__(self):
@@ -0,0 +1,199 @@
+import struct
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import overload
+
+from Transcriber.types.segment_type import SegmentType
+
+# Header of the serialized store: magic, then the number of segments
+_MAGIC = b"TSEG1"
+_HEADER = struct.Struct("<5sQ")
+
+
+class SegmentStore(Sequence[SegmentType]):
+    """
+    Columnar container of the segments of a transcript.
+
+    Start and end times are kept in `array` buffers and the texts in a single string buffer addressed
+    by offsets, with the word count of every segment computed once on append. Compared to a list of
+    dictionaries this holds a transcript in a fraction of the memory, and compaction and
+    serialization are linear passes over the columns.
+
+    The store is a `Sequence` of `SegmentType`: indexing or iterating it builds the segment
+    dictionaries on demand, so code written for a list of segments keeps working.
+
+    Texts appended since the last read are joined to the buffer on the next read, so appending
+    everything first and reading afterwards joins them only once.
+    """
+
+    def __init__(self):
+        self.starts = array("d")
+        self.ends = array("d")
+        self.word_counts = array("I")
+        # End offset of every text in the buffer, the text of a segment starts where the previous one ends
+        self._offsets = array("Q")
+        self._buffer = ""
+        self._pending: list[str] = []
+        self._length = 0
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[SegmentType]) -> "SegmentStore":
+        """Build a store from segment dictionaries, returning the segments as is if they already are a store."""
+        if isinstance(segments, SegmentStore):
+            return segments
+
+        store = cls()
+        for segment in segments:
+            store.append(segment["start"], segment["end"], segment["text"])
+        return store
+
+    def append(self, start: float, end: float, text: str) -> None:
+        self.starts.append(start)
+        self.ends.append(end)
+        self.word_counts.append(len(text.split()))
+        self._length += len(text)
+        self._offsets.append(self._length)
+        self._pending.append(text)
+
+    def text(self, index: int) -> str:
+        buffer = self._text_buffer()
+        return buffer[self._offsets[index - 1] if index > 0 else 0 : self._offsets[index]]
+
+    def texts(self) -> Iterator[str]:
+        buffer = self._text_buffer()
+        previous = 0
+        for offset in self._offsets:
+            yield buffer[previous:offset]
+            previous = offset
+
+    def compact(self, min_words_per_segment: int) -> "SegmentStore":
+        """
+        Merge consecutive segments until they reach a minimum number of words.
+
+        Args:
+            min_words_per_segment: Minimum number of words of a merged segment
+
+        Returns:
+            SegmentStore: The compacted segments
+        """
+        compacted = SegmentStore()
+        compactor = SegmentCompactor(min_words_per_segment, compacted.append)
+        for start, end, words, text in zip(self.starts, self.ends, self.word_counts, self.texts(), strict=True):
+            compactor.push(start, end, text, words)
+        compactor.flush()
+        return compacted
+
+    def to_bytes(self) -> bytes:
+        """Serialize the columns, in the byte order of this machine, for the local caches."""
+        return b"".join(
+            (
+                _HEADER.pack(_MAGIC, len(self)),
+                self.starts.tobytes(),
+                self.ends.tobytes(),
+                self.word_counts.tobytes(),
+                self._offsets.tobytes(),
+                self._text_buffer().encode("utf-8"),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SegmentStore":
+        magic, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized segment store")
+
+        store = cls()
+        position = _HEADER.size
+        for column in (store.starts, store.ends, store.word_counts, store._offsets):
+            size = count * column.itemsize
+            column.frombytes(data[position : position + size])
+            position += size
+
+        store._buffer = data[position:].decode("utf-8")
+        store._length = len(store._buffer)
+        return store
+
+    @staticmethod
+    def is_serialized(data: bytes) -> bool:
+        return data.startswith(_MAGIC)
+
+    def _text_buffer(self) -> str:
+        if self._pending:
+            self._buffer += "".join(self._pending)
+            self._pending = []
+        return self._buffer
+
+    def _segment(self, index: int) -> SegmentType:
+        return SegmentType(text=self.text(index), start=self.starts[index], end=self.ends[index])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @overload
+    def __getitem__(self, index: int) -> SegmentType: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[SegmentType]: ...
+
+    def __getitem__(self, index: int | slice) -> SegmentType | list[SegmentType]:
+        if isinstance(index, slice):
+            return [self._segment(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+        return self._segment(index)
+
+    def __iter__(self) -> Iterator[SegmentType]:
+        for start, end, text in zip(self.starts, self.ends, self.texts(), strict=True):
+            yield SegmentType(text=text, start=start, end=end)
+
+    def __repr__(self) -> str:
+        return f"SegmentStore({len(self)} segments)"
+
+
+class SegmentCompactor:
+    """
+    Merges consecutive segments until they reach a minimum number of words, one segment at a time.
+
+    Segments with enough words are emitted as is. Shorter ones start a merged segment that absorbs
+    the following segments until their summed word counts reach the minimum, its text is joined
+    once when it is emitted, so compaction stays linear however many segments are merged. Used by
+    `SegmentStore.compact` and by the streaming export, which compacts segments as they are decoded.
+    """
+
+    def __init__(self, min_words_per_segment: int, emit: Callable[[float, float, str], None]):
+        """
+        Initialize the compactor.
+
+        Args:
+            min_words_per_segment: Minimum number of words of a merged segment
+            emit: Called with the (start, end, text) of every compacted segment
+        """
+        self.min_words_per_segment = min_words_per_segment
+        self.emit = emit
+        self._texts: list[str] = []
+        self._start = 0.0
+        self._end = 0.0
+        self._words = 0
+
+    def push(self, start: float, end: float, text: str, words: int | None = None) -> None:
+        """Add a segment, emitting the compacted segment it completes, if any."""
+        words = len(text.split()) if words is None else words
+        if self._texts:
+            self._texts.append(text.strip())
+            self._end = end
+            self._words += words
+            if self._words >= self.min_words_per_segment:
+                self.flush()
+        elif words < self.min_words_per_segment:
+            self._texts = [text]
+            self._start, self._end, self._words = start, end, words
+        else:
+            self.emit(start, end, text)
+
+    def flush(self) -> None:
+        """Emit the segment still being merged, if any."""
+        if self._texts:
+            self.emit(self._start, self._end, " ".join(self._texts))
+            self._texts = []
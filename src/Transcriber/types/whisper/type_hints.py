@@ -1,10 +1,12 @@
-from typing import TypeVar
+from typing import TYPE_CHECKING, TypeVar
 
-import faster_whisper
-import whisper
+# The backends are heavy to import, they are only loaded when a model is
+if TYPE_CHECKING:
+    import faster_whisper
+    import whisper
 
 WhisperModel = TypeVar(
     "WhisperModel",
-    whisper.Whisper,
-    faster_whisper.WhisperModel,
+    "whisper.Whisper",
+    "faster_whisper.WhisperModel",
 )
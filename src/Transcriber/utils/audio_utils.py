@@ -0,0 +1,43 @@
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Sample rate of the audio decoded for the Whisper models
+SAMPLE_RATE = 16000
+
+
+def load_audio(file_path: Path | str) -> np.ndarray:
+    """Load a media file as mono float32 samples at 16 kHz.
+
+    Mono 16 kHz PCM WAV files, as written by the "pcm" download format, are read directly without
+    going through the decoder and resampler.
+    """
+    audio = read_pcm_wav(file_path)
+    if audio is not None:
+        return audio
+
+    import faster_whisper
+
+    return faster_whisper.decode_audio(str(file_path), sampling_rate=SAMPLE_RATE)
+
+
+def read_pcm_wav(file_path: Path | str) -> np.ndarray | None:
+    """Read a mono 16 kHz 16-bit PCM WAV file, or return None if the file is in any other format."""
+    if Path(file_path).suffix.lower() != ".wav":
+        return None
+
+    try:
+        with wave.open(str(file_path), "rb") as file:
+            if (
+                file.getnchannels() != 1
+                or file.getframerate() != SAMPLE_RATE
+                or file.getsampwidth() != 2
+                or file.getcomptype() != "NONE"
+            ):
+                return None
+            frames = file.readframes(file.getnframes())
+    except (wave.Error, EOFError, OSError):
+        return None
+
+    return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
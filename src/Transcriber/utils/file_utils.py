@@ -1,6 +1,10 @@
+import hashlib
 import mimetypes
+from functools import lru_cache
 from pathlib import Path
 
+import av
+
 mimetypes.init()
 
 
@@ -16,3 +20,36 @@ def filter_media_files(paths: list[Path]) -> list[Path]:
             continue
         filtered_media_files.append(path)
     return filtered_media_files
+
+
+def probe_duration(path: Path | str) -> float | None:
+    """Read the duration of a media file in seconds from its container, without decoding it.
+
+    Returns None when the duration cannot be determined.
+    """
+    try:
+        with av.open(str(path), metadata_errors="ignore") as container:
+            if container.duration is not None:
+                return container.duration / av.time_base
+            for stream in container.streams.audio:
+                if stream.duration is not None and stream.time_base is not None:
+                    return float(stream.duration * stream.time_base)
+    except (av.FFmpegError, OSError):
+        return None
+    return None
+
+
+def hash_file(path: Path | str) -> str:
+    """Hash the content of a file, so identical media is recognized whatever its name or location.
+
+    The hash is remembered for the file as long as its size and modification time do not change, so
+    the caches looking up the same file during a run only read it once.
+    """
+    stat = Path(path).stat()
+    return _hash_file(str(Path(path).absolute()), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=4096)
+def _hash_file(path: str, size: int, mtime_ns: int) -> str:
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
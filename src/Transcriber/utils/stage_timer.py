@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Stages of the file being processed by the current thread, see `StageTimer.track`
+_tracked_stages: ContextVar[dict[str, float] | None] = ContextVar("tracked_stages", default=None)
+
+
+class StageTimer:
+    """
+    Accumulates the wall time spent in each pipeline stage (decode, inference, export, ...).
+
+    The totals cover every thread of the process. The stages of a single file are collected with
+    `track`, which only sees the time measured by the thread running the block, so work of other
+    files running at the same time on other threads is never attributed to it.
+    """
+
+    def __init__(self):
+        self.totals: defaultdict[str, float] = defaultdict(float)
+        self.counts: defaultdict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Add the time spent in the block to the stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def add(self, stage: str, seconds: float, count: int = 1) -> None:
+        tracked = _tracked_stages.get()
+        with self._lock:
+            self.totals[stage] += seconds
+            self.counts[stage] += count
+            if tracked is not None:
+                tracked[stage] = tracked.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def track(self, stages: dict[str, float] | None = None) -> Iterator[dict[str, float]]:
+        """
+        Collect the stages measured by the current thread in the block.
+
+        Args:
+            stages: Dictionary the seconds per stage are added to, shared by the threads working on
+                the same files, by default a new one
+
+        Yields:
+            dict: The seconds per stage measured in the block
+        """
+        stages = {} if stages is None else stages
+        token = _tracked_stages.set(stages)
+        try:
+            yield stages
+        finally:
+            _tracked_stages.reset(token)
+
+    def snapshot(self) -> dict[str, float]:
+        """Total seconds per stage since the last reset."""
+        with self._lock:
+            return dict(self.totals)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.totals.clear()
+            self.counts.clear()
+
+
+stage_timer = StageTimer()
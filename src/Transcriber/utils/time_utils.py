@@ -13,3 +13,36 @@ def format_timestamp(seconds: float, include_hours: bool = False, decimal_marker
         time_str = f"{minutes:02d}:{seconds:02d}{decimal_marker}{milliseconds:03d}"
 
     return time_str
+
+
+def merge_intervals(intervals: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """Merge overlapping (start, end) intervals into a sorted list of disjoint intervals."""
+    merged: list[tuple[float, float]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def total_duration(intervals: list[tuple[float, float]]) -> float:
+    """Total time covered by the intervals, counting overlapping parts once."""
+    return sum(end - start for start, end in merge_intervals(intervals))
+
+
+def overlap_duration(first: list[tuple[float, float]], second: list[tuple[float, float]]) -> float:
+    """Total time during which both groups of intervals were active at the same time."""
+    first, second = merge_intervals(first), merge_intervals(second)
+    overlap = 0.0
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if end > start:
+            overlap += end - start
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return overlap
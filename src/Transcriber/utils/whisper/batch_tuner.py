@@ -0,0 +1,234 @@
+"""
+Batch size autotuning for the batched faster-whisper pipeline.
+
+The best batch size depends on the model, the compute type and the machine, it is measured once on a
+short calibration clip and remembered per (model, compute_type, host).
+
+Usage:
+    python -m Transcriber.utils.whisper.batch_tuner path/to/audio.mp3
+"""
+
+import argparse
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from Transcriber.config import settings
+from Transcriber.logging import logger
+from Transcriber.utils.audio_utils import SAMPLE_RATE
+from Transcriber.utils.whisper import model_cache
+
+# A candidate must beat the best throughput by this much to be worth its memory
+MIN_SPEEDUP = 1.05
+
+# Memory left to the rest of the system when trying larger batches
+MEMORY_HEADROOM_MB = 1024
+
+
+def is_out_of_memory(error: BaseException) -> bool:
+    """Whether an error raised by the backend means a batch did not fit in memory."""
+    if isinstance(error, MemoryError):
+        return True
+    message = str(error).lower()
+    return isinstance(error, RuntimeError) and ("out of memory" in message or "bad_alloc" in message)
+
+
+def available_memory_mb() -> float | None:
+    """Memory available to new allocations, from /proc/meminfo, or None where it is not available."""
+    try:
+        with open("/proc/meminfo") as file:
+            for line in file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of the process, 0 on platforms without `resource` (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if platform.system() == "Darwin" else peak / 1024
+
+
+class BatchSizeTuner:
+    """
+    Finds and remembers the batch size with the best throughput for the current model and machine.
+
+    Candidates are tried in increasing order on the calibration clip repeated once per batch item, so
+    every candidate decodes exactly one full batch. The search stops when a candidate is not faster
+    than the best one so far, runs out of memory, or would leave less than `MEMORY_HEADROOM_MB` of
+    available memory. Results are stored in a JSON file shared by the runs on the machine.
+
+    When a transcription later runs out of memory, `lower` records a smaller batch size so the next
+    files, and the next runs, use it directly.
+    """
+
+    def __init__(self, path: Path, candidates: list[int], clip_duration: float):
+        """
+        Initialize the tuner.
+
+        Args:
+            path: Path of the JSON file storing the tuned batch sizes
+            candidates: Batch sizes to try
+            clip_duration: Seconds of audio of every batch item
+        """
+        self.path = path
+        self.candidates = sorted(set(candidates))
+        self.clip_duration = clip_duration
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key() -> str:
+        return f"{settings.whisper.model_name_or_path}|{model_cache.compute_type()}|{platform.node()}"
+
+    def batch_size(self, model: Any, audio: np.ndarray) -> int:
+        """
+        Return the tuned batch size, calibrating it on the start of the audio the first time.
+
+        Args:
+            model: Loaded `BatchedInferencePipeline`
+            audio: Decoded audio of the file about to be transcribed, used as calibration clip
+        """
+        with self._lock:
+            tuned = self._load().get(self.key())
+            if tuned is not None:
+                return tuned["batch_size"]
+
+            result = self.calibrate(model, audio)
+            self.save(result)
+            return result["batch_size"]
+
+    def calibrate(self, model: Any, audio: np.ndarray) -> dict[str, Any]:
+        """
+        Measure the throughput and peak memory of every candidate on a clip of the audio.
+
+        Returns:
+            dict: The best batch size and the measurements of every candidate tried
+        """
+        clip = audio[: int(self.clip_duration * SAMPLE_RATE)]
+        # Short files are looped, so every batch item has the same amount of audio
+        clip = np.resize(clip, int(self.clip_duration * SAMPLE_RATE)) if clip.size else clip
+        clip_seconds = clip.shape[0] / SAMPLE_RATE
+
+        measurements: dict[str, dict[str, float]] = {}
+        best_size, best_throughput = self.candidates[0], 0.0
+        for batch_size in self.candidates:
+            rss_before = peak_rss_mb()
+            try:
+                throughput = self._measure(model, clip, clip_seconds, batch_size)
+            except Exception as error:
+                if not is_out_of_memory(error):
+                    raise
+                logger.warning("Batch size {batch_size} ran out of memory while calibrating", batch_size=batch_size)
+                break
+
+            growth = peak_rss_mb() - rss_before
+            measurements[str(batch_size)] = {"throughput": round(throughput, 3), "peak_rss_growth_mb": round(growth, 1)}
+            logger.debug("Calibrated batch size", batch_size=batch_size, **measurements[str(batch_size)])
+
+            if throughput < best_throughput * MIN_SPEEDUP:
+                break
+            best_size, best_throughput = batch_size, throughput
+
+            # The next candidate doubles the batch, and about the memory it needs
+            available = available_memory_mb()
+            if available is not None and available - 2 * max(growth, 0) < MEMORY_HEADROOM_MB:
+                logger.info("Stopping the batch size calibration before running out of memory", available_mb=available)
+                break
+
+        logger.info(
+            "Tuned the batch size to {batch_size}",
+            batch_size=best_size,
+            throughput=round(best_throughput, 3),
+            key=self.key(),
+        )
+        return {"batch_size": best_size, "throughput": best_throughput, "candidates": measurements}
+
+    def lower(self, batch_size: int) -> None:
+        """Remember a smaller batch size after running out of memory with the tuned one."""
+        with self._lock:
+            tuned = self._load().get(self.key())
+            if tuned is None or tuned["batch_size"] > batch_size:
+                self.save({**(tuned or {}), "batch_size": batch_size, "lowered_at": time.time()})
+
+    def _measure(self, model: Any, clip: np.ndarray, clip_seconds: float, batch_size: int) -> float:
+        """Seconds of audio decoded per second with a single batch of `batch_size` items."""
+        audio = np.tile(clip, batch_size)
+        clip_timestamps = [{"start": i * clip_seconds, "end": (i + 1) * clip_seconds} for i in range(batch_size)]
+
+        started_at = time.perf_counter()
+        segments, _ = model.transcribe(
+            audio,
+            language=settings.whisper.language or "en",
+            task=settings.whisper.task,
+            beam_size=settings.whisper.beam_size,
+            batch_size=batch_size,
+            clip_timestamps=clip_timestamps,
+        )
+        for _ in segments:
+            pass
+        return batch_size * clip_seconds / (time.perf_counter() - started_at)
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, result: dict[str, Any]) -> None:
+        """Store the tuned batch size of the current key, keeping the other keys."""
+        tuned = self._load()
+        tuned[self.key()] = {**result, "measured_at": result.get("measured_at", time.time())}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file = tempfile.NamedTemporaryFile(
+            "w", dir=self.path.parent, prefix=self.path.stem, suffix=".tmp", encoding="utf-8", delete=False
+        )
+        try:
+            with file:
+                file.write(json.dumps(tuned, indent=2))
+            os.replace(file.name, self.path)
+        except BaseException:
+            os.remove(file.name)
+            raise
+
+
+@lru_cache
+def get_batch_tuner() -> BatchSizeTuner:
+    return BatchSizeTuner(
+        Path(settings.cache.cache_dir) / "batch_sizes.json",
+        candidates=settings.whisper.batch_size_candidates,
+        clip_duration=settings.whisper.calibration_clip_duration,
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", type=Path, help="Media file the calibration clip is taken from")
+    args = parser.parse_args(argv)
+
+    from Transcriber.utils.audio_utils import load_audio
+    from Transcriber.utils.whisper.whisper_utils import load_model
+
+    tuner = get_batch_tuner()
+    result = tuner.calibrate(load_model(), load_audio(str(args.audio)))
+    tuner.save(result)
+    print(json.dumps({tuner.key(): result}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compare the speed and accuracy of CTranslate2 compute types on local samples.
+
+Every media file of the sample directory is transcribed with every compute type. The real time
+factor (RTF) is the transcription time divided by the audio duration, lower is faster. The word
+error rate (WER) compares the transcript with the reference next to the file, `<name>.txt`,
+lowercased and without punctuation. Files without a reference only count for the RTF.
+
+Usage:
+    transcriber-calibrate samples/ --compute-types int8 int8_float32 float32
+    transcriber-calibrate samples/ --model small --output calibration.json
+"""
+
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+from Transcriber.config import settings
+from Transcriber.source_loaders.directory_scanner import scan_media_files
+from Transcriber.utils.audio_utils import SAMPLE_RATE, load_audio
+from Transcriber.utils.whisper import model_cache, whisper_utils
+
+DEFAULT_COMPUTE_TYPES = ("int8", "int8_float32", "float32")
+
+
+def normalize_words(text: str) -> list[str]:
+    """Lowercase words without punctuation, for any script."""
+    return re.sub(r"[^\w\s']|_", " ", text.lower()).split()
+
+
+def word_edit_distance(reference: list[str], hypothesis: list[str]) -> int:
+    """Number of word substitutions, insertions and deletions turning the hypothesis into the reference."""
+    previous = list(range(len(hypothesis) + 1))
+    for row, reference_word in enumerate(reference, start=1):
+        current = [row]
+        for column, hypothesis_word in enumerate(hypothesis, start=1):
+            current.append(
+                min(
+                    previous[column] + 1,
+                    current[column - 1] + 1,
+                    previous[column - 1] + (reference_word != hypothesis_word),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def calibrate(samples: list[Path], compute_type: str) -> dict[str, Any]:
+    """
+    Load the configured model with a compute type and transcribe every sample with it.
+
+    Returns:
+        dict: Load time, RTF and WER of the compute type
+    """
+    settings.whisper.ct2_compute_type = compute_type
+    started_at = time.perf_counter()
+    model = whisper_utils.load_model()
+    load_time = time.perf_counter() - started_at
+
+    audio_seconds = transcription_seconds = 0.0
+    errors = reference_words = 0
+    for sample in samples:
+        audio = load_audio(sample)
+        started_at = time.perf_counter()
+        segments, _ = model.transcribe(audio, **whisper_utils.transcribe_options())
+        hypothesis = " ".join(segment.text for segment in segments)
+        transcription_seconds += time.perf_counter() - started_at
+        audio_seconds += audio.shape[0] / SAMPLE_RATE
+
+        reference_path = sample.with_suffix(".txt")
+        if reference_path.is_file():
+            reference = normalize_words(reference_path.read_text(encoding="utf-8"))
+            errors += word_edit_distance(reference, normalize_words(hypothesis))
+            reference_words += len(reference)
+
+    return {
+        "compute_type": compute_type,
+        "resolved_compute_type": model_cache.compute_type(),
+        "load_time": round(load_time, 3),
+        "real_time_factor": round(transcription_seconds / audio_seconds, 4) if audio_seconds else None,
+        "word_error_rate": round(errors / reference_words, 4) if reference_words else None,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("samples", type=Path, help="Directory of media files with their reference transcripts")
+    parser.add_argument("--compute-types", nargs="+", default=list(DEFAULT_COMPUTE_TYPES))
+    parser.add_argument("--model", help="Model to calibrate, by default the configured one")
+    parser.add_argument("--output", type=Path, help="Write the results to a JSON file as well")
+    args = parser.parse_args(argv)
+
+    if args.model:
+        settings.whisper.model_name_or_path = args.model
+    samples = [file.path for file in scan_media_files(args.samples, recursive=True)]
+    if not samples:
+        parser.error(f"No media files found in {args.samples}")
+
+    results = []
+    for compute_type in args.compute_types:
+        result = calibrate(samples, compute_type)
+        results.append(result)
+        print(json.dumps(result))
+
+    if args.output:
+        args.output.write_text(
+            json.dumps({"model": settings.whisper.model_name_or_path, "results": results}, indent=2), encoding="utf-8"
+        )
+
+
+if __name__ == "__main__":
+    main()
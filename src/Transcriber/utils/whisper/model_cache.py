@@ -0,0 +1,133 @@
+import importlib.util
+import os
+import re
+import shutil
+from functools import lru_cache
+from pathlib import Path
+
+from Transcriber.config import settings
+from Transcriber.logging import logger
+
+# Compute types tried in order when the compute type is "auto", the fastest first
+PREFERRED_COMPUTE_TYPES = {
+    "cuda": ("float16", "int8_float16", "float32"),
+    "cpu": ("int8_float32", "int8", "float32"),
+}
+
+# Files of a Transformers checkpoint faster-whisper needs next to the converted weights
+CONVERTER_COPY_FILES = ["tokenizer.json", "preprocessor_config.json"]
+
+
+def device() -> str:
+    """Device faster-whisper loads the model on by default, "cuda" when a GPU is visible to CTranslate2."""
+    import ctranslate2
+
+    return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+
+@lru_cache
+def select_compute_type(requested: str) -> str:
+    """
+    Resolve the configured compute type for the device of this host.
+
+    "auto" picks the fastest type the device supports. A type the device does not support is
+    replaced the same way, with a warning, instead of CTranslate2 falling back silently.
+
+    Args:
+        requested: Configured compute type, e.g. "auto", "float16" or "int8"
+
+    Returns:
+        str: A compute type supported by the device
+    """
+    import ctranslate2
+
+    target = device()
+    supported = ctranslate2.get_supported_compute_types(target)
+    if requested != "auto" and requested in supported:
+        return requested
+
+    compute_type = next(
+        (compute_type for compute_type in PREFERRED_COMPUTE_TYPES[target] if compute_type in supported), "default"
+    )
+    if requested != "auto":
+        logger.warning(
+            "Compute type {requested} is not supported on {device}, using {compute_type}",
+            requested=requested,
+            device=target,
+            compute_type=compute_type,
+        )
+    return compute_type
+
+
+def compute_type() -> str:
+    """Compute type of the configured model on this host."""
+    return select_compute_type(settings.whisper.ct2_compute_type)
+
+
+def is_ctranslate2_model(model_dir: Path) -> bool:
+    return (model_dir / "model.bin").is_file()
+
+
+def model_path(model_name_or_path: str, quantization: str) -> str:
+    """
+    Return what faster-whisper loads for a model, converting Transformers checkpoints once.
+
+    Model sizes ("large-v3") and CTranslate2 models are returned as they are. Transformers Whisper
+    checkpoints, local or on the Hugging Face Hub (e.g. "openai/whisper-small"), are converted to
+    CTranslate2 with the quantization and stored in the model cache, later loads read the cached
+    conversion directly.
+
+    Args:
+        model_name_or_path: Configured model
+        quantization: Compute type the weights are stored with
+    """
+    import faster_whisper
+
+    if model_name_or_path in faster_whisper.available_models():
+        return model_name_or_path
+
+    source = Path(model_name_or_path)
+    if not source.is_dir():
+        if "/" not in model_name_or_path:
+            return model_name_or_path
+        # Only the files of a CTranslate2 model are downloaded, a Transformers checkpoint has no model.bin
+        source = Path(faster_whisper.download_model(model_name_or_path))
+
+    if is_ctranslate2_model(source):
+        return str(source)
+
+    output_dir = Path(settings.cache.cache_dir) / "models" / f"{_safe_name(model_name_or_path)}-{quantization}"
+    if not is_ctranslate2_model(output_dir):
+        convert_model(model_name_or_path, output_dir, quantization)
+    return str(output_dir)
+
+
+def convert_model(model_name_or_path: str, output_dir: Path, quantization: str) -> None:
+    """Convert a Transformers Whisper checkpoint to a quantized CTranslate2 model, needs the `convert` extra."""
+    if importlib.util.find_spec("transformers") is None:
+        raise ImportError("Converting Transformers models needs the `convert` extra: Transcriber[convert]")
+
+    from ctranslate2.converters import TransformersConverter
+
+    logger.info(
+        "Converting {model} to CTranslate2 with {quantization} weights",
+        model=model_name_or_path,
+        quantization=quantization,
+    )
+    # Converted next to the cache entry, so concurrent processes never load a partial model
+    partial_dir = output_dir.with_name(f"{output_dir.name}.{os.getpid()}.tmp")
+    output_dir.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        converter = TransformersConverter(model_name_or_path, copy_files=CONVERTER_COPY_FILES)
+        converter.convert(str(partial_dir), quantization=quantization, force=True)
+        os.replace(partial_dir, output_dir)
+    except OSError:
+        # Another process stored the same conversion first
+        if not is_ctranslate2_model(output_dir):
+            raise
+    finally:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+
+
+def _safe_name(model_name_or_path: str) -> str:
+    return re.sub(r"[^\w.-]+", "--", model_name_or_path.strip("/\\"))
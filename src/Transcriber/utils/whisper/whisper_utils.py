@@ -1,21 +1,117 @@
-import faster_whisper
-import stable_whisper
+import threading
+import time
+from typing import Any
 
 from Transcriber.config import settings
+from Transcriber.logging import logger
 from Transcriber.types.whisper.type_hints import WhisperModel
+from Transcriber.utils.stage_timer import stage_timer
+from Transcriber.utils.whisper import model_cache
 
 
-def load_model() -> WhisperModel:  # type: ignore
-    if settings.whisper.use_faster_whisper and settings.whisper.use_batched_transcription:
+def load_model(cpu_threads: int = 0) -> WhisperModel:  # type: ignore
+    """
+    Load the Whisper model configured in the settings.
+
+    Args:
+        cpu_threads: Number of threads used on CPU, 0 uses `settings.whisper.cpu_threads`.
+    """
+    # Imported here so runs that never load a model do not pay for importing the backends
+    import faster_whisper
+
+    cpu_threads = cpu_threads or settings.whisper.cpu_threads
+    if settings.whisper.use_faster_whisper:
+        compute_type = model_cache.compute_type()
         model = faster_whisper.WhisperModel(
-            settings.whisper.model_name_or_path,
-            compute_type=settings.whisper.ct2_compute_type,
-        )
-        return faster_whisper.BatchedInferencePipeline(model=model)
-    elif settings.whisper.use_faster_whisper:
-        return faster_whisper.WhisperModel(
-            settings.whisper.model_name_or_path,
-            compute_type=settings.whisper.ct2_compute_type,
+            model_cache.model_path(settings.whisper.model_name_or_path, compute_type),
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=settings.whisper.num_workers,
         )
+        if settings.whisper.use_batched_transcription:
+            return faster_whisper.BatchedInferencePipeline(model=model)
+        return model
     else:
+        import stable_whisper
+
+        if cpu_threads:
+            import torch
+
+            torch.set_num_threads(cpu_threads)
         return stable_whisper.load_model(settings.whisper.model_name_or_path)
+
+
+class LazyModel:
+    """
+    Loads the configured Whisper model the first time it is needed.
+
+    Loading a large model takes tens of seconds and gigabytes of memory, runs where every file is
+    skipped or already cached never load it.
+    """
+
+    def __init__(self, cpu_threads: int = 0):
+        """
+        Initialize the lazy model.
+
+        Args:
+            cpu_threads: Number of threads used on CPU, 0 uses `settings.whisper.cpu_threads`.
+        """
+        self.cpu_threads = cpu_threads
+        self._model: WhisperModel | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self) -> WhisperModel:
+        """Return the model, loading it on the first call. Safe to call from several threads."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    started_at = time.perf_counter()
+                    with stage_timer.measure("model_load"):
+                        self._model = load_model(cpu_threads=self.cpu_threads)
+                    logger.info(
+                        "Loaded Whisper model {model} in {load_time}s",
+                        model=settings.whisper.model_name_or_path,
+                        load_time=round(time.perf_counter() - started_at, 2),
+                    )
+        return self._model
+
+
+def decode_settings() -> dict[str, Any]:
+    """Settings that change the segments produced for the same audio, used to key cached results."""
+    decode = {
+        "model_name_or_path": settings.whisper.model_name_or_path,
+        "use_faster_whisper": settings.whisper.use_faster_whisper,
+        "use_batched_transcription": settings.whisper.use_batched_transcription,
+        "task": settings.whisper.task,
+        "language": settings.whisper.language,
+        "beam_size": settings.whisper.beam_size,
+        "vad_filter": settings.whisper.vad_filter,
+        "vad_parameters": settings.whisper.vad_parameters if settings.whisper.vad_filter else None,
+        "ct2_compute_type": model_cache.compute_type() if settings.whisper.use_faster_whisper else None,
+    }
+    if settings.whisper.vad_stage and settings.whisper.vad_filter and settings.whisper.use_faster_whisper:
+        # Files without speech are skipped and the batched pipeline decodes chunks cut by the stage
+        decode["vad_stage"] = True
+        decode["min_speech_duration"] = settings.whisper.min_speech_duration
+    return decode
+
+
+def transcribe_options() -> dict[str, Any]:
+    """Keyword arguments passed to the transcribe method of faster-whisper models."""
+    options = {
+        "task": settings.whisper.task,
+        "language": settings.whisper.language,
+        "beam_size": settings.whisper.beam_size,
+        "vad_filter": settings.whisper.vad_filter,
+    }
+    if settings.whisper.vad_filter:
+        options["vad_parameters"] = settings.whisper.vad_parameters
+
+    if settings.whisper.use_batched_transcription:
+        options["batch_size"] = settings.whisper.batch_size
+
+    return options
@@ -0,0 +1,6 @@
+"""Watch mode: a long-running process transcribing the media files dropped in folders with a resident model."""
+
+from Transcriber.watcher.app import watch
+from Transcriber.watcher.ingest import DropFolderWatcher, StabilityTracker
+
+__all__ = ["DropFolderWatcher", "StabilityTracker", "watch"]
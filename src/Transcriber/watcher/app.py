@@ -0,0 +1,64 @@
+import time
+from pathlib import Path
+
+from Transcriber.config import settings
+from Transcriber.export_handlers.export_queue import get_export_queue
+from Transcriber.logging import logger
+from Transcriber.transcriber import prepare_output_directory
+from Transcriber.utils.whisper.whisper_utils import LazyModel
+from Transcriber.watcher.ingest import DropFolderWatcher
+from Transcriber.watcher.sources import create_source
+
+
+def watch(paths: list[str] | None = None, concurrency: int | None = None) -> None:
+    """
+    Run the watch mode: keep the model loaded and transcribe the media files dropped in the folders.
+
+    Args:
+        paths: Folders to watch, defaults to the directories of the input settings.
+        concurrency: Number of files transcribed at the same time, defaults to the watch settings.
+    """
+    roots = [Path(path) for path in paths or settings.input.urls_or_paths if Path(path).is_dir()]
+    if not roots:
+        logger.warning("No folder to watch. Exiting watch mode.")
+        return
+    concurrency = concurrency or settings.watch.concurrency
+
+    settings.output.process_formats()
+    prepare_output_directory()
+
+    # Loaded up front so a dropped file only pays for inference
+    model = LazyModel()
+    model.get()
+
+    watcher = DropFolderWatcher(roots, model, concurrency, settings.watch.settle_time)
+    source = create_source(
+        roots,
+        watcher.on_change,
+        settings.watch.poll_interval,
+        recursive=settings.input.recursive,
+        sniff_content=settings.input.sniff_content,
+        use_polling=settings.watch.use_polling,
+    )
+    # Started before the initial scan, so files dropped in between are not missed
+    source.start()
+    watcher.scan_existing()
+
+    logger.info(
+        "Watching {folders_count} folders for media files",
+        folders_count=len(roots),
+        folders=[str(root) for root in roots],
+        source=type(source).__name__,
+        concurrency=concurrency,
+    )
+
+    try:
+        while True:
+            watcher.poll()
+            time.sleep(settings.watch.poll_interval)
+    except KeyboardInterrupt:
+        logger.info("Stopping the watch mode")
+    finally:
+        source.stop()
+        watcher.close()
+        get_export_queue().close()
@@ -0,0 +1,155 @@
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from Transcriber.config import settings
+from Transcriber.export_handlers.exporter import Writer
+from Transcriber.logging import logger
+from Transcriber.source_loaders import directory_scanner
+from Transcriber.source_loaders.directory_scanner import ScannedFile, is_media_file, is_media_name
+from Transcriber.transcriber import record_manifest, scan_local_path, transcribe_file
+from Transcriber.transcription_core.file_manifest import get_file_manifest, output_profile
+from Transcriber.utils.whisper.whisper_utils import LazyModel
+
+
+class StabilityTracker:
+    """
+    Tracks the files being written until they stop changing.
+
+    A file is stable once its size and modification time stayed the same, and no event was reported
+    for it, during `settle_time` seconds. Every new event restarts the wait, so a burst of events
+    for the same file is handled once. Files still empty once they settled are dropped, a later
+    event for them tracks them again.
+    """
+
+    def __init__(self, settle_time: float, clock: Callable[[], float] = time.monotonic):
+        self.settle_time = settle_time
+        self.clock = clock
+        # Last seen (size, mtime_ns) of every pending file and when it last changed
+        self._pending: dict[Path, tuple[int, int, float]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, path: Path) -> None:
+        with self._lock:
+            self._pending[path] = (-1, -1, self.clock())
+
+    def pop_stable(self) -> list[ScannedFile]:
+        """Return the files that stopped changing and stop tracking them, forgetting the deleted and empty ones."""
+        now = self.clock()
+        stable = []
+        with self._lock:
+            for path, (size, mtime_ns, changed_at) in list(self._pending.items()):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    del self._pending[path]
+                    continue
+
+                if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                    self._pending[path] = (stat.st_size, stat.st_mtime_ns, now)
+                elif now - changed_at >= self.settle_time:
+                    if size > 0:
+                        stable.append(ScannedFile(path, size, mtime_ns))
+                    del self._pending[path]
+        return stable
+
+
+class DropFolderWatcher:
+    """
+    Transcribes the media files dropped in the watched folders with a resident model.
+
+    Files reported by the change source wait in a `StabilityTracker` until they are completely
+    written, then they are transcribed on a bounded thread pool sharing the model. The file manifest
+    is used like in `process_local_directory`: files already done and unchanged are not transcribed
+    again, including the ones found by the initial scan.
+    """
+
+    def __init__(self, roots: list[Path], model: LazyModel, concurrency: int, settle_time: float):
+        """
+        Initialize the watcher.
+
+        Args:
+            roots: Folders to watch
+            model: Model shared by all the transcriptions
+            concurrency: Number of files transcribed at the same time
+            settle_time: Seconds a file must stay unchanged before it is transcribed
+        """
+        self.roots = roots
+        self.model = model
+        self.tracker = StabilityTracker(settle_time)
+        self.manifest = get_file_manifest()
+        self.profile = output_profile()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="watch")
+        self._in_flight: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def scan_existing(self) -> None:
+        """Queue the files already in the folders that are not done yet."""
+        for root in self.roots:
+            scanned_files = scan_local_path(root)
+            unchanged = self.manifest.unchanged(root, scanned_files, self.profile)
+            for file in scanned_files:
+                if file.path not in unchanged:
+                    self.tracker.touch(file.path)
+        logger.info("Found {files_count} files to transcribe in the watched folders", files_count=len(self.tracker))
+
+    def on_change(self, path: Path) -> None:
+        # Without sniffing the name is enough, files are only opened once they are stable
+        if settings.input.sniff_content or is_media_name(path.name):
+            self.tracker.touch(path)
+
+    def poll(self) -> None:
+        """Submit the files that finished being written."""
+        for file in self.tracker.pop_stable():
+            if not is_media_file(str(file.path), settings.input.sniff_content):
+                continue
+            with self._lock:
+                if file.path in self._in_flight:
+                    # Changed while being transcribed, checked again once the current run is over
+                    self.tracker.touch(file.path)
+                    continue
+                self._in_flight.add(file.path)
+            self._executor.submit(self._transcribe, file)
+
+    def _root(self, path: Path) -> Path:
+        """Watched folder a file was dropped in, its outputs are named relative to it."""
+        for root in self.roots:
+            if path.absolute().is_relative_to(root.absolute()):
+                return root
+        return path.parent
+
+    def close(self) -> None:
+        """Finish the transcriptions in progress."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _transcribe(self, file: ScannedFile) -> None:
+        root = self._root(file.path)
+        output_name = directory_scanner.output_name(file.path, root)
+        entry = {"file_name": file.path.name, "file_path": file.path, "output_name": output_name, "scanned": file}
+        if self.manifest.unchanged(root, [file], self.profile):
+            # Touched without changing, e.g. copied over with the same content and times
+            with self._lock:
+                self._in_flight.discard(file.path)
+            return
+
+        try:
+            if settings.input.skip_if_output_exist and Writer().is_output_exist(output_name):
+                logger.info(f"Skipping existing file: {output_name}")
+            else:
+                logger.info(f"Transcribing dropped file: {file.path}")
+                export = transcribe_file(str(file.path.absolute()), output_name, self.model, None)
+                if export is not None:
+                    export.result()
+        except Exception:
+            logger.exception(f"Error processing file {output_name}")
+        finally:
+            try:
+                record_manifest(self.manifest, [entry], self.profile)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(file.path)
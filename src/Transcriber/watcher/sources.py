@@ -0,0 +1,141 @@
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Protocol
+
+from Transcriber.logging import logger
+from Transcriber.source_loaders.directory_scanner import scan_media_files
+
+ChangeCallback = Callable[[Path], None]
+
+
+class ChangeSource(Protocol):
+    """Reports the files created or modified under the watched folders."""
+
+    def start(self) -> None: ...
+
+    def stop(self) -> None: ...
+
+
+class PollingSource:
+    """
+    Scans the folders periodically and reports the files that appeared or changed since the last scan.
+
+    Works everywhere, including network mounts where filesystem events are not delivered, at the
+    cost of one scan per interval.
+    """
+
+    def __init__(
+        self,
+        roots: list[Path],
+        on_change: ChangeCallback,
+        interval: float,
+        recursive: bool = False,
+        sniff_content: bool = False,
+    ):
+        """
+        Initialize the polling source.
+
+        Args:
+            roots: Folders to watch
+            on_change: Called with the path of every new or changed file
+            interval: Seconds between two scans
+            recursive: Whether the subdirectories are watched as well
+            sniff_content: Whether files without a media extension are recognized by their first bytes
+        """
+        self.roots = roots
+        self.on_change = on_change
+        self.interval = interval
+        self.recursive = recursive
+        self.sniff_content = sniff_content
+        self._snapshot: dict[Path, tuple[int, int]] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        # The files already there are handled by the initial scan of the watcher
+        self._snapshot = self._scan()
+        self._thread = threading.Thread(target=self._run, name="watch-polling", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            snapshot = self._scan()
+            for path, signature in snapshot.items():
+                if self._snapshot.get(path) != signature:
+                    self.on_change(path)
+            self._snapshot = snapshot
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for root in self.roots:
+            for file in scan_media_files(root, recursive=self.recursive, sniff_content=self.sniff_content):
+                snapshot[file.path] = (file.size, file.mtime_ns)
+        return snapshot
+
+
+class WatchdogSource:
+    """Reports the files from the filesystem events (inotify, FSEvents, ReadDirectoryChangesW) with watchdog."""
+
+    def __init__(self, roots: list[Path], on_change: ChangeCallback, recursive: bool = False):
+        """
+        Initialize the watchdog source.
+
+        Args:
+            roots: Folders to watch
+            on_change: Called with the path of every created, modified or moved in file
+            recursive: Whether the subdirectories are watched as well
+        """
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event) -> None:
+                if event.is_directory or event.event_type not in ("created", "modified", "moved", "closed"):
+                    return
+                # Files moved in are reported at their destination
+                on_change(Path(event.dest_path if event.event_type == "moved" else event.src_path))
+
+        self._observer = Observer()
+        for root in roots:
+            self._observer.schedule(Handler(), str(root), recursive=recursive)
+
+    def start(self) -> None:
+        self._observer.start()
+
+    def stop(self) -> None:
+        self._observer.stop()
+        self._observer.join()
+
+
+def create_source(
+    roots: list[Path],
+    on_change: ChangeCallback,
+    interval: float,
+    recursive: bool = False,
+    sniff_content: bool = False,
+    use_polling: bool = False,
+) -> ChangeSource:
+    """
+    Create a source of filesystem events, falling back to polling if watchdog is not installed.
+
+    Args:
+        roots: Folders to watch
+        on_change: Called with the path of every new or changed file
+        interval: Seconds between two scans when polling
+        recursive: Whether the subdirectories are watched as well
+        sniff_content: Whether files without a media extension are recognized by their first bytes
+        use_polling: Whether to poll even if watchdog is installed
+    """
+    if not use_polling:
+        try:
+            return WatchdogSource(roots, on_change, recursive=recursive)
+        except ImportError:
+            logger.warning("watchdog is not installed, polling the watched folders instead")
+
+    return PollingSource(roots, on_change, interval, recursive=recursive, sniff_content=sniff_content)
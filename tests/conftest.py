@@ -0,0 +1,11 @@
+import os
+import tempfile
+
+# The settings are read once, when Transcriber is first imported, keep the test runs away from the project files
+_run_dir = tempfile.mkdtemp(prefix="transcriber-tests-")
+os.environ.setdefault("LOGGING__LOG_TO_FILE", "false")
+os.environ.setdefault("LOGGING__LOG_TO_CONSOLE", "false")
+os.environ.setdefault("LOGGING__LOG_PATH", os.path.join(_run_dir, "logs"))
+os.environ.setdefault("LOGGING__METADATA_DB_PATH", os.path.join(_run_dir, "metadata.sqlite3"))
+os.environ.setdefault("CACHE__CACHE_DIR", os.path.join(_run_dir, "cache"))
+os.environ.setdefault("OUTPUT__OUTPUT_DIR", os.path.join(_run_dir, "transcripts"))
@@ -0,0 +1,47 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from Transcriber.transcription_core.audio_cache import AudioCache
+from Transcriber.utils import audio_utils
+
+
+def test_concurrent_misses_of_the_same_file(tmp_path, monkeypatch):
+    media_path = tmp_path / "media.wav"
+    media_path.write_bytes(b"media")
+    audio = np.arange(16000, dtype=np.float32)
+    barrier = threading.Barrier(8)
+
+    def load_audio(file_path):
+        # Every thread misses the cache and writes the same entry at the same time
+        barrier.wait()
+        return audio
+
+    monkeypatch.setattr(audio_utils, "load_audio", load_audio)
+    cache = AudioCache(tmp_path / "audio", max_size_bytes=1 << 30)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        loaded = list(executor.map(lambda _: cache.load(media_path), range(8)))
+
+    assert all(np.array_equal(array, audio) for array in loaded)
+    assert cache.misses == 8
+    assert [path.suffix for path in cache.cache_dir.iterdir()] == [".npy"]
+
+
+def test_failed_writes_leave_no_temporary_file(tmp_path, monkeypatch):
+    media_path = tmp_path / "media.wav"
+    media_path.write_bytes(b"media")
+
+    def save(file, array):
+        file.write(b"partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(audio_utils, "load_audio", lambda file_path: np.zeros(16000, dtype=np.float32))
+    monkeypatch.setattr(np, "save", save)
+    cache = AudioCache(tmp_path / "audio", max_size_bytes=1 << 30)
+
+    with pytest.raises(OSError, match="disk full"):
+        cache.load(media_path)
+    assert list(cache.cache_dir.iterdir()) == []
@@ -0,0 +1,161 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from Transcriber.config import settings
+from Transcriber.transcription_core.whisper_recognizer import WhisperRecognizer
+from Transcriber.utils.audio_utils import SAMPLE_RATE
+from Transcriber.utils.whisper import batch_tuner
+from Transcriber.utils.whisper.batch_tuner import BatchSizeTuner
+
+AUDIO = np.zeros(4 * SAMPLE_RATE, dtype=np.float32)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CalibrationModel:
+    """Takes `seconds[batch_size]` of the fake clock to decode a batch, or runs out of memory."""
+
+    def __init__(self, clock, seconds, error=None):
+        self.clock = clock
+        self.seconds = seconds
+        self.error = error
+        self.batch_sizes = []
+
+    def transcribe(self, audio, batch_size, **kwargs):
+        self.batch_sizes.append(batch_size)
+        if batch_size not in self.seconds:
+            raise self.error
+        self.clock.now += self.seconds[batch_size]
+        return iter(()), None
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(batch_tuner, "time", SimpleNamespace(perf_counter=clock, time=lambda: 0.0))
+    monkeypatch.setattr(batch_tuner, "available_memory_mb", lambda: None)
+    monkeypatch.setattr(batch_tuner, "peak_rss_mb", lambda: 0.0)
+    return clock
+
+
+@pytest.mark.parametrize(
+    ("seconds", "error", "available_mb", "tried", "batch_size"),
+    [
+        # Every candidate is faster
+        ({1: 1.0, 2: 1.0, 4: 1.0, 8: 1.0}, None, None, [1, 2, 4, 8], 8),
+        # 4 is not 5% faster than 2, 8 is not tried
+        ({1: 1.0, 2: 1.0, 4: 1.96}, None, None, [1, 2, 4], 2),
+        # 4 runs out of memory
+        ({1: 1.0, 2: 1.0}, MemoryError(), None, [1, 2, 4], 2),
+        ({1: 1.0, 2: 1.0}, RuntimeError("CUDA failed with error out of memory"), None, [1, 2, 4], 2),
+        # Not enough memory left to try a larger batch
+        ({1: 1.0, 2: 1.0}, None, 512.0, [1], 1),
+    ],
+)
+def test_calibration_stops(tmp_path, monkeypatch, clock, seconds, error, available_mb, tried, batch_size):
+    monkeypatch.setattr(batch_tuner, "available_memory_mb", lambda: available_mb)
+    model = CalibrationModel(clock, seconds, error)
+    tuner = BatchSizeTuner(tmp_path / "batch_sizes.json", candidates=[8, 4, 2, 1], clip_duration=1.0)
+
+    result = tuner.calibrate(model, AUDIO)
+
+    assert model.batch_sizes == tried
+    assert result["batch_size"] == batch_size
+
+
+def test_calibration_raises_other_errors(tmp_path, clock):
+    model = CalibrationModel(clock, {1: 1.0}, ValueError("unsupported language"))
+    tuner = BatchSizeTuner(tmp_path / "batch_sizes.json", candidates=[1, 2], clip_duration=1.0)
+
+    with pytest.raises(ValueError):
+        tuner.calibrate(model, AUDIO)
+
+
+def test_lowered_batch_size_is_kept_by_the_next_runs(tmp_path, clock):
+    path = tmp_path / "batch_sizes.json"
+    model = CalibrationModel(clock, {1: 1.0, 2: 1.0, 4: 1.0, 8: 1.0})
+    assert BatchSizeTuner(path, candidates=[1, 2, 4, 8], clip_duration=1.0).batch_size(model, AUDIO) == 8
+
+    tuner = BatchSizeTuner(path, candidates=[1, 2, 4, 8], clip_duration=1.0)
+    tuner.lower(4)
+    tuner.lower(16)
+
+    # Read from the file, without calibrating again
+    model.batch_sizes.clear()
+    assert BatchSizeTuner(path, candidates=[1, 2, 4, 8], clip_duration=1.0).batch_size(model, AUDIO) == 4
+    assert model.batch_sizes == []
+
+
+class OutOfMemoryModel:
+    """Decodes a segment per second of audio, running out of memory with batches larger than `fits`."""
+
+    def __init__(self, fits):
+        self.fits = fits
+        self.calls = []
+
+    def transcribe(self, audio, batch_size, **kwargs):
+        duration = audio.shape[0] / SAMPLE_RATE
+        self.calls.append((batch_size, duration))
+        if batch_size > 2 * self.fits:
+            raise RuntimeError("CUDA failed with error out of memory")
+        return self._segments(batch_size, duration), SimpleNamespace(duration=duration)
+
+    def _segments(self, batch_size, duration):
+        for start in range(int(duration)):
+            # Batches twice too large only run out of memory half way
+            if batch_size > self.fits and start == 2:
+                raise RuntimeError("std::bad_alloc")
+            yield SimpleNamespace(start=float(start), end=start + 1.0, text=f" word {start}")
+
+
+def test_out_of_memory_halves_the_batch_size(tmp_path, monkeypatch, clock):
+    tuner = BatchSizeTuner(tmp_path / "batch_sizes.json", candidates=[1, 2, 4, 8], clip_duration=1.0)
+    monkeypatch.setattr(settings.whisper, "auto_batch_size", True)
+    monkeypatch.setattr(batch_tuner, "get_batch_tuner", lambda: tuner)
+    model = OutOfMemoryModel(fits=2)
+    recognizer = WhisperRecognizer()
+    kwargs = {"batch_size": 8}
+
+    segments, _ = recognizer._transcribe(model, AUDIO, kwargs)
+    decoded = list(recognizer._decode_segments(model, AUDIO, kwargs, segments))
+
+    # 8 does not start, 4 fails after two segments, 2 decodes the rest of the audio
+    assert model.calls == [(8, 4.0), (4, 4.0), (2, 2.0)]
+    assert [(segment["start"], segment["end"]) for segment in decoded] == [
+        (0.0, 1.0),
+        (1.0, 2.0),
+        (2.0, 3.0),
+        (3.0, 4.0),
+    ]
+    assert kwargs["batch_size"] == 2
+    assert tuner._load()[tuner.key()]["batch_size"] == 2
+
+
+def test_out_of_memory_with_a_single_item_fails(monkeypatch):
+    monkeypatch.setattr(settings.whisper, "auto_batch_size", False)
+    model = OutOfMemoryModel(fits=0)
+
+    with pytest.raises(RuntimeError, match="out of memory"):
+        WhisperRecognizer()._transcribe(model, AUDIO, {"batch_size": 1})
+    assert model.calls == [(1, 4.0)]
+
+
+def test_failed_saves_leave_no_temporary_file(tmp_path, monkeypatch):
+    tuner = BatchSizeTuner(tmp_path / "batch_sizes.json", candidates=[1], clip_duration=1.0)
+
+    def replace(source, destination):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(batch_tuner.os, "replace", replace)
+
+    with pytest.raises(PermissionError):
+        tuner.save({"batch_size": 1})
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,20 @@
+import pytest
+
+from Transcriber.utils.whisper.calibration import normalize_words, word_edit_distance
+
+
+@pytest.mark.parametrize(
+    ("reference", "hypothesis", "distance"),
+    [
+        ("the cat sat on the mat", "the cat sat on the mat", 0),
+        ("the cat sat on the mat", "the cat sat on a mat", 1),
+        ("the cat sat on the mat", "the cat on the mat", 1),
+        ("the cat sat on the mat", "the black cat sat on the mat", 1),
+        ("the cat sat", "", 3),
+        ("", "hello", 1),
+        ("Hello, World!", "hello world", 0),
+        ("مرحبا بالعالم", "مرحبا", 1),
+    ],
+)
+def test_word_edit_distance(reference, hypothesis, distance):
+    assert word_edit_distance(normalize_words(reference), normalize_words(hypothesis)) == distance
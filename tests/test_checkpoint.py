@@ -0,0 +1,91 @@
+import multiprocessing
+import time
+import wave
+from pathlib import Path
+from types import SimpleNamespace
+
+import faster_whisper
+import numpy as np
+import pytest
+
+from Transcriber.config import restore_settings, settings
+from Transcriber.transcription_core.checkpoint import TranscriptionCheckpoint
+from Transcriber.transcription_core.whisper_recognizer import WhisperRecognizer
+
+SAMPLE_RATE = 16000
+DURATION = 60
+SEGMENT_DURATION = 2.0
+
+
+class PositionModel(faster_whisper.WhisperModel):
+    """Emits a segment every `SEGMENT_DURATION` seconds naming the second of the file its audio comes from."""
+
+    def __init__(self, delay: float = 0.0):
+        # The weights of the real model are never loaded
+        self.delay = delay
+        self.decoded: list[int] = []
+
+    def transcribe(self, audio, **kwargs):
+        duration = audio.shape[0] / SAMPLE_RATE
+        return self._segments(audio, duration), SimpleNamespace(duration=duration, language="en")
+
+    def _segments(self, audio, duration):
+        start = 0.0
+        while start < duration:
+            end = min(start + SEGMENT_DURATION, duration)
+            second = round(float(audio[int(start * SAMPLE_RATE)]) * 32768 / 100)
+            self.decoded.append(second)
+            time.sleep(self.delay)
+            yield SimpleNamespace(start=start, end=end, text=f" second {second}")
+            start = end
+
+
+def write_counting_audio(path: Path) -> None:
+    """Write a WAV file whose samples hold the index of their second, scaled by 100."""
+    samples = np.repeat(np.arange(DURATION, dtype=np.int16) * 100, SAMPLE_RATE)
+    with wave.open(str(path), "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(SAMPLE_RATE)
+        file.writeframes(samples.tobytes())
+
+
+def transcribe_slowly(file_path: str, settings_snapshot: dict) -> None:
+    restore_settings(settings_snapshot)
+    WhisperRecognizer().recognize(file_path, PositionModel(delay=0.2))
+
+
+@pytest.fixture
+def checkpoint_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings.whisper, "enable_checkpoints", True)
+    monkeypatch.setattr(settings.whisper, "checkpoint_interval", 0.0)
+    monkeypatch.setattr(settings.cache, "cache_dir", tmp_path / "cache")
+    monkeypatch.setattr(settings.cache, "enable_audio_cache", False)
+
+
+def test_resume_after_kill(tmp_path, checkpoint_settings):
+    audio_path = tmp_path / "counting.wav"
+    write_counting_audio(audio_path)
+    expected = list(WhisperRecognizer().recognize(str(audio_path), PositionModel()))
+    checkpoint = TranscriptionCheckpoint.for_file(str(audio_path))
+
+    process = multiprocessing.get_context("spawn").Process(
+        target=transcribe_slowly, args=(str(audio_path), settings.model_dump())
+    )
+    process.start()
+    deadline = time.monotonic() + 60
+    while len(checkpoint.load()) < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    process.kill()
+    process.join()
+
+    committed = checkpoint.load()
+    assert 5 <= len(committed) < len(expected)
+
+    model = PositionModel()
+    resumed = list(WhisperRecognizer().recognize(str(audio_path), model))
+
+    assert resumed == expected
+    # Only the segments after the last committed one are decoded again
+    assert model.decoded == [int(segment["start"]) for segment in expected[len(committed) :]]
+    assert not checkpoint.path.exists()
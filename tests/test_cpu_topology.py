@@ -0,0 +1,68 @@
+import pytest
+
+from Transcriber.transcription_core import cpu_topology
+from Transcriber.transcription_core.cpu_topology import numa_nodes, parse_cpu_list, plan_topology
+
+TWO_NODES = [[0, 1, 2, 3], [4, 5, 6, 7]]
+FOUR_NODES = [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11], [12, 13, 14, 15]]
+
+
+@pytest.mark.parametrize(
+    ("text", "cpus"),
+    [
+        ("0-3,8-11\n", [0, 1, 2, 3, 8, 9, 10, 11]),
+        ("5", [5]),
+        ("0,2-3", [0, 2, 3]),
+        ("\n", []),
+    ],
+)
+def test_parse_cpu_list(text, cpus):
+    assert parse_cpu_list(text) == cpus
+
+
+@pytest.mark.parametrize(
+    ("cpulists", "cpus", "nodes"),
+    [
+        # Nodes are ordered by number, not by name
+        ({"node0": "0-1", "node1": "2-3", "node10": "4-5"}, list(range(6)), [[0, 1], [2, 3], [4, 5]]),
+        # Only the CPUs of the affinity mask are kept, nodes without any are dropped
+        ({"node0": "0-3", "node1": "4-7", "node2": "8-11"}, [2, 3, 4, 5], [[2, 3], [4, 5]]),
+        # Nodes that do not cover every CPU are not trusted
+        ({"node0": "0-3"}, list(range(8)), [list(range(8))]),
+        # No NUMA information
+        ({}, [0, 1, 2], [[0, 1, 2]]),
+    ],
+)
+def test_numa_nodes(tmp_path, monkeypatch, cpulists, cpus, nodes):
+    for node, cpulist in cpulists.items():
+        (tmp_path / node).mkdir()
+        (tmp_path / node / "cpulist").write_text(cpulist + "\n")
+    monkeypatch.setattr(cpu_topology, "NODE_DIR", tmp_path)
+
+    assert numa_nodes(cpus) == nodes
+
+
+@pytest.mark.parametrize(
+    ("num_processes", "threads_per_process", "nodes", "replicas"),
+    [
+        # Replicas of 4 threads, one per node
+        (0, 0, FOUR_NODES, [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9, 10, 11), (12, 13, 14, 15)]),
+        # 2x4 nodes with 3 replicas: 2 threads each, alternating between the nodes
+        (3, 0, TWO_NODES, [(0, 1), (4, 5), (2, 3)]),
+        # The CPUs left over on every node make a replica across nodes
+        (0, 2, [[0, 1, 2], [3, 4, 5]], [(0, 1), (3, 4), (2, 5)]),
+        # 4x4 oversubscribed: 6 replicas of 4 threads on 16 CPUs share the first nodes
+        (6, 4, FOUR_NODES, [(0, 1, 2, 3), (4, 5, 6, 7), (8, 9, 10, 11), (12, 13, 14, 15), (0, 1, 2, 3), (4, 5, 6, 7)]),
+        # 4 replicas of 4 threads on 2x4 nodes
+        (4, 4, TWO_NODES, [(0, 1, 2, 3), (4, 5, 6, 7), (0, 1, 2, 3), (4, 5, 6, 7)]),
+        # More threads than CPUs
+        (1, 16, TWO_NODES, [(0, 1, 2, 3, 4, 5, 6, 7)]),
+    ],
+)
+def test_plan_topology(num_processes, threads_per_process, nodes, replicas):
+    cpus = sorted(cpu for node in nodes for cpu in node)
+    plan = plan_topology(num_processes, threads_per_process, cpus=cpus, nodes=nodes)
+
+    assert plan.replicas == tuple(replicas)
+    assert plan.num_processes == len(replicas)
+    assert plan.threads_per_process == len(replicas[0])
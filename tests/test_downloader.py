@@ -0,0 +1,163 @@
+import http.server
+import threading
+import wave
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+import yt_dlp
+
+from Transcriber.source_loaders import downloader as downloader_module
+from Transcriber.source_loaders.downloader import Downloader
+
+
+class FlakyHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves the media directory, answering 503 to the first `failures[path]` requests of a path."""
+
+    failures: ClassVar[dict[str, int]] = {}
+    requests: ClassVar[list[str]] = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            FlakyHandler.requests.append(self.path)
+            failing = FlakyHandler.failures.get(self.path, 0) > 0
+            if failing:
+                FlakyHandler.failures[self.path] -= 1
+        if failing:
+            self.send_error(503)
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def media_server(tmp_path):
+    media_dir = tmp_path / "media"
+    media_dir.mkdir()
+    for name in ("voice-note", "episode-1", "episode-2", "episode-3"):
+        with wave.open(str(media_dir / f"{name}.wav"), "wb") as file:
+            file.setnchannels(1)
+            file.setsampwidth(2)
+            file.setframerate(16000)
+            file.writeframes(b"\x01\x00" * 16000)
+
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), lambda *args: FlakyHandler(*args, directory=str(media_dir))
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", media_dir
+    server.shutdown()
+    thread.join()
+    FlakyHandler.failures = {}
+    FlakyHandler.requests = []
+
+
+def test_download_entry_retries_with_backoff(tmp_path, media_server, monkeypatch):
+    base_url, media_dir = media_server
+    output_dir = tmp_path / "downloads"
+    output_dir.mkdir()
+    FlakyHandler.failures = {"/voice-note.wav": 2}
+
+    attempts = []
+
+    def youtube_dl_factory(config):
+        if "download_archive" in config:
+            attempts.append(config)
+        return yt_dlp.YoutubeDL(config)
+
+    sleeps = []
+    monkeypatch.setattr(downloader_module.time, "sleep", sleeps.append)
+
+    downloader = Downloader(
+        # Only the retries of the downloader are counted
+        yt_dlp_options='{"retries": 0, "extractor_retries": 0}',
+        output_dir=str(output_dir),
+        audio_format="native",
+        retry_backoff=0.5,
+        youtube_dl_factory=youtube_dl_factory,
+    )
+    file_path = downloader.download_entry({"url": f"{base_url}/voice-note.wav"}, retries=3)
+
+    assert len(attempts) == 3
+    assert sleeps == [0.5, 1.0]
+    assert file_path is not None
+    assert Path(file_path).read_bytes() == (media_dir / "voice-note.wav").read_bytes()
+
+
+def test_download_entry_gives_up_after_the_retries(tmp_path, media_server, monkeypatch):
+    base_url, _ = media_server
+    FlakyHandler.failures = {"/voice-note.wav": 10}
+    sleeps = []
+    monkeypatch.setattr(downloader_module.time, "sleep", sleeps.append)
+
+    downloader = Downloader(
+        yt_dlp_options='{"retries": 0, "extractor_retries": 0}',
+        output_dir=str(tmp_path),
+        audio_format="native",
+        retry_backoff=0.5,
+    )
+
+    assert downloader.download_entry({"url": f"{base_url}/voice-note.wav"}, retries=2) is None
+    assert sleeps == [0.5, 1.0]
+
+
+class CountingYoutubeDL(yt_dlp.YoutubeDL):
+    """Records the flat extractions and the downloads in flight, holding every download for a moment."""
+
+    lock = threading.Lock()
+    flat_extractions: ClassVar[list[str]] = []
+    downloads: ClassVar[list[str]] = []
+    in_flight = 0
+    max_in_flight = 0
+
+    def extract_info(self, url, download=True, **kwargs):
+        if self.params.get("extract_flat"):
+            CountingYoutubeDL.flat_extractions.append(url)
+            return super().extract_info(url, download=download, **kwargs)
+
+        with self.lock:
+            CountingYoutubeDL.downloads.append(url.rsplit("/", 1)[-1])
+            CountingYoutubeDL.in_flight += 1
+            CountingYoutubeDL.max_in_flight = max(CountingYoutubeDL.max_in_flight, CountingYoutubeDL.in_flight)
+        try:
+            threading.Event().wait(0.2)
+            return super().extract_info(url, download=download, **kwargs)
+        finally:
+            with self.lock:
+                CountingYoutubeDL.in_flight -= 1
+
+
+def test_download_playlist_retries_only_the_failed_entry(tmp_path, media_server, monkeypatch):
+    base_url, media_dir = media_server
+    names = ["episode-1", "episode-2", "episode-3"]
+    items = "".join(
+        f'<item><title>{name}</title><enclosure url="{base_url}/{name}.wav" type="audio/wav"/></item>' for name in names
+    )
+    (media_dir / "feed.xml").write_text(
+        f'<?xml version="1.0"?><rss version="2.0"><channel><title>Podcast</title>{items}</channel></rss>'
+    )
+    FlakyHandler.failures = {"/episode-2.wav": 1}
+    monkeypatch.setattr(downloader_module.time, "sleep", lambda seconds: None)
+
+    downloader = Downloader(
+        yt_dlp_options='{"retries": 0, "extractor_retries": 0}',
+        output_dir=str(tmp_path / "downloads"),
+        audio_format="native",
+        max_workers=2,
+        youtube_dl_factory=CountingYoutubeDL,
+    )
+    url_data = downloader.download(f"{base_url}/feed.xml")
+
+    # The playlist is walked once, flat
+    assert CountingYoutubeDL.flat_extractions == [f"{base_url}/feed.xml"]
+    assert FlakyHandler.requests.count("/feed.xml") == 1
+    # The entries are downloaded two at a time
+    assert CountingYoutubeDL.max_in_flight == 2
+    # Only the entry whose download failed is downloaded again
+    assert sorted(CountingYoutubeDL.downloads) == ["episode-1.wav", "episode-2.wav", "episode-2.wav", "episode-3.wav"]
+    for entry, name in zip(url_data["entries"], names, strict=True):
+        assert Path(entry["filepath"]).read_bytes() == (media_dir / f"{name}.wav").read_bytes()
@@ -0,0 +1,50 @@
+import threading
+
+from Transcriber import transcriber
+from Transcriber.config import settings
+from Transcriber.export_handlers.export_queue import ExportQueue
+from Transcriber.export_handlers.exporter import Writer
+from Transcriber.transcription_core.job_queue import JobQueue
+from Transcriber.types.segment_store import SegmentStore
+
+
+def test_exports_keep_the_language_of_their_file(monkeypatch):
+    release = threading.Event()
+    written = []
+
+    def write_all(writer, output_name, segments):
+        release.wait(timeout=10)
+        written.append((output_name, writer.is_rtl()))
+
+    monkeypatch.setattr(Writer, "write_all", write_all)
+    monkeypatch.setattr(settings.whisper, "language", "ar")
+    export_queue = ExportQueue(max_workers=1, max_pending=2)
+    export_queue.submit("arabic", SegmentStore())
+
+    # The language of the source is restored while the export is still queued
+    settings.whisper.language = None
+    export_queue.submit("detected", SegmentStore())
+    release.set()
+    export_queue.wait()
+    export_queue.close()
+
+    assert written == [("arabic", True), ("detected", False)]
+
+
+def test_failed_background_export_fails_its_job(tmp_path, monkeypatch):
+    def write_all(writer, output_name, segments):
+        raise OSError("disk full")
+
+    segments = SegmentStore()
+    segments.append(0.0, 1.0, "hello")
+    monkeypatch.setattr(Writer, "write_all", write_all)
+    monkeypatch.setattr(settings.output, "background_export", True)
+    monkeypatch.setattr(settings.input, "skip_if_output_exist", False)
+    monkeypatch.setattr(settings.logging, "save_metadata", False)
+    monkeypatch.setattr(transcriber, "_transcribe_file", lambda *args: ("success", segments))
+    job_queue = JobQueue(tmp_path / "jobs.sqlite3", lease_timeout=60, max_attempts=1)
+    monkeypatch.setattr(transcriber, "get_job_queue", lambda: job_queue)
+    job_queue.enqueue_input("/media", [("file", "/media/a.mp3", "a", "1:1")])
+
+    assert transcriber.drain_job_queue(model=None) == 1
+    assert job_queue.counts()["failed"] == 1
@@ -0,0 +1,46 @@
+from Transcriber.transcription_core.job_queue import JobQueue
+
+
+def drain(job_queue):
+    while (job := job_queue.claim("worker")) is not None:
+        job_queue.complete(job.id, "worker")
+
+
+def test_input_is_scanned_again_once_its_jobs_are_finished(tmp_path):
+    job_queue = JobQueue(tmp_path / "jobs.sqlite3", lease_timeout=60, max_attempts=3)
+    first_scan = [("file", "/media/a.mp3", "a", "1:1"), ("file", "/media/b.mp3", "b", "1:1")]
+
+    assert job_queue.enqueue_input("/media", first_scan) == 2
+    assert job_queue.is_input_enqueued("/media")
+
+    job = job_queue.claim("worker")
+    job_queue.complete(job.id, "worker")
+    # A job is still pending, a restarted run does not scan the input
+    assert job_queue.is_input_enqueued("/media")
+
+    drain(job_queue)
+    assert not job_queue.is_input_enqueued("/media")
+
+    # Only the media added since the last scan become jobs
+    assert job_queue.enqueue_input("/media", [*first_scan, ("file", "/media/c.mp3", "c", "1:1")]) == 1
+    assert job_queue.is_input_enqueued("/media")
+    drain(job_queue)
+    assert job_queue.counts() == {"pending": 0, "claimed": 0, "done": 3, "failed": 0}
+    assert not job_queue.is_input_enqueued("/media")
+
+
+def test_finished_files_are_queued_again_once_edited(tmp_path):
+    job_queue = JobQueue(tmp_path / "jobs.sqlite3", lease_timeout=60, max_attempts=3)
+    job_queue.enqueue_input("/media", [("file", "/media/a.mp3", "a", "1:1"), ("url", "https://a", "b", None)])
+    drain(job_queue)
+
+    # Unchanged files and URLs are not transcribed again
+    assert (
+        job_queue.enqueue_input("/media", [("file", "/media/a.mp3", "a", "1:1"), ("url", "https://a", "b", None)]) == 0
+    )
+    assert job_queue.enqueue_input("/media", [("file", "/media/a.mp3", "a", "2:5")]) == 1
+
+    job = job_queue.claim("worker")
+    assert (job.source, job.attempts, job.requeued) == ("/media/a.mp3", 1, True)
+    job_queue.complete(job.id, "worker")
+    assert job_queue.counts() == {"pending": 0, "claimed": 0, "done": 2, "failed": 0}
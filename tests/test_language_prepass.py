@@ -0,0 +1,58 @@
+import wave
+
+import numpy as np
+
+from Transcriber import transcriber
+from Transcriber.config import settings
+from Transcriber.export_handlers.exporter import Writer
+from Transcriber.transcription_core.transcription_cache import TranscriptionCache
+from Transcriber.types.segment_store import SegmentStore
+from Transcriber.utils import file_utils
+
+
+class UnusedModel:
+    def __init__(self):
+        self.loads = 0
+
+    def get(self):
+        self.loads += 1
+        raise RuntimeError("The model is not needed")
+
+
+def test_cached_files_skip_the_language_detection(tmp_path, monkeypatch):
+    cache = TranscriptionCache(tmp_path / "cache.sqlite3", max_size_bytes=2**20)
+    monkeypatch.setattr(transcriber, "get_transcription_cache", lambda: cache)
+    monkeypatch.setattr(settings.cache, "enable_transcription_cache", True)
+    monkeypatch.setattr(settings.whisper, "language_prepass", True)
+    monkeypatch.setattr(settings.whisper, "language", None)
+    monkeypatch.setattr(settings.whisper, "use_faster_whisper", True)
+    monkeypatch.setattr(settings.whisper, "vad_stage", False)
+    monkeypatch.setattr(settings.whisper, "vad_filter", False)
+    monkeypatch.setattr(settings.whisper, "micro_batching", False)
+    monkeypatch.setattr(settings.input, "use_manifest", False)
+    monkeypatch.setattr(settings.input, "skip_if_output_exist", False)
+    monkeypatch.setattr(settings.output, "output_dir", str(tmp_path / "transcripts"))
+    monkeypatch.setattr(settings.output, "output_formats", ["txt"])
+    monkeypatch.setattr(settings.output, "background_export", False)
+    monkeypatch.setattr(settings.logging, "save_metadata", False)
+
+    # Transcribed by a previous run whose detection was not confident, under the key without a language
+    media_dir = tmp_path / "media"
+    media_dir.mkdir()
+    segments = SegmentStore()
+    segments.append(0.0, 1.0, "hello")
+    for seed, name in enumerate(("a", "b")):
+        with wave.open(str(media_dir / f"{name}.wav"), "wb") as file:
+            file.setnchannels(1)
+            file.setsampwidth(2)
+            file.setframerate(16000)
+            file.writeframes(np.random.default_rng(seed).integers(-1000, 1000, 16000, dtype=np.int16).tobytes())
+        audio_hash = file_utils.hash_file(media_dir / f"{name}.wav")
+        cache.put(cache.make_key(audio_hash), segments, audio_hash)
+
+    model = UnusedModel()
+    transcriber.process_local_directory(media_dir, model)
+
+    assert model.loads == 0
+    assert Writer().is_output_exist("a")
+    assert Writer().is_output_exist("b")
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from Transcriber.transcription_core.metrics_store import MetricsStore
+
+
+def test_real_time_factor_leaves_the_model_load_out(tmp_path):
+    store = MetricsStore(tmp_path / "metadata.sqlite3", batch_size=10, flush_interval=60)
+    # The first file of the process loads the model
+    store.record(
+        {
+            "file_name": "media.mp3",
+            "file_path": "/media/media.mp3",
+            "model": "tiny",
+            "status": "success",
+            "duration": 60.0,
+            "processing_time": 16.0,
+            "stages": {"model_load": 10.0, "inference": 6.0},
+            "date_time": 1.0,
+        }
+    )
+    store.record(
+        {
+            "file_name": "media.mp3",
+            "file_path": "/media/media.mp3",
+            "model": "tiny",
+            "status": "success",
+            "duration": 60.0,
+            "processing_time": 6.0,
+            "stages": {"inference": 6.0},
+            "date_time": 2.0,
+        }
+    )
+
+    [summary] = store.summary("model")
+    assert summary["processing_seconds"] == pytest.approx(12.0)
+    assert summary["real_time_factor"] == pytest.approx(0.1)
+    assert summary["model_load_seconds"] == pytest.approx(10.0)
+
+
+def test_idle_store_flushes_after_the_interval(tmp_path):
+    store = MetricsStore(tmp_path / "metadata.sqlite3", batch_size=10, flush_interval=0.1)
+    store.record(
+        {
+            "file_name": "media.mp3",
+            "file_path": "/media/media.mp3",
+            "status": "success",
+            "processing_time": 1.0,
+            "date_time": 1.0,
+        }
+    )
+
+    def count() -> int:
+        with store._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM transcriptions").fetchone()[0]
+
+    # No other record or flush comes, the timer writes the buffer
+    deadline = time.monotonic() + 5
+    while count() == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert count() == 1
@@ -0,0 +1,63 @@
+import ctranslate2
+import faster_whisper
+import pytest
+
+from Transcriber.config import settings
+from Transcriber.utils.whisper import model_cache
+
+
+class Recorder:
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, message, **kwargs):
+        self.warnings.append(kwargs)
+
+
+@pytest.fixture
+def cpu_host(monkeypatch):
+    monkeypatch.setattr(ctranslate2, "get_cuda_device_count", lambda: 0)
+    monkeypatch.setattr(ctranslate2, "get_supported_compute_types", lambda device: {"int8", "int8_float32", "float32"})
+    model_cache.select_compute_type.cache_clear()
+    yield
+    model_cache.select_compute_type.cache_clear()
+
+
+@pytest.mark.parametrize(
+    ("requested", "expected", "warned"),
+    [
+        ("auto", "int8_float32", False),
+        ("int8", "int8", False),
+        ("float16", "int8_float32", True),
+    ],
+)
+def test_compute_type_is_resolved_for_the_device(cpu_host, monkeypatch, requested, expected, warned):
+    recorder = Recorder()
+    monkeypatch.setattr(model_cache, "logger", recorder)
+
+    assert model_cache.select_compute_type(requested) == expected
+    assert bool(recorder.warnings) == warned
+
+
+def test_converted_models_are_reused(tmp_path, monkeypatch):
+    checkpoint = tmp_path / "checkpoint"
+    checkpoint.mkdir()
+    conversions = []
+
+    def convert_model(model_name_or_path, output_dir, quantization):
+        conversions.append(model_name_or_path)
+        output_dir.mkdir(parents=True)
+        (output_dir / "model.bin").write_bytes(b"weights")
+
+    monkeypatch.setattr(settings.cache, "cache_dir", tmp_path / "cache")
+    monkeypatch.setattr(faster_whisper, "download_model", lambda name: str(checkpoint))
+    monkeypatch.setattr(model_cache, "convert_model", convert_model)
+
+    first = model_cache.model_path("openai/whisper-small", "int8")
+    assert model_cache.model_path("openai/whisper-small", "int8") == first
+    assert conversions == ["openai/whisper-small"]
+    assert first == str(tmp_path / "cache" / "models" / "openai--whisper-small-int8")
+
+    # Another quantization is another conversion
+    model_cache.model_path("openai/whisper-small", "float32")
+    assert len(conversions) == 2
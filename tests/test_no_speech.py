@@ -0,0 +1,68 @@
+import wave
+
+import numpy as np
+
+from Transcriber import transcriber
+from Transcriber.config import settings
+from Transcriber.export_handlers.exporter import Writer
+from Transcriber.source_loaders.directory_scanner import scan_media_files
+from Transcriber.transcription_core.file_manifest import FileManifest
+from Transcriber.transcription_core.transcription_cache import TranscriptionCache
+from Transcriber.types.segment_store import SegmentStore
+from Transcriber.utils import file_utils
+
+
+def test_files_without_speech_are_done(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings.output, "output_dir", str(tmp_path / "transcripts"))
+    monkeypatch.setattr(settings.output, "output_formats", ["txt", "srt", "vtt", "docx"])
+    monkeypatch.setattr(settings.whisper, "use_faster_whisper", True)
+    monkeypatch.setattr(settings.whisper, "vad_filter", True)
+    monkeypatch.setattr(settings.whisper, "vad_stage", True)
+    monkeypatch.setattr(settings.cache, "enable_transcription_cache", False)
+    monkeypatch.setattr(settings.logging, "save_metadata", False)
+
+    media_dir = tmp_path / "media"
+    media_dir.mkdir()
+    with wave.open(str(media_dir / "silence.wav"), "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(16000)
+        file.writeframes(np.zeros(5 * 16000, dtype=np.int16).tobytes())
+
+    # The model is never needed for a file without speech
+    transcriber.transcribe_file(str(media_dir / "silence.wav"), "silence", None, None)
+    assert Writer().is_output_exist("silence")
+
+    manifest = FileManifest(tmp_path / "manifest.sqlite3")
+    [scanned] = scan_media_files(media_dir)
+    transcriber.record_manifest(manifest, [{"output_name": "silence", "scanned": scanned}], "profile")
+    assert manifest.unchanged(media_dir, [scanned], "profile") == {scanned.path}
+
+
+def test_files_of_a_micro_batch_without_speech_are_done_and_not_cached(tmp_path, monkeypatch):
+    class Recognizer:
+        def recognize(self, prepared):
+            speech = SegmentStore()
+            speech.append(0.0, 1.0, "hello")
+            return [SegmentStore(), speech]
+
+    cache = TranscriptionCache(tmp_path / "cache.sqlite3", max_size_bytes=2**20)
+    monkeypatch.setattr(settings.output, "output_dir", str(tmp_path / "transcripts"))
+    monkeypatch.setattr(settings.output, "output_formats", ["txt"])
+    monkeypatch.setattr(settings.output, "background_export", False)
+    monkeypatch.setattr(settings.cache, "enable_transcription_cache", True)
+    monkeypatch.setattr(settings.logging, "save_metadata", False)
+    monkeypatch.setattr(transcriber, "get_transcription_cache", lambda: cache)
+
+    files = []
+    for name in ("silence", "speech"):
+        (tmp_path / f"{name}.wav").write_bytes(name.encode())
+        files.append({"file_path": tmp_path / f"{name}.wav", "output_name": name})
+    done = []
+    assert transcriber.transcribe_micro_batch(Recognizer(), files, [], {}, done.append)
+
+    assert done == files
+    assert Writer().is_output_exist("silence")
+    assert Writer().is_output_exist("speech")
+    assert cache.get(cache.make_key(file_utils.hash_file(tmp_path / "silence.wav"))) is None
+    assert cache.get(cache.make_key(file_utils.hash_file(tmp_path / "speech.wav"))) is not None
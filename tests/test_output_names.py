@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pytest
+
+from Transcriber.config import settings
+from Transcriber.export_handlers.exporter import Writer
+from Transcriber.source_loaders.directory_scanner import output_name, scan_media_files
+from Transcriber.transcription_core.file_manifest import FileManifest
+from Transcriber.types.segment_type import SegmentType
+
+
+@pytest.fixture
+def media_dir(tmp_path):
+    media_dir = tmp_path / "media"
+    for name in ("a/01.mp3", "b/01.mp3", "02.mp3"):
+        path = media_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"ID3" + name.encode())
+    return media_dir
+
+
+@pytest.fixture
+def output_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings.output, "output_dir", str(tmp_path / "transcripts"))
+    monkeypatch.setattr(settings.output, "output_formats", ["txt", "srt"])
+    monkeypatch.setattr(settings.output, "save_files_before_compact", False)
+
+
+def test_files_of_subdirectories_keep_their_subdirectories(media_dir):
+    files = scan_media_files(media_dir, recursive=True)
+
+    assert [output_name(file.path, media_dir) for file in files] == ["02", "a/01", "b/01"]
+    # A file given on its own is named after its stem
+    assert output_name(media_dir / "a" / "01.mp3", media_dir / "a" / "01.mp3") == "01"
+
+
+def test_outputs_are_written_in_the_subdirectories(media_dir, output_settings):
+    Writer().write_all("a/01", [SegmentType(start=0.0, end=1.0, text="first")])
+
+    assert Path(settings.output.output_dir, "txt", "a", "01.txt").read_text(encoding="utf-8").strip() == "first"
+    assert Writer().is_output_exist("a/01")
+    assert not Writer().is_output_exist("b/01")
+
+
+def test_unchanged_files_are_read_from_the_manifest(tmp_path, media_dir):
+    manifest = FileManifest(tmp_path / "manifest.sqlite3")
+    files = scan_media_files(media_dir, recursive=True)
+    manifest.record([(file, "done", None) for file in files], "profile")
+
+    # The outputs on disk are not checked, a file done and unchanged is skipped
+    assert manifest.unchanged(media_dir, files, "profile") == {file.path for file in files}
+
+    (media_dir / "b" / "01.mp3").write_bytes(b"ID3 edited")
+    files = scan_media_files(media_dir, recursive=True)
+    assert manifest.unchanged(media_dir, files, "profile") == {media_dir / "02.mp3", media_dir / "a" / "01.mp3"}
@@ -0,0 +1,42 @@
+import threading
+
+from Transcriber.config import settings
+from Transcriber.server import jobs
+
+
+class GatedDownloader:
+    """Downloads the last entry only once the first one is transcribed."""
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.first_transcribed = threading.Event()
+
+    def extract_info(self, url):
+        return {"_type": "playlist", "entries": [{"id": element_id, "title": element_id} for element_id in self.ids]}
+
+    def download_entry(self, element, retries=3):
+        if element["id"] == self.ids[-1] and not self.first_transcribed.wait(timeout=10):
+            return None
+        return f"/media/{element['id']}.m4a"
+
+
+def test_url_downloads_overlap_transcription(monkeypatch):
+    downloader = GatedDownloader(["first", "second"])
+    transcribed = []
+
+    def transcribe_file(file_path, output_name, model, progress):
+        transcribed.append(output_name)
+        downloader.first_transcribed.set()
+
+    monkeypatch.setattr(settings.input, "skip_if_output_exist", False)
+    monkeypatch.setattr(settings.yt_dlp, "concurrent_downloads", 2)
+    monkeypatch.setattr(jobs, "create_downloader", lambda: downloader)
+    monkeypatch.setattr(jobs, "transcribe_file", transcribe_file)
+
+    job = jobs.Job(id="job", source="https://example.com/playlist")
+    failures = jobs.JobManager(concurrency=1, model=None)._transcribe(job)
+
+    # The second download only finishes once the first file is transcribed
+    assert failures == 0
+    assert transcribed == ["first", "second"]
+    assert list(job.outputs) == ["first", "second"]
@@ -0,0 +1,33 @@
+import threading
+
+from Transcriber.utils.stage_timer import StageTimer
+
+
+def test_track_ignores_other_threads():
+    timer = StageTimer()
+    other_thread = threading.Thread(target=timer.add, args=("export", 2.0))
+
+    with timer.track() as stages:
+        timer.add("decode", 1.0)
+        other_thread.start()
+        other_thread.join()
+
+    assert stages == {"decode": 1.0}
+    assert timer.snapshot() == {"decode": 1.0, "export": 2.0}
+
+
+def test_track_shares_stages_between_threads():
+    timer = StageTimer()
+    shared: dict[str, float] = {}
+
+    def prepare() -> None:
+        with timer.track(shared):
+            timer.add("vad", 0.5)
+
+    threads = [threading.Thread(target=prepare) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert shared == {"vad": 2.0}
@@ -0,0 +1,43 @@
+from Transcriber.config import settings
+from Transcriber.export_handlers.exporter import Writer
+from Transcriber.export_handlers.streaming_exporter import StreamingWriter
+from Transcriber.types.segment_store import SegmentStore
+from Transcriber.types.segment_type import SegmentType
+
+SEGMENTS = [
+    (0.0, 1.0, "Hello"),
+    (1.0, 2.0, " there, how are"),
+    (2.0, 3.0, " you"),
+    (3.0, 4.5, " doing today my friend?"),
+    (4.5, 5.0, " Bye"),
+]
+
+
+def read_outputs(output_dir, name, formats):
+    return {
+        output_format: (output_dir / output_format / f"{name}.{output_format}").read_text() for output_format in formats
+    }
+
+
+def test_streamed_outputs_match_the_batch_ones(tmp_path, monkeypatch):
+    formats = ["txt", "srt", "vtt", "jsonl"]
+    monkeypatch.setattr(settings.output, "output_dir", str(tmp_path))
+    monkeypatch.setattr(settings.output, "output_formats", formats)
+    monkeypatch.setattr(settings.output, "min_words_per_segment", 4)
+    store = SegmentStore()
+    for start, end, text in SEGMENTS:
+        store.append(start, end, text)
+
+    Writer().write_all("batch", store)
+    with StreamingWriter("streamed") as writer:
+        for start, end, text in SEGMENTS:
+            writer.write(SegmentType(text=text, start=start, end=end))
+
+    assert read_outputs(tmp_path, "streamed", formats) == read_outputs(tmp_path, "batch", formats)
+    # JSONL keeps the raw segments, the other formats get compacted ones
+    assert len(read_outputs(tmp_path, "batch", ["jsonl"])["jsonl"].splitlines()) == len(SEGMENTS)
+    assert list(store.compact(4)) == [
+        SegmentType(text="Hello there, how are", start=0.0, end=2.0),
+        SegmentType(text=" you doing today my friend?", start=2.0, end=4.5),
+        SegmentType(text=" Bye", start=4.5, end=5.0),
+    ]
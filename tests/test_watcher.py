@@ -0,0 +1,107 @@
+import os
+import threading
+
+from Transcriber.config import settings
+from Transcriber.source_loaders.directory_scanner import scan_media_files
+from Transcriber.transcription_core.file_manifest import FileManifest, output_profile
+from Transcriber.watcher import ingest
+from Transcriber.watcher.ingest import DropFolderWatcher, StabilityTracker
+from Transcriber.watcher.sources import PollingSource
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_files_are_released_once_they_stop_changing(tmp_path):
+    clock = FakeClock()
+    tracker = StabilityTracker(settle_time=2.0, clock=clock)
+    path = tmp_path / "talk.mp3"
+    path.write_bytes(b"ID3")
+
+    tracker.touch(path)
+    assert tracker.pop_stable() == []
+
+    # Still being written, the wait starts over
+    clock.now = 1.5
+    with path.open("ab") as file:
+        file.write(b"more")
+    assert tracker.pop_stable() == []
+    clock.now = 3.0
+    assert tracker.pop_stable() == []
+
+    clock.now = 3.5
+    [stable] = tracker.pop_stable()
+    assert (stable.path, stable.size) == (path, 7)
+    assert len(tracker) == 0
+
+
+def test_empty_and_deleted_files_are_dropped(tmp_path):
+    clock = FakeClock()
+    tracker = StabilityTracker(settle_time=2.0, clock=clock)
+    empty, deleted = tmp_path / "empty.mp3", tmp_path / "deleted.mp3"
+    empty.touch()
+    deleted.write_bytes(b"ID3")
+
+    tracker.touch(empty)
+    tracker.touch(deleted)
+    tracker.pop_stable()
+    deleted.unlink()
+
+    clock.now = 2.0
+    assert tracker.pop_stable() == []
+    assert len(tracker) == 0
+
+
+def test_polling_reports_new_and_changed_files(tmp_path):
+    kept, changed = tmp_path / "kept.mp3", tmp_path / "changed.mp3"
+    kept.write_bytes(b"ID3")
+    changed.write_bytes(b"ID3")
+    reported = []
+    scanned = threading.Event()
+
+    def on_change(path):
+        reported.append(path)
+        if len(reported) == 2:
+            scanned.set()
+
+    source = PollingSource([tmp_path], on_change, interval=0.05)
+    source.start()
+    try:
+        (tmp_path / "added.mp3").write_bytes(b"ID3")
+        (tmp_path / "notes.txt").write_text("not media")
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert scanned.wait(timeout=5)
+    finally:
+        source.stop()
+
+    assert sorted(reported) == [tmp_path / "added.mp3", changed]
+
+
+def test_files_done_are_not_transcribed_again(tmp_path, monkeypatch):
+    manifest = FileManifest(tmp_path / "manifest.sqlite3")
+    transcribed = []
+    monkeypatch.setattr(settings.input, "skip_if_output_exist", False)
+    monkeypatch.setattr(ingest, "get_file_manifest", lambda: manifest)
+    monkeypatch.setattr(ingest, "transcribe_file", lambda file_path, *args: transcribed.append(file_path))
+
+    media_dir = tmp_path / "media"
+    media_dir.mkdir()
+    (media_dir / "done.mp3").write_bytes(b"ID3 done")
+    [done] = scan_media_files(media_dir)
+    manifest.record([(done, "done", None)], output_profile())
+    (media_dir / "new.mp3").write_bytes(b"ID3 new")
+
+    watcher = DropFolderWatcher([media_dir], model=None, concurrency=1, settle_time=0)
+    watcher.scan_existing()
+    assert len(watcher.tracker) == 1
+    watcher.tracker.pop_stable()
+    watcher.poll()
+    watcher.close()
+
+    assert transcribed == [str((media_dir / "new.mp3").absolute())]
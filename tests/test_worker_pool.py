@@ -0,0 +1,10 @@
+from Transcriber.transcription_core.worker_pool import schedule_longest_first
+
+
+def test_longest_files_are_dispatched_first():
+    files = [{"file_path": name} for name in ("empty.wav", "short.mp3", "unknown.mp3", "long.mp3")]
+    durations = {"empty.wav": 0.0, "short.mp3": 30.0, "unknown.mp3": None, "long.mp3": 3600.0}
+
+    scheduled = schedule_longest_first(files, durations)
+
+    assert [file["file_path"] for file in scheduled] == ["unknown.mp3", "long.mp3", "short.mp3", "empty.wav"]